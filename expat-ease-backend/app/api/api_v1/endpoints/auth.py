@@ -1,47 +1,70 @@
 """
 Authentication endpoints.
 """
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.deps import get_current_user
-from app.core.security import create_access_token, verify_password
-from app.crud.crud_user import get_user_by_email
-from app.db.session import get_session
-from app.models.auth import LoginRequest, Token
+from app.core.hashing_pool import password_pool
+from app.core.config import settings
+from app.core.login_throttle import client_ip, login_throttle
+from app.core.security import (
+    REFRESH_TOKEN_TYPE,
+    create_token_pair,
+    verify_and_update_password,
+    verify_dummy_password,
+    verify_token,
+)
+from app.crud.crud_refresh_session import (
+    advance_refresh_session,
+    create_refresh_session,
+    get_refresh_session,
+)
+from app.crud.crud_user import get_user_by_email, get_user_cached, revoke_tokens, upgrade_password_hash
+from app.db.session import get_async_session, get_session
+from app.models.auth import LoginRequest, RefreshRequest, Token
 from app.models.user import User, UserRead
 
 router = APIRouter()
 
-# Token expiration time (24 hours)
-ACCESS_TOKEN_EXPIRE_MINUTES = 1440
-
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: LoginRequest,
-    session: Session = Depends(get_session)
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
 ) -> Token:
     """
     Authenticate user and return JWT token.
     
     Args:
         login_data: User login credentials (email and password)
+        request: Incoming request (for the client IP)
         session: Database session
         
     Returns:
         Token: JWT access token and token type
         
     Raises:
-        HTTPException: 401 if credentials are invalid
+        HTTPException: 401 if credentials are invalid, 429 if the account or
+            client IP has too many recent failures, 503 if password hashing
+            is overloaded
     """
+    # Reject throttled attempts before touching the database or bcrypt
+    ip = client_ip(request)
+    login_throttle.check(login_data.email, ip)
+    
     # Get user by email
-    user = get_user_by_email(session=session, email=login_data.email)
+    user = await session.run_sync(get_user_by_email, login_data.email)
+    await session.close()  # give the connection back to the pool while bcrypt runs
     
-    # Check if user exists
+    # Check if user exists; verify against a dummy hash so this takes as long as a wrong password
     if not user:
+        await password_pool.run(verify_dummy_password, login_data.password)
+        login_throttle.record_failure(login_data.email, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User does not exist. Please register first.",
@@ -49,13 +72,23 @@ def login(
         )
     
     # Verify password is correct
-    if not verify_password(login_data.password, user.hashed_password):
+    verified, new_hash = await password_pool.run(
+        verify_and_update_password, login_data.password, user.hashed_password
+    )
+    if not verified:
+        login_throttle.record_failure(login_data.email, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    login_throttle.record_success(login_data.email)
+    
+    # Migrate hashes made under an older scheme/cost policy
+    if new_hash:
+        await session.run_sync(upgrade_password_hash, user.id, user.hashed_password, new_hash)
+    
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -63,14 +96,79 @@ def login(
             detail="Inactive user"
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires
+    # Create access and refresh tokens
+    refresh_session = await session.run_sync(create_refresh_session, user.id)
+    return Token(**create_token_pair(user.id, user.email, user.token_version, refresh_session.id))
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(
+    refresh_data: RefreshRequest,
+    session: Session = Depends(get_session)
+) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    
+    Refresh tokens are single use: each carries its refresh session and the
+    session's counter when it was issued, and exchanging it advances the
+    counter. The same token presented again within
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS is a concurrent refresh and gets tokens
+    for the current counter. Any other reuse means the token leaked, so all of
+    the user's tokens are revoked.
+    
+    Args:
+        refresh_data: The refresh token
+        session: Database session
+        
+    Returns:
+        Token: New access and refresh tokens
+        
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, revoked or reused
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
+    payload = verify_token(refresh_data.refresh_token)
+    if payload is None or payload.get("type") != REFRESH_TOKEN_TYPE:
+        raise credentials_exception
+    try:
+        user_id = int(payload["sub"])
+        session_id = int(payload["sid"])
+        counter = int(payload["rc"])
+    except (KeyError, TypeError, ValueError):
+        raise credentials_exception
+    
+    user = get_user_cached(session=session, user_id=user_id)
+    if user is None or payload.get("ver") != user.token_version:
+        raise credentials_exception
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    
+    if advance_refresh_session(session, session_id, user_id, counter):
+        return Token(**create_token_pair(user.id, user.email, user.token_version, session_id, counter + 1))
     
-    return Token(access_token=access_token, token_type="bearer")
+    refresh_session = get_refresh_session(session, session_id)
+    if refresh_session is None or refresh_session.user_id != user_id:
+        raise credentials_exception
+    grace_start = datetime.utcnow() - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+    if (
+        refresh_session.counter == counter + 1
+        and refresh_session.rotated_at is not None
+        and refresh_session.rotated_at >= grace_start
+        and refresh_session.expires_at > datetime.utcnow()
+    ):
+        return Token(**create_token_pair(
+            user.id, user.email, user.token_version, session_id, refresh_session.counter
+        ))
+    if refresh_session.counter > counter:
+        revoke_tokens(session, user_id)
+    raise credentials_exception
 
 
 @router.get("/me", response_model=UserRead)
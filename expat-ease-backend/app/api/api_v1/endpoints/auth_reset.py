@@ -1,17 +1,19 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core import password_security
-from app.core.deps import get_current_active_user
-from app.core.security import verify_password, hash_password
+from app.core.deps import get_current_active_user_async
+from app.core.hashing_pool import password_pool
+from app.core.security import create_token_pair, verify_password, hash_password
 from app.models.user import User
-from app.db.session import get_session
+from app.db.session import get_async_session, get_session
 from app.crud import crud_user
 from app.crud.crud_password_reset import create_token, get_by_token, delete_token
+from app.crud.crud_refresh_session import create_refresh_session
 from app.core.config import settings
 
 router = APIRouter()
@@ -44,9 +46,9 @@ def forgot_password(request: ForgotPasswordRequest, session: Session = Depends(g
     return {"msg": "If an account with this email exists, a reset token has been issued."}
 
 
-@router.post("/reset-password", status_code=status.HTTP_200_OK)
-def reset_password(request: ResetPasswordRequest, session: Session = Depends(get_session)) -> Any:
-    prt = get_by_token(session, request.token)
+def _reset_token_user(session: Session, token: str) -> Tuple[User, int]:
+    """Return the user and id of a valid reset token; invalid tokens raise 400 and expired ones are deleted."""
+    prt = get_by_token(session, token)
     if not prt:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
     if prt.expires_at < datetime.utcnow():
@@ -59,19 +61,28 @@ def reset_password(request: ResetPasswordRequest, session: Session = Depends(get
         # unlikely; clean up token and error
         delete_token(session, prt.id)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token")
+    return user, prt.id
+
+
+def _reset_password(session: Session, token_id: int, user: User, hashed_password: str) -> None:
+    # Also signs the user out everywhere
+    crud_user.set_password(session, user, hashed_password)
+    # delete token after use
+    delete_token(session, token_id)
+
+
+@router.post("/reset-password", status_code=status.HTTP_200_OK)
+async def reset_password(request: ResetPasswordRequest, session: AsyncSession = Depends(get_async_session)) -> Any:
+    user, token_id = await session.run_sync(_reset_token_user, request.token)
 
     # validate password strength if project has validators; simple length check here
     if len(request.new_password) < 8:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password too short")
 
-    # Use project's password hashing utility
-    hashed = password_security.hash_password(request.new_password)
-    user.hashed_password = hashed
-    session.add(user)
-    session.commit()
-
-    # delete token after use
-    delete_token(session, prt.id)
+    # Use project's password hashing utility; don't hold a database connection while hashing
+    await session.close()
+    hashed = await password_pool.run(hash_password, request.new_password)
+    await session.run_sync(_reset_password, token_id, user, hashed)
 
     return {"msg": "Password reset successful"}
 
@@ -85,30 +96,44 @@ class ChangePasswordRequest(BaseModel):
 
 
 @router.post('/verify-password', status_code=status.HTTP_200_OK)
-def verify_current_password(
+async def verify_current_password(
     request: VerifyPasswordRequest,
-    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """Verify that provided current_password matches the logged-in user's password."""
-    if not verify_password(request.current_password, current_user.hashed_password):
+    await session.close()  # don't hold a database connection while hashing
+    if not await password_pool.run(verify_password, request.current_password, current_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Incorrect current password')
     return {"msg": "Password verified"}
 
 
+def _change_password(session: Session, user: User, hashed_password: str) -> dict:
+    """Store the new password (revoking every token) and issue a token pair for a new refresh session."""
+    user_id, email = user.id, user.email
+    crud_user.set_password(session, user, hashed_password)
+    refresh_session = create_refresh_session(session, user_id)
+    return create_token_pair(user_id, email, user.token_version, refresh_session.id)
+
+
 @router.post('/change-password', status_code=status.HTTP_200_OK)
-def change_password(
+async def change_password(
     request: ChangePasswordRequest,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
-    """Change the logged-in user's password to a new password."""
+    """Change the logged-in user's password to a new password.
+
+    Every existing token of the user is revoked; the response carries a new
+    token pair so the current client stays signed in.
+    """
     if len(request.new_password) < 8:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Password too short')
 
-    current_user.hashed_password = hash_password(request.new_password)
-    session.add(current_user)
-    session.commit()
-    return {"msg": "Password changed successfully"}
+    await session.close()  # don't hold a database connection while hashing
+    hashed = await password_pool.run(hash_password, request.new_password)
+    tokens = await session.run_sync(_change_password, current_user, hashed)
+    return {"msg": "Password changed successfully", **tokens}
 
 
 class ChangeByEmailRequest(BaseModel):
@@ -118,25 +143,27 @@ class ChangeByEmailRequest(BaseModel):
 
 
 @router.post('/change-password-by-email', status_code=status.HTTP_200_OK)
-def change_password_by_email(request: ChangeByEmailRequest, session: Session = Depends(get_session)) -> Any:
+async def change_password_by_email(
+    request: ChangeByEmailRequest, session: AsyncSession = Depends(get_async_session)
+) -> Any:
     """Allow changing password by providing email + current password + new password.
 
     This endpoint is intended for users who know their current password but are not authenticated in the session.
     It verifies the current_password for the email, updates to new_password, and returns a generic error on failure.
     """
-    user = crud_user.get_user_by_email(session, request.email)
+    user = await session.run_sync(crud_user.get_user_by_email, request.email)
     if not user:
         # don't reveal whether email exists
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email or password")
 
-    if not password_security.verify_password(request.current_password, user.hashed_password):
+    await session.close()  # don't hold a database connection while hashing
+    if not await password_pool.run(verify_password, request.current_password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email or password")
 
     if len(request.new_password) < 8:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password too short")
 
-    user.hashed_password = password_security.hash_password(request.new_password)
-    session.add(user)
-    session.commit()
+    hashed = await password_pool.run(hash_password, request.new_password)
+    await session.run_sync(crud_user.set_password, user, hashed)
 
     return {"msg": "Password changed successfully"}
@@ -9,6 +9,7 @@ from sqlmodel import Session, select
 from aiofiles import open as aio_open
 
 from app.core.deps import get_current_active_user
+from app.db.replicas import get_read_session
 from app.db.session import get_session
 from app.models.document import Document, DocumentCreate, DocumentResponse
 from app.models.user import User
@@ -123,14 +124,14 @@ async def upload_document(
 @router.get("/", response_model=List[DocumentResponse])
 def get_user_documents(
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ) -> List[DocumentResponse]:
     """
     Get all documents uploaded by the current user.
     
     Args:
         current_user: Current authenticated user
-        session: Database session
+        session: Database session (read replica when configured)
         
     Returns:
         List[DocumentResponse]: List of user's documents
@@ -1,78 +1,149 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func, Field, SQLModel
-from typing import List, Optional
-from datetime import datetime
+import json
 
-from app.core.deps import get_current_user
-from app.db.session import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, Field, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Literal, Optional, Union
+
+from app.core.cache import forum_cache
+from app.core.config import settings
+from app.core.deps import get_current_user_async
+from app.core.view_counter import view_counts
+from app.crud import crud_forum, crud_forum_search
+from app.db.replicas import get_async_read_session, is_replica_session, is_sticky_request, read_engine
+from app.db.session import get_async_session
 from app.models.user import User
-from app.models.forum import Question, Answer, QuestionVote, AnswerVote, QuestionCategory
+from app.models.forum import Question, Answer, QuestionCategory
 
 router = APIRouter()
 
 
-def _user_summary(session: Session, user_id: int) -> dict:
-    """Return a minimal public user summary dict for embedding in responses."""
-    user = session.get(User, user_id)
-    if not user:
-        return {"id": user_id, "full_name": "Unknown", "profile_photo": None, "country": None}
-    return {
-        "id": user.id,
-        "full_name": user.full_name or user.email,
-        "profile_photo": user.profile_photo,
-        "country": user.country,
-    }
+def get_user_loader(session: AsyncSession = Depends(get_async_session)) -> crud_forum.UserSummaryLoader:
+    """Author loader shared by everything one request serializes (use it inside session.run_sync)."""
+    return crud_forum.UserSummaryLoader(session.sync_session)
+
+
+def get_read_user_loader(session: AsyncSession = Depends(get_async_read_session)) -> crud_forum.UserSummaryLoader:
+    """get_user_loader() for endpoints on the read session."""
+    return crud_forum.UserSummaryLoader(session.sync_session)
+
+
+def _list_scope(category) -> str:
+    return QuestionCategory(category).value if category else "all"
+
+
+def _invalidate_question_lists(category) -> None:
+    """Drop cached question pages of a category and of the unfiltered listing."""
+    forum_cache.bump_generation(_list_scope(category))
+    forum_cache.bump_generation(_list_scope(None))
+
+
+def _invalidate_question_detail(question_id: int) -> None:
+    forum_cache.bump_generation(f"question:{question_id}")
+
+
+def _invalidate_question(question_id: int, category) -> None:
+    """Drop every cached payload that embeds the question's counters or state."""
+    _invalidate_question_detail(question_id)
+    _invalidate_question_lists(category)
+
+
+def _view_count_key(question_id: int) -> str:
+    return f"question:{question_id}:views"
+
+
+# Cached details leave out view_count, so a flush only drops the stored counts
+view_counts.add_flush_listener(
+    lambda question_ids: forum_cache.delete(*(_view_count_key(i) for i in question_ids))
+)
+
+
+async def _stored_view_count(session: AsyncSession, question_id: int) -> Optional[int]:
+    """The question's flushed view count, from the cache or by primary key."""
+    cached = forum_cache.get(_view_count_key(question_id))
+    if cached is not None:
+        return int(cached)
+    view_count = await session.run_sync(crud_forum.get_view_count, question_id)
+    # A lagging replica's count would be cached past the next flush
+    if view_count is not None and not is_replica_session(session):
+        forum_cache.set(_view_count_key(question_id), str(view_count))
+    return view_count
 
 
 # Question endpoints
-@router.get("/questions", response_model=List[dict])
-def get_questions(
+@router.get("/questions", response_model=Union[List[dict], dict])
+async def get_questions(
+    request: Request,
     category: Optional[QuestionCategory] = None,
     limit: int = 20,
     offset: int = 0,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    after: Optional[str] = None,
+    sort: Literal["new", "hot"] = "new",
+    session: AsyncSession = Depends(get_async_read_session),
+    users: crud_forum.UserSummaryLoader = Depends(get_read_user_loader),
+    current_user: User = Depends(get_current_user_async)
 ):
-    """Get all questions with optional filtering by category"""
-    query = select(Question)
-    
-    if category:
-        query = query.where(Question.category == category)
-    
-    query = query.order_by(Question.created_at.desc()).offset(offset).limit(limit)
-    questions = session.exec(query).all()
-    
-    result = []
-    for question in questions:
-        # Get answer count
-        answer_count = session.exec(select(func.count(Answer.id)).where(Answer.question_id == question.id)).first()
-        
-        # Get vote counts
-        upvotes = session.exec(select(func.count(QuestionVote.id)).where(
-            QuestionVote.question_id == question.id,
-            QuestionVote.is_upvote == True
-        )).first()
-        downvotes = session.exec(select(func.count(QuestionVote.id)).where(
-            QuestionVote.question_id == question.id,
-            QuestionVote.is_upvote == False
-        )).first()
-        
-        result.append({
-            "id": question.id,
-            "title": question.title,
-            "content": question.content,
-            "category": question.category,
-            "created_at": question.created_at,
-            "updated_at": question.updated_at,
-            "is_resolved": question.is_resolved,
-            "view_count": question.view_count,
-            "answer_count": answer_count,
-            "upvotes": upvotes,
-            "downvotes": downvotes,
-            "user": _user_summary(session, question.user_id),
-        })
-    
-    return result
+    """Get all questions with optional filtering by category.
+
+    ``sort=new`` (default) lists newest first; ``sort=hot`` lists by the
+    time-decayed engagement score and only supports ``offset`` pagination.
+
+    Passing ``after`` (empty for the first page, then the previous page's
+    ``next_cursor``) switches to cursor pagination and returns
+    ``{"items": [...], "next_cursor": ...}``. Without it the plain list is
+    returned, paginated by ``offset``.
+    """
+    if sort == "hot" and after is not None:
+        raise HTTPException(status_code=400, detail="Cursor pagination is only supported for sort=new")
+
+    # The generation is read before the query so a concurrent write orphans this entry
+    scope = _list_scope(category)
+    cache_key = f"questions:{scope}:{forum_cache.generation(scope)}:{sort}:{limit}:{offset}:{after}"
+    # Clients that just wrote must see the primary, not a page cached before their write landed
+    cached = None if is_sticky_request(request) else forum_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    def load(session: Session):
+        if after is None:
+            return crud_forum.get_question_page(
+                session, category=category, limit=limit, offset=offset, sort=sort, users=users
+            )
+        try:
+            items, next_cursor = crud_forum.get_question_page_after(
+                session, category=category, limit=limit, after=after, users=users
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return {"items": items, "next_cursor": next_cursor}
+
+    payload = await session.run_sync(load)
+
+    body = json.dumps(jsonable_encoder(payload))
+    # A lagging replica's page would be cached under the current generation
+    if not is_replica_session(session):
+        forum_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/search", response_model=List[dict])
+async def search_forum(
+    q: str,
+    category: Optional[QuestionCategory] = None,
+    limit: int = 20,
+    offset: int = 0,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Full-text search over questions and answers, best matches first"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query must not be empty")
+    return await session.run_sync(
+        crud_forum_search.search_posts, q, category=category, limit=limit, offset=offset
+    )
 
 
 class QuestionCreate(SQLModel):
@@ -81,10 +152,11 @@ class QuestionCreate(SQLModel):
     category: QuestionCategory = Field(default=QuestionCategory.GENERAL)
 
 @router.post("/questions", response_model=dict)
-def create_question(
+async def create_question(
     question_data: QuestionCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    users: crud_forum.UserSummaryLoader = Depends(get_user_loader),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Create a new question"""
     question = Question(
@@ -92,11 +164,19 @@ def create_question(
         content=question_data.content,
         category=question_data.category,
         user_id=current_user.id,
+        hot_score=crud_forum.HOT_NEW_QUESTION,
     )
     
-    session.add(question)
-    session.commit()
-    session.refresh(question)
+    def save(session: Session) -> dict:
+        session.add(question)
+        session.flush()
+        crud_forum_search.index_question(session, question)
+        session.commit()
+        session.refresh(question)
+        return users.get(current_user.id)
+
+    author = await session.run_sync(save)
+    _invalidate_question_lists(question.category)
     
     return {
         "id": question.id,
@@ -109,95 +189,114 @@ def create_question(
         "answer_count": 0,
         "upvotes": 0,
         "downvotes": 0,
-        "user": _user_summary(session, current_user.id),
+        "user": author,
     }
 
 
 @router.get("/questions/{question_id}", response_model=dict)
-def get_question(
+async def get_question(
     question_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    include_answers: bool = True,
+    session: AsyncSession = Depends(get_async_read_session),
+    users: crud_forum.UserSummaryLoader = Depends(get_read_user_loader),
+    current_user: User = Depends(get_current_user_async)
 ):
-    """Get a specific question with its answers"""
-    question = session.get(Question, question_id)
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
-    
-    # Increment view count
-    question.view_count += 1
-    session.add(question)
-    session.commit()
-    
-    # Get answers
-    answers = session.exec(
-        select(Answer).where(Answer.question_id == question_id).order_by(Answer.created_at.asc())
-    ).all()
-    
-    answer_list = []
-    for answer in answers:
-        # Get vote counts for answer
-        upvotes = session.exec(select(func.count(AnswerVote.id)).where(
-            AnswerVote.answer_id == answer.id,
-            AnswerVote.is_upvote == True
-        )).first()
-        downvotes = session.exec(select(func.count(AnswerVote.id)).where(
-            AnswerVote.answer_id == answer.id,
-            AnswerVote.is_upvote == False
-        )).first()
-        
-        answer_list.append({
-            "id": answer.id,
-            "content": answer.content,
-            "created_at": answer.created_at,
-            "updated_at": answer.updated_at,
-            "is_accepted": answer.is_accepted,
-            "upvotes": upvotes,
-            "downvotes": downvotes,
-            "user": _user_summary(session, answer.user_id),
-        })
+    """Get a specific question with its answers.
+
+    Long threads should pass ``include_answers=false`` and page through
+    ``GET /questions/{question_id}/answers`` instead.
+    """
+    generation = forum_cache.generation(f"question:{question_id}")
+    cache_key = f"question:{question_id}:{generation}:{int(include_answers)}"
+    cached = None if is_sticky_request(request) else forum_cache.get(cache_key)
+    if cached is not None:
+        question = json.loads(cached)
+        view_count = await _stored_view_count(session, question_id)
+        if view_count is None:
+            raise HTTPException(status_code=404, detail="Question not found")
+    else:
+        load = crud_forum.get_question_detail if include_answers else crud_forum.get_question_summary
+        question = await session.run_sync(load, question_id, users=users)
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found")
+        view_count = question.pop("view_count")
+        # Only the primary's copy is cached (see get_questions); view_count is
+        # left out so flushing buffered views does not invalidate it
+        if not is_replica_session(session):
+            forum_cache.set(cache_key, json.dumps(jsonable_encoder(question)))
+            forum_cache.set(_view_count_key(question_id), str(view_count))
     
-    # Get vote counts for question
-    upvotes = session.exec(select(func.count(QuestionVote.id)).where(
-        QuestionVote.question_id == question_id,
-        QuestionVote.is_upvote == True
-    )).first()
-    downvotes = session.exec(select(func.count(QuestionVote.id)).where(
-        QuestionVote.question_id == question_id,
-        QuestionVote.is_upvote == False
-    )).first()
+    # Record the view in the write-behind buffer; it is written to the database in batches
+    view_counts.record(question_id)
+    question["view_count"] = view_count + view_counts.pending(question_id)
     
-    return {
-        "id": question.id,
-        "title": question.title,
-        "content": question.content,
-        "category": question.category,
-        "created_at": question.created_at,
-        "updated_at": question.updated_at,
-        "is_resolved": question.is_resolved,
-        "view_count": question.view_count,
-        "answer_count": len(answer_list),
-        "upvotes": upvotes,
-        "downvotes": downvotes,
-        "user": _user_summary(session, question.user_id),
-        "answers": answer_list,
-    }
+    return question
 
 
 # Answer endpoints
 class AnswerCreate(SQLModel):
     content: str = Field(max_length=2000)
 
+@router.get("/questions/{question_id}/answers")
+async def get_answers(
+    question_id: int,
+    limit: int = Query(default=20, ge=1, le=100),
+    after: Optional[str] = None,
+    stream: bool = False,
+    session: AsyncSession = Depends(get_async_read_session),
+    users: crud_forum.UserSummaryLoader = Depends(get_read_user_loader),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get a question's answers, oldest first.
+
+    Returns ``{"items": [...], "next_cursor": ...}``; pass ``next_cursor`` back
+    as ``after`` for the next page. With ``stream=true`` every answer from
+    ``after`` onwards is streamed as NDJSON (one answer per line) and
+    ``limit`` is ignored.
+    """
+    if await session.get(Question, question_id) is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    if stream:
+        # Validate the cursor up front; errors raised once streaming has started cannot change the status
+        if after:
+            try:
+                crud_forum.decode_cursor(after)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # The request session may be closed before the body is sent, so the stream
+        # owns its own, on the same database the read was routed to
+        stream_engine = read_engine(session)
+
+        def lines():
+            with Session(stream_engine) as stream_session:
+                for answer in crud_forum.iter_answers(stream_session, question_id, after=after):
+                    yield json.dumps(jsonable_encoder(answer)) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    try:
+        items, next_cursor = await session.run_sync(
+            crud_forum.get_answer_page_after, question_id, limit=limit, after=after, users=users
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.post("/questions/{question_id}/answers", response_model=dict)
-def create_answer(
+async def create_answer(
     question_id: int,
     answer_data: AnswerCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    users: crud_forum.UserSummaryLoader = Depends(get_user_loader),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Create a new answer to a question"""
     # Check if question exists
-    question = session.get(Question, question_id)
+    question = await session.get(Question, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
@@ -207,9 +306,18 @@ def create_answer(
         user_id=current_user.id
     )
     
-    session.add(answer)
-    session.commit()
-    session.refresh(answer)
+    def save(session: Session) -> dict:
+        session.add(answer)
+        crud_forum.increment_answer_count(session, question_id)
+        session.flush()
+        crud_forum_search.index_answer(session, answer, question)
+        session.commit()
+        session.refresh(answer)
+        return users.get(current_user.id)
+
+    category = question.category
+    author = await session.run_sync(save)
+    _invalidate_question(question_id, category)
     
     return {
         "id": answer.id,
@@ -218,116 +326,139 @@ def create_answer(
         "is_accepted": answer.is_accepted,
         "upvotes": 0,
         "downvotes": 0,
-        "user": _user_summary(session, current_user.id),
+        "user": author,
     }
 
 
+def _record_vote(session: Session, model, target_id: int, user_id: int, is_upvote: bool, not_found: str):
+    """Record a vote and commit, returning the voted row's new tallies."""
+    try:
+        row = crud_forum.record_vote(session, model, target_id, user_id, is_upvote)
+    except IntegrityError:
+        # PostgreSQL enforces the foreign key on the vote insert itself
+        row = None
+    if row is None:
+        session.rollback()
+        raise HTTPException(status_code=404, detail=not_found)
+    session.commit()
+    return row
+
+
 @router.post("/questions/{question_id}/vote")
-def vote_question(
+async def vote_question(
     question_id: int,
     is_upvote: bool,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Vote on a question (upvote or downvote)"""
-    # Check if question exists
-    question = session.get(Question, question_id)
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
-    
-    # Check if user already voted
-    existing_vote = session.exec(select(QuestionVote).where(
-        QuestionVote.question_id == question_id,
-        QuestionVote.user_id == current_user.id
-    )).first()
-    
-    if existing_vote:
-        # Update existing vote
-        existing_vote.is_upvote = is_upvote
-        session.add(existing_vote)
-    else:
-        # Create new vote
-        vote = QuestionVote(
-            question_id=question_id,
-            user_id=current_user.id,
-            is_upvote=is_upvote
-        )
-        session.add(vote)
-    
-    session.commit()
-    return {"message": "Vote recorded successfully"}
+    row = await session.run_sync(
+        _record_vote, Question, question_id, current_user.id, is_upvote, "Question not found"
+    )
+    _invalidate_question(question_id, row.category)
+    return {
+        "message": "Vote recorded successfully",
+        "upvotes": row.upvote_count,
+        "downvotes": row.downvote_count,
+    }
 
 
 @router.post("/answers/{answer_id}/vote")
-def vote_answer(
+async def vote_answer(
     answer_id: int,
     is_upvote: bool,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Vote on an answer (upvote or downvote)"""
-    # Check if answer exists
-    answer = session.get(Answer, answer_id)
-    if not answer:
-        raise HTTPException(status_code=404, detail="Answer not found")
-    
-    # Check if user already voted
-    existing_vote = session.exec(select(AnswerVote).where(
-        AnswerVote.answer_id == answer_id,
-        AnswerVote.user_id == current_user.id
-    )).first()
-    
-    if existing_vote:
-        # Update existing vote
-        existing_vote.is_upvote = is_upvote
-        session.add(existing_vote)
-    else:
-        # Create new vote
-        vote = AnswerVote(
-            answer_id=answer_id,
-            user_id=current_user.id,
-            is_upvote=is_upvote
-        )
-        session.add(vote)
-    
-    session.commit()
-    return {"message": "Vote recorded successfully"}
+    row = await session.run_sync(_record_vote, Answer, answer_id, current_user.id, is_upvote, "Answer not found")
+    # Answer votes only show up in the question detail, not in listings
+    _invalidate_question_detail(row.question_id)
+    return {
+        "message": "Vote recorded successfully",
+        "upvotes": row.upvote_count,
+        "downvotes": row.downvote_count,
+    }
+
+
+class VoteItem(SQLModel):
+    target: Literal["question", "answer"]
+    id: int
+    is_upvote: bool
+
+
+class VoteBatch(SQLModel):
+    votes: List[VoteItem] = Field(min_length=1, max_length=settings.FORUM_VOTE_BATCH_MAX_ITEMS)
+
+
+@router.post("/votes:batch")
+async def vote_batch(
+    batch: VoteBatch,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Record many question/answer votes in one transaction.
+
+    Votes are applied in order, so a later vote on the same target overrides an
+    earlier one. Votes on missing targets are reported per item and skipped.
+    """
+    models = {"question": Question, "answer": Answer}
+    rows = await session.run_sync(
+        crud_forum.record_votes, current_user.id,
+        [(models[vote.target], vote.id, vote.is_upvote) for vote in batch.votes],
+    )
+    await session.commit()
+
+    results = []
+    voted_questions, answer_vote_questions = {}, set()
+    for vote, row in zip(batch.votes, rows):
+        if row is None:
+            results.append({"target": vote.target, "id": vote.id, "status": "not_found"})
+            continue
+        if vote.target == "question":
+            voted_questions[vote.id] = row.category
+        else:
+            answer_vote_questions.add(row.question_id)
+        results.append({
+            "target": vote.target,
+            "id": vote.id,
+            "status": "ok",
+            "upvotes": row.upvote_count,
+            "downvotes": row.downvote_count,
+        })
+
+    for question_id, category in voted_questions.items():
+        _invalidate_question(question_id, category)
+    for question_id in answer_vote_questions - voted_questions.keys():
+        _invalidate_question_detail(question_id)
+    return {"results": results}
 
 
 @router.post("/answers/{answer_id}/accept")
-def accept_answer(
+async def accept_answer(
     answer_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Accept an answer (only question author can do this)"""
-    answer = session.get(Answer, answer_id)
+    answer = await session.get(Answer, answer_id)
     if not answer:
         raise HTTPException(status_code=404, detail="Answer not found")
     
     # Check if current user is the question author
-    question = session.get(Question, answer.question_id)
+    question = await session.get(Question, answer.question_id)
     if question.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only the question author can accept answers")
     
-    # Unaccept all other answers for this question
-    other_answers = session.exec(select(Answer).where(
-        Answer.question_id == answer.question_id,
-        Answer.id != answer_id
-    )).all()
-    
-    for other_answer in other_answers:
-        other_answer.is_accepted = False
-        session.add(other_answer)
-    
-    # Accept this answer
-    answer.is_accepted = True
-    
-    # Mark question as resolved
-    question.is_resolved = True
-    
-    session.add(answer)
-    session.add(question)
-    session.commit()
+    question_id, category = question.id, question.category
+    try:
+        await session.run_sync(crud_forum.accept_answer, question_id, answer_id)
+        await session.commit()
+    except IntegrityError:
+        # A concurrent accept on the same question won the race
+        await session.rollback()
+        raise HTTPException(status_code=409, detail="Another answer was accepted concurrently, please retry")
+    _invalidate_question(question_id, category)
     
     return {"message": "Answer accepted successfully"}
@@ -1,12 +1,19 @@
 """
 Settlement steps management endpoints.
 """
-from typing import List
+import os
+from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.deps import get_current_active_user
-from app.db.session import get_session
+from app.core.deps import get_current_active_user_async
+from app.db.bulk import insert_all
+from app.db.replicas import get_async_read_session
+from app.db.session import get_async_session
+from app.models.document import Document
 from app.models.settlement_step import SettlementStep, SettlementStepCreate, SettlementStepUpdate, SettlementStepResponse
 from app.models.user import User
 
@@ -54,9 +61,9 @@ DEFAULT_STEPS = [
 
 
 @router.post("/initialize", response_model=List[SettlementStepResponse])
-def initialize_settlement_steps(
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+async def initialize_settlement_steps(
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
 ) -> List[SettlementStep]:
     """
     Initialize settlement steps for a new user.
@@ -68,43 +75,45 @@ def initialize_settlement_steps(
     Returns:
         List[SettlementStepResponse]: List of initialized settlement steps
     """
+    return await session.run_sync(_initialize_steps, current_user.id)
+
+
+def _initialize_steps(session: Session, user_id: int) -> List[SettlementStepResponse]:
     # Check if user already has settlement steps
     existing_steps = session.exec(
-        select(SettlementStep).where(SettlementStep.user_id == current_user.id)
+        select(SettlementStep).where(SettlementStep.user_id == user_id)
     ).all()
     
     if existing_steps:
         # If user already has steps, return them (don't create duplicates)
-        print(f"User {current_user.id} already has {len(existing_steps)} settlement steps, returning existing ones")
+        print(f"User {user_id} already has {len(existing_steps)} settlement steps, returning existing ones")
         return _get_steps_with_documents(existing_steps, session)
     
-    # Create default settlement steps
-    created_steps = []
-    for step_data in DEFAULT_STEPS:
-        step = SettlementStep(
-            user_id=current_user.id,
-            step_number=step_data["step_number"],
-            title=step_data["title"],
-            description=step_data["description"],
-            is_completed=False,
-            is_unlocked=step_data["is_unlocked"]
-        )
-        session.add(step)
-        created_steps.append(step)
-    
-    session.commit()
-    
-    # Refresh all steps to get IDs
-    for step in created_steps:
-        session.refresh(step)
-    
+    created_steps = _create_default_steps(session, user_id)
     return _get_steps_with_documents(created_steps, session)
 
 
+def _create_default_steps(session: Session, user_id: int) -> List[SettlementStep]:
+    """Insert the DEFAULT_STEPS for a user in one statement and commit."""
+    created_steps = insert_all(session, SettlementStep, [
+        {
+            "user_id": user_id,
+            "step_number": step_data["step_number"],
+            "title": step_data["title"],
+            "description": step_data["description"],
+            "is_completed": False,
+            "is_unlocked": step_data["is_unlocked"],
+        }
+        for step_data in DEFAULT_STEPS
+    ])
+    session.commit()
+    return created_steps
+
+
 @router.get("/", response_model=List[SettlementStepResponse])
-def get_user_settlement_steps(
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+async def get_user_settlement_steps(
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_read_session)
 ) -> List[SettlementStep]:
     """
     Get all settlement steps for the current user.
@@ -116,9 +125,13 @@ def get_user_settlement_steps(
     Returns:
         List[SettlementStepResponse]: List of user's settlement steps
     """
+    return await session.run_sync(_list_steps, current_user.id)
+
+
+def _list_steps(session: Session, user_id: int) -> List[SettlementStepResponse]:
     steps = session.exec(
         select(SettlementStep)
-        .where(SettlementStep.user_id == current_user.id)
+        .where(SettlementStep.user_id == user_id)
         .order_by(SettlementStep.step_number)
     ).all()
     
@@ -126,11 +139,11 @@ def get_user_settlement_steps(
 
 
 @router.patch("/{step_id}", response_model=SettlementStepResponse)
-def update_settlement_step(
+async def update_settlement_step(
     step_id: int,
     step_update: SettlementStepUpdate,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
 ) -> SettlementStep:
     """
     Update a settlement step.
@@ -147,10 +160,14 @@ def update_settlement_step(
     Raises:
         HTTPException: 404 if step not found or not owned by user
     """
+    return await session.run_sync(_update_step, current_user.id, step_id, step_update)
+
+
+def _update_step(session: Session, user_id: int, step_id: int, step_update: SettlementStepUpdate) -> SettlementStepResponse:
     step = session.exec(
         select(SettlementStep).where(
             SettlementStep.id == step_id,
-            SettlementStep.user_id == current_user.id
+            SettlementStep.user_id == user_id
         )
     ).first()
     
@@ -168,7 +185,7 @@ def update_settlement_step(
         if step_update.is_completed and step.step_number < 6:
             next_step = session.exec(
                 select(SettlementStep).where(
-                    SettlementStep.user_id == current_user.id,
+                    SettlementStep.user_id == user_id,
                     SettlementStep.step_number == step.step_number + 1
                 )
             ).first()
@@ -185,23 +202,27 @@ def update_settlement_step(
     return _get_step_with_documents(step, session)
 
 
+def _first_document_urls(session: Session, step_ids: List[int]) -> Dict[int, str]:
+    """URL of the first document attached to each of the steps, fetched in one query."""
+    if not step_ids:
+        return {}
+    rows = session.exec(
+        select(Document.settlement_step_id, Document.file_path)
+        .where(Document.settlement_step_id.in_(step_ids))
+        .order_by(Document.id)
+    ).all()
+    urls: Dict[int, str] = {}
+    for step_id, file_path in rows:
+        # Now it's already a Cloudinary URL
+        urls.setdefault(step_id, file_path)
+    return urls
+
+
 def _get_steps_with_documents(steps: List[SettlementStep], session: Session) -> List[SettlementStepResponse]:
     """Convert settlement steps to response format with document info."""
-    from app.models.document import Document
-    
-    responses = []
-    for step in steps:
-        # Check if step has documents
-        documents = session.exec(
-            select(Document).where(Document.settlement_step_id == step.id)
-        ).all()
-        
-        has_document = len(documents) > 0
-        document_url = None
-        if has_document and documents[0]:
-            document_url = documents[0].file_path  # Now it's already a Cloudinary URL
-        
-        response = SettlementStepResponse(
+    document_urls = _first_document_urls(session, [step.id for step in steps])
+    return [
+        SettlementStepResponse(
             id=step.id,
             user_id=step.user_id,
             step_number=step.step_number,
@@ -211,47 +232,22 @@ def _get_steps_with_documents(steps: List[SettlementStep], session: Session) ->
             is_unlocked=step.is_unlocked,
             created_at=step.created_at,
             updated_at=step.updated_at,
-            has_document=has_document,
-            document_url=document_url
+            has_document=step.id in document_urls,
+            document_url=document_urls.get(step.id)
         )
-        responses.append(response)
-    
-    return responses
+        for step in steps
+    ]
 
 
 def _get_step_with_documents(step: SettlementStep, session: Session) -> SettlementStepResponse:
     """Convert single settlement step to response format with document info."""
-    from app.models.document import Document
-    
-    # Check if step has documents
-    documents = session.exec(
-        select(Document).where(Document.settlement_step_id == step.id)
-    ).all()
-    
-    has_document = len(documents) > 0
-    document_url = None
-    if has_document and documents[0]:
-        document_url = documents[0].file_path  # Now it's already a Cloudinary URL
-    
-    return SettlementStepResponse(
-        id=step.id,
-        user_id=step.user_id,
-        step_number=step.step_number,
-        title=step.title,
-        description=step.description,
-        is_completed=step.is_completed,
-        is_unlocked=step.is_unlocked,
-        created_at=step.created_at,
-        updated_at=step.updated_at,
-        has_document=has_document,
-        document_url=document_url
-    )
+    return _get_steps_with_documents([step], session)[0]
 
 
 @router.post("/reset", response_model=List[SettlementStepResponse], status_code=status.HTTP_200_OK)
-def reset_settlement_steps(
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+async def reset_settlement_steps(
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
 ) -> List[SettlementStepResponse]:
     """
     Reset all settlement steps for the current user.
@@ -270,52 +266,59 @@ def reset_settlement_steps(
     Raises:
         HTTPException: 500 if reset fails
     """
+    file_paths = await session.run_sync(_delete_steps, current_user.id)
+    # Filesystem calls block, so keep them off the event loop
+    try:
+        await run_in_threadpool(_remove_files, file_paths)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reset settlement steps: {str(e)}"
+        )
+    return await session.run_sync(_reinitialize_steps, current_user.id)
+
+
+def _delete_steps(session: Session, user_id: int) -> List[str]:
+    """Delete the user's steps and their documents; return the documents' local file paths."""
     try:
-        # Delete all existing settlement steps and associated documents
-        existing_steps = session.exec(
-            select(SettlementStep).where(SettlementStep.user_id == current_user.id)
+        user_step_ids = select(SettlementStep.id).where(SettlementStep.user_id == user_id)
+        file_paths = session.exec(
+            select(Document.file_path).where(Document.settlement_step_id.in_(user_step_ids))
         ).all()
-        
-        for step in existing_steps:
-            # Delete associated documents first
-            from app.models.document import Document
-            documents = session.exec(
-                select(Document).where(Document.settlement_step_id == step.id)
-            ).all()
-            
-            for doc in documents:
-                # Delete file from disk if it exists
-                import os
-                if os.path.exists(doc.file_path):
-                    os.remove(doc.file_path)
-                session.delete(doc)
-            
-            # Delete the step
-            session.delete(step)
-        
+        # No steps or documents are loaded in this session, so there is nothing to synchronize
+        session.exec(
+            delete(Document)
+            .where(Document.settlement_step_id.in_(user_step_ids))
+            .execution_options(synchronize_session=False)
+        )
+        session.exec(
+            delete(SettlementStep)
+            .where(SettlementStep.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
         session.commit()
-        
-        # Re-initialize with default steps
-        created_steps = []
-        for step_data in DEFAULT_STEPS:
-            db_step = SettlementStep(
-                user_id=current_user.id,
-                step_number=step_data["step_number"],
-                title=step_data["title"],
-                description=step_data["description"],
-                is_completed=False,
-                is_unlocked=step_data["is_unlocked"]
-            )
-            session.add(db_step)
-            created_steps.append(db_step)
+        return list(file_paths)
 
-        session.commit()
-        for step in created_steps:
-            session.refresh(step)
-        
-        # Return steps with document info
+    except Exception as e:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reset settlement steps: {str(e)}"
+        )
+
+
+def _remove_files(file_paths: List[str]) -> None:
+    """Delete files from disk if they exist (documents uploaded before Cloudinary)."""
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def _reinitialize_steps(session: Session, user_id: int) -> List[SettlementStepResponse]:
+    try:
+        created_steps = _create_default_steps(session, user_id)
         return _get_steps_with_documents(created_steps, session)
-        
+
     except Exception as e:
         session.rollback()
         raise HTTPException(
@@ -1,8 +1,9 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status as http_status
-from sqlmodel import Session
-from app.db.session import get_session
-from app.core.deps import get_current_user
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.replicas import get_async_read_session
+from app.db.session import get_async_session
+from app.core.deps import get_current_user_async
 from app.models.user import User
 from app.models.task import Task, TaskCreate, TaskUpdate, TaskResponse, TaskStatus
 from app.models.document import DocumentResponse
@@ -13,14 +14,14 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(
+async def get_tasks(
     country: str = None,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all tasks for the current user."""
     try:
-        tasks = task_crud.get_tasks_for_user(session, current_user.id, country)
+        tasks = await session.run_sync(task_crud.get_tasks_for_user, current_user.id, country)
     except Exception as e:
         print(f"Error fetching tasks: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -59,39 +60,39 @@ def get_tasks(
 
 
 @router.post("/", response_model=Task)
-def create_task_endpoint(
+async def create_task_endpoint(
     task_data: TaskCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Create a new task."""
-    return task_crud.create_task(session, task_data, current_user.id)
+    return await session.run_sync(task_crud.create_task, task_data, current_user.id)
 
 
 @router.post("/initialize", response_model=List[Task])
-def initialize_default_tasks(
+async def initialize_default_tasks(
     country: str = Form(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Initialize default tasks for a user's country."""
     # Check if user already has tasks for this country
-    existing_tasks = task_crud.get_tasks_for_user(session, current_user.id, country)
+    existing_tasks = await session.run_sync(task_crud.get_tasks_for_user, current_user.id, country)
     if existing_tasks:
         raise HTTPException(status_code=400, detail="Tasks already initialized for this country")
     
-    return task_crud.create_default_tasks_for_user(session, current_user.id, country)
+    return await session.run_sync(task_crud.create_default_tasks_for_user, current_user.id, country)
 
 
 @router.patch("/{task_id}", response_model=Task)
-def update_task(
+async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Update a task."""
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task or task.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -101,33 +102,33 @@ def update_task(
         setattr(task, field, value)
     
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.commit()
+    await session.refresh(task)
     return task
 
 
 @router.patch("/{task_id}/status", response_model=Task)
-def update_task_status_endpoint(
+async def update_task_status_endpoint(
     task_id: int,
     status: TaskStatus,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Update task status."""
-    task = task_crud.update_task_status(session, task_id, current_user.id, status)
+    task = await session.run_sync(task_crud.update_task_status, task_id, current_user.id, status)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.delete("/{task_id}")
-def delete_task_endpoint(
+async def delete_task_endpoint(
     task_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Delete a task."""
-    success = task_crud.delete_task(session, task_id, current_user.id)
+    success = await session.run_sync(task_crud.delete_task, task_id, current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"message": "Task deleted successfully"}
@@ -137,8 +138,8 @@ def delete_task_endpoint(
 async def upload_document(
     task_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Upload a document for a task (temporarily disabled)."""
     raise HTTPException(status_code=http_status.HTTP_501_NOT_IMPLEMENTED,
@@ -146,10 +147,10 @@ async def upload_document(
 
 
 @router.get("/{task_id}/documents", response_model=List[DocumentResponse])
-def get_task_documents_endpoint(
+async def get_task_documents_endpoint(
     task_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all documents for a task (temporarily disabled)."""
     raise HTTPException(status_code=http_status.HTTP_501_NOT_IMPLEMENTED,
@@ -157,10 +158,10 @@ def get_task_documents_endpoint(
 
 
 @router.delete("/documents/{document_id}")
-def delete_document_endpoint(
+async def delete_document_endpoint(
     document_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Delete a task document (temporarily disabled)."""
     raise HTTPException(status_code=http_status.HTTP_501_NOT_IMPLEMENTED,
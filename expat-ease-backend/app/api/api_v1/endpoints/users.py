@@ -5,11 +5,14 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.deps import get_current_active_user, get_current_active_user_async
+from app.core.hashing_pool import password_pool
+from app.core.security import hash_password
 from app.core.storage import save_upload_file
 from app.crud.crud_user import create_user, get_user, get_user_by_email, update_user
-from app.db.session import get_session
+from app.db.session import get_async_session, get_session
 from app.models.user import User, UserCreate, UserRead, UserUpdate
 
 router = APIRouter()
@@ -34,9 +37,9 @@ def get_current_user_info(
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_new_user(
+async def create_new_user(
     user_in: UserCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> User:
     """
     Create a new user.
@@ -49,10 +52,18 @@ def create_new_user(
         UserRead: Created user information
         
     Raises:
-        HTTPException: 400 if email already exists
+        HTTPException: 400 if email already exists, 503 if password hashing is overloaded
     """
+    # Reject duplicates before spending a bcrypt hash on them
+    if await session.run_sync(get_user_by_email, user_in.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    await session.close()  # don't hold a database connection while hashing
+    hashed_password = await password_pool.run(hash_password, user_in.password)
     try:
-        user = create_user(session=session, user_in=user_in)
+        user = await session.run_sync(create_user, user_in, hashed_password)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -62,10 +73,10 @@ def create_new_user(
 
 
 @router.patch("/me", response_model=UserRead)
-def update_current_user(
+async def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
 ) -> User:
     """
     Update current user's information.
@@ -79,13 +90,13 @@ def update_current_user(
         UserRead: Updated user information
 
     Raises:
-        HTTPException: 404 if user not found
+        HTTPException: 404 if user not found, 503 if password hashing is overloaded
     """
-    updated_user = update_user(
-        session=session,
-        user_id=current_user.id,
-        user_in=user_update
-    )
+    hashed_password = None
+    if user_update.password:
+        await session.close()  # don't hold a database connection while hashing
+        hashed_password = await password_pool.run(hash_password, user_update.password)
+    updated_user = await session.run_sync(update_user, current_user.id, user_update, hashed_password)
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
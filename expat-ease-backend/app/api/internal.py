@@ -0,0 +1,61 @@
+"""
+Operational stats endpoints (caches, password hashing, connection pools, read replicas).
+
+They reveal load and topology, so main.py only mounts this router when
+INTERNAL_STATS_ENABLED is set; keep it off on publicly reachable deployments.
+"""
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/cache-stats")
+def internal_cache_stats() -> dict:
+    """
+    Hit/miss/eviction counters of the in-process response caches.
+    
+    Returns:
+        dict: Stats per cache name
+    """
+    from app.core.cache import cache_stats
+
+    return cache_stats()
+
+
+@router.get("/password-hash-stats")
+def internal_password_hash_stats() -> dict:
+    """
+    Load of the password hashing pool (in flight, completed, rejected with 503).
+    
+    Returns:
+        dict: Pool configuration and counters
+    """
+    from app.core.hashing_pool import password_pool
+
+    return password_pool.stats()
+
+
+@router.get("/db-pool-stats")
+def internal_db_pool_stats() -> dict:
+    """
+    Occupancy and checkout wait/timeout counters of the database connection pools.
+    
+    Returns:
+        dict: Stats per engine ("sync", "async")
+    """
+    from app.db.pool_metrics import pool_stats
+
+    return pool_stats()
+
+
+@router.get("/db-replica-stats")
+def internal_db_replica_stats() -> dict:
+    """
+    Read routing: reads served per replica and by the primary, replica health and ejections.
+    
+    Returns:
+        dict: Router counters
+    """
+    from app.db.replicas import read_router
+
+    return read_router.stats()
@@ -0,0 +1,209 @@
+"""
+Caches for hot read paths (forum responses, authenticated users, verified tokens).
+
+Values are serialized strings so any backend can hold them. The default
+backend is an in-process LRU with per-entry TTL; another store (e.g. a
+Redis-compatible server) can be plugged in by implementing CacheBackend.
+
+Invalidation is generation based: callers fold a namespace's generation
+number into their keys and bump it with incr(), which orphans every key of
+the old generation without having to enumerate them.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Interface for cache stores.
+
+    A Redis-compatible implementation maps these to GET, SET ... EX, DEL and
+    INCR. A generation must never return to a value it had before, so its keys
+    must not expire or be evicted unless, like LRUCache, the store then
+    reports a generation above every value the key had.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def generation(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with per-entry TTL.
+
+    Generation counters are kept in a second LRU of `max_generations` keys
+    (default `max_entries`). A key without a counter, never bumped or
+    evicted, reads as the epoch. The epoch is raised above every evicted
+    counter, so an evicted key never comes back at an old generation; the
+    cost is that keys without a counter all move to a new generation, which
+    orphans their cached entries once.
+    """
+
+    def __init__(self, max_entries: int, max_generations: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_generations = max_generations or max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._generations[key] = self._generations.get(key, self._epoch) + 1
+            self._generations.move_to_end(key)
+            while len(self._generations) > self.max_generations:
+                _, evicted = self._generations.popitem(last=False)
+                self._epoch = max(self._epoch, evicted + 1)
+            return value
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            value = self._generations.get(key)
+            if value is None:
+                return self._epoch
+            self._generations.move_to_end(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "lru",
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "generations": len(self._generations),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ResponseCache:
+    """A named cache with a default TTL on top of a backend."""
+
+    def __init__(self, name: str, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        _registry[name] = self
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self.backend.get(f"{self.name}:{key}")
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if self.enabled:
+            self.backend.set(f"{self.name}:{key}", value, self.ttl if ttl is None else ttl)
+
+    def delete(self, *keys: str) -> None:
+        self.backend.delete(*(f"{self.name}:{key}" for key in keys))
+
+    def generation(self, namespace: str) -> int:
+        return self.backend.generation(f"{self.name}:gen:{namespace}")
+
+    def bump_generation(self, namespace: str) -> None:
+        self.backend.incr(f"{self.name}:gen:{namespace}")
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "ttl_seconds": self.ttl, **self.backend.stats()}
+
+
+_registry: Dict[str, ResponseCache] = {}
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Return hit/miss/eviction counters for every registered cache."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+# Cache for serialized forum question pages and question details
+forum_cache = ResponseCache(
+    "forum",
+    LRUCache(max_entries=settings.FORUM_CACHE_MAX_ENTRIES),
+    ttl=settings.FORUM_CACHE_TTL_SECONDS,
+    enabled=settings.FORUM_CACHE_ENABLED,
+)
+
+# Cache for serialized users, keyed by user id, read by the auth dependency
+user_cache = ResponseCache(
+    "users",
+    LRUCache(max_entries=settings.USER_CACHE_MAX_ENTRIES),
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    enabled=settings.USER_CACHE_ENABLED,
+)
+
+# Cache for verified JWT payloads, keyed by a digest of the signing secret and token
+token_cache = ResponseCache(
+    "tokens",
+    LRUCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES),
+    ttl=0,
+    enabled=settings.TOKEN_CACHE_ENABLED,
+)
@@ -12,7 +12,34 @@ class Settings(BaseSettings):
     
     # Database configuration
     DATABASE_URL: str = "sqlite:///./dev.db"
-    
+    # Connection pool per engine (sync and async each get one). Checkouts wait up
+    # to DB_POOL_TIMEOUT_SECONDS for a free connection; pre-ping replaces
+    # connections the server dropped, and recycling retires them after an hour.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    # Server-side limit per statement in milliseconds (PostgreSQL only); 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # SQLite profile applied on every new connection: WAL lets readers run while a
+    # writer commits, and writers wait up to busy_timeout for the write lock
+    # instead of failing with "database is locked"
+    SQLITE_WAL_ENABLED: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 15000
+    # Optional read replicas (comma-separated URLs) for read-only endpoints, used
+    # round-robin. A replica that fails its connection check is skipped for
+    # DATABASE_READ_EJECT_SECONDS. After sending a write, a client reads from the
+    # primary for DATABASE_READ_STICKY_SECONDS so replica lag never hides its changes.
+    DATABASE_READ_URLS: Optional[str] = None
+    DATABASE_READ_EJECT_SECONDS: float = 30.0
+    DATABASE_READ_STICKY_SECONDS: float = 5.0
+    # Apply pending schema migrations (app.db.migrations) at startup. Turn off when
+    # deploys run `python -m app.db.migrations upgrade` themselves; startup then
+    # only warns about pending migrations and missing indexes.
+    DB_MIGRATE_ON_STARTUP: bool = True
+
     # Frontend URL for CORS
     # Frontend URL for CORS (single). For multiple origins use FRONTEND_URLS comma-separated.
     FRONTEND_URL: str = "http://localhost:5173"
@@ -22,6 +49,15 @@ class Settings(BaseSettings):
     # Secret key for JWT tokens
     # IMPORTANT: do not commit a real secret to the repo. Provide via environment in production.
     SECRET_KEY: str = ""
+    # Access tokens are short-lived; clients renew them at /auth/refresh with a
+    # rotating refresh token. Password changes revoke both by bumping the
+    # user's token_version, which every token carries.
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # A refresh token presented again this soon after it was exchanged is a
+    # concurrent refresh (two tabs, a retried request) rather than a replay: it
+    # gets tokens for the current refresh counter instead of revoking everything.
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
     
     # Cloudinary configuration
     CLOUDINARY_CLOUD_NAME: str = ""
@@ -42,9 +78,73 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     RATE_LIMIT_PER_MINUTE: int = 60
     ENABLE_HTTPS: bool = False
+    # Mount the /internal/* stats endpoints (cache, hashing pool, DB pool and
+    # replica counters). They are unauthenticated: only enable them where the
+    # app is not publicly reachable.
+    INTERNAL_STATS_ENABLED: bool = False
     AUDIT_LOG_ENABLED: bool = False
     # In production set this to a list of allowed hostnames/origins. Empty means no wildcard.
     ALLOWED_HOSTS: list[str] = []
+
+    # Forum question views are buffered in memory and written in batches
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Flush early once this many view increments are waiting
+    VIEW_COUNT_MAX_BUFFERED: int = 1000
+
+    # Response cache for forum question pages and question details
+    FORUM_CACHE_ENABLED: bool = True
+    FORUM_CACHE_TTL_SECONDS: float = 30.0
+    FORUM_CACHE_MAX_ENTRIES: int = 1024
+
+    # Upper bound on the number of votes accepted by one batch vote request
+    FORUM_VOTE_BATCH_MAX_ITEMS: int = 100
+
+    # "Hot" forum ranking: engagement loses half its weight every half-life.
+    # Every worker schedules the decay; a stored claim lets one of them run it.
+    FORUM_HOT_HALF_LIFE_HOURS: float = 12.0
+    FORUM_HOT_DECAY_INTERVAL_SECONDS: float = 300.0
+    FORUM_HOT_DECAY_ENABLED: bool = True
+
+    # Authenticated users are cached by id so the auth dependency skips the users query.
+    # Writes invalidate the entry in this process; other processes see them after the TTL.
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Verified JWT payloads are cached by token digest until the token expires
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing runs on a dedicated pool ("thread" or "process") so slow
+    # bcrypt calls do not occupy request threads. 0 workers means one per CPU.
+    # Requests beyond workers + queue size are rejected with 503.
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Password hashing policy: "bcrypt" or "scrypt" (memory-hard, stdlib hashlib.scrypt).
+    # Existing hashes with another scheme or cost are upgraded on the next login.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # scrypt cost: N = 2**LOG_N, memory per hash is about 128 * N * BLOCK_SIZE bytes
+    PASSWORD_SCRYPT_LOG_N: int = 15
+    PASSWORD_SCRYPT_BLOCK_SIZE: int = 8
+    PASSWORD_SCRYPT_PARALLELISM: int = 1
+
+    # Failed logins are counted per account and per client IP over a sliding
+    # window; over-limit attempts get 429 before any password hashing
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 900
+    LOGIN_THROTTLE_MAX_FAILURES_PER_ACCOUNT: int = 10
+    LOGIN_THROTTLE_MAX_FAILURES_PER_IP: int = 100
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    # Comma-separated addresses or networks of the reverse proxies in front of
+    # the app; their X-Forwarded-For entries are trusted, anything left of the
+    # first untrusted hop is ignored. "*" trusts only the connecting proxy.
+    # uvicorn reads the same environment variable for --forwarded-allow-ips,
+    # so list networks rather than "*" (uvicorn then uses the client-supplied
+    # left-most entry for request.client).
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1,::1"
     
     class Config:
         env_file = ".env"
@@ -6,32 +6,30 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import verify_token
-from app.crud.crud_user import get_user
-from app.db.session import get_session
+from app.core.security import ACCESS_TOKEN_TYPE, verify_token
+from app.crud.crud_user import get_user_cached
+from app.db.session import get_async_session, get_session
 from app.models.user import User
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
+def authenticate_token(session: Session, token: str) -> User:
     """
-    Get the current authenticated user from JWT token.
+    Resolve a bearer token to its user.
     
     Args:
-        credentials: HTTP Bearer token credentials
         session: Database session
+        token: The bearer token
         
     Returns:
         User: The authenticated user
         
     Raises:
-        HTTPException: 401 if token is invalid or user not found
+        HTTPException: 401 if token is invalid, revoked or user not found
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,9 +39,12 @@ def get_current_user(
     
     try:
         # Verify the token
-        payload = verify_token(credentials.credentials)
+        payload = verify_token(token)
         if payload is None:
             raise credentials_exception
+        # Refresh tokens are only accepted by /auth/refresh (tokens without a type predate them)
+        if payload.get("type", ACCESS_TOKEN_TYPE) != ACCESS_TOKEN_TYPE:
+            raise credentials_exception
         
         # Extract user ID from token
         user_sub = payload.get("sub")
@@ -57,14 +58,52 @@ def get_current_user(
     except Exception:
         raise credentials_exception
     
-    # Get user from database
-    user = get_user(session=session, user_id=user_id)
+    # Get user from the user cache, falling back to the database
+    user = get_user_cached(session=session, user_id=user_id)
     if user is None:
         raise credentials_exception
     
+    # Tokens issued before the user's last revocation carry an older version.
+    # The user comes from the in-memory user cache, so this costs no query.
+    if payload.get("ver", 0) != user.token_version:
+        raise credentials_exception
+    
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: Session = Depends(get_session)
+) -> User:
+    """
+    Get the current authenticated user from JWT token.
+    
+    Args:
+        credentials: HTTP Bearer token credentials
+        session: Database session
+        
+    Returns:
+        User: The authenticated user
+        
+    Raises:
+        HTTPException: 401 if token is invalid, revoked or user not found
+    """
+    return authenticate_token(session, credentials.credentials)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """
+    get_current_user() for async endpoints, on the request's async session.
+    
+    Raises:
+        HTTPException: 401 if token is invalid, revoked or user not found
+    """
+    return await session.run_sync(authenticate_token, credentials.credentials)
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -86,3 +125,15 @@ def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """
+    get_current_active_user() for async endpoints.
+    
+    Raises:
+        HTTPException: 400 if user is inactive
+    """
+    return get_current_active_user(current_user)
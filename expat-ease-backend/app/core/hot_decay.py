@@ -0,0 +1,53 @@
+"""
+Periodic decay of forum question hot scores.
+
+Votes, answers and views add weight to Question.hot_score as they happen;
+this job scales all scores down at a fixed interval so the "hot" listing
+favours recent engagement.
+
+Every worker runs the loop, but each run is claimed through the stored
+JobRun row: one worker applies the decay for the time since the previous run
+(by any worker, before any restart), and the others skip.
+"""
+import asyncio
+import logging
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.crud.crud_forum import decay_hot_scores
+from app.crud.crud_job_run import claim_job_run
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+DECAY_JOB = "forum_hot_decay"
+
+
+def decay_once(min_interval_seconds: float) -> int:
+    """
+    Apply the decay accumulated since the last run, unless it ran within `min_interval_seconds`.
+
+    Returns:
+        int: Number of questions updated (0 if another worker ran the decay)
+    """
+    with Session(engine) as session:
+        elapsed = claim_job_run(session, DECAY_JOB, min_interval_seconds)
+        if elapsed is None:
+            session.commit()  # keeps a first run's clock
+            return 0
+        # Commits the claim together with the decayed scores
+        return decay_hot_scores(session, elapsed, settings.FORUM_HOT_HALF_LIFE_HOURS)
+
+
+async def run_periodic_decay(interval: float) -> None:
+    """Try to decay hot scores every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Half an interval of slack, so a worker whose timer fires a little
+            # early is not skipped for a whole interval
+            await run_in_threadpool(decay_once, interval / 2)
+        except Exception:
+            logger.exception("Failed to decay forum hot scores")
@@ -0,0 +1,213 @@
+"""
+Sliding-window throttling of failed logins.
+
+Failed logins are counted per account (email) and per client IP over the
+last LOGIN_THROTTLE_WINDOW_SECONDS. Once either count reaches its limit,
+further attempts are rejected with 429 before the user lookup or any
+password hashing, so credential stuffing cannot turn into bcrypt CPU load.
+
+Behind a reverse proxy every connection comes from the proxy, so the client
+IP is taken from X-Forwarded-For when the proxy is listed in
+FORWARDED_ALLOW_IPS (see client_ip()).
+
+The default backend keeps the counters in process; a shared store (e.g. a
+Redis-compatible server) can be plugged in by implementing ThrottleBackend
+so limits hold across workers.
+"""
+import ipaddress
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+class ThrottleBackend(ABC):
+    """
+    Interface for failure-counter stores.
+
+    A Redis-compatible implementation maps these to a sorted set per key:
+    ZADD + ZREMRANGEBYSCORE + EXPIRE for add(), ZCOUNT / ZRANGE for
+    blocked_until() and DEL for reset().
+    """
+
+    @abstractmethod
+    def add(self, key: str, now: float, window: float, limit: int) -> None:
+        ...
+
+    @abstractmethod
+    def blocked_until(self, key: str, now: float, window: float, limit: int) -> float:
+        ...
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        ...
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """Thread-safe in-process failure log, bounded to `max_keys` most recently failing keys."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # Per key, the timestamps of its most recent failures (at most `limit`)
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str, now: float, window: float, limit: int) -> None:
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None:
+                failures = self._failures[key] = deque(maxlen=limit)
+                while len(self._failures) > self.max_keys:
+                    self._failures.popitem(last=False)
+            else:
+                self._failures.move_to_end(key)
+            failures.append(now)
+
+    def blocked_until(self, key: str, now: float, window: float, limit: int) -> float:
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None:
+                return 0.0
+            while failures and failures[0] <= now - window:
+                failures.popleft()
+            if not failures:
+                del self._failures[key]
+                return 0.0
+            # Only the newest `limit` failures are kept, so a full log means over the limit
+            if len(failures) < limit:
+                return 0.0
+            return failures[0] + window
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+def _is_trusted_proxy(host: str, trusted: List[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return host in trusted
+    for entry in trusted:
+        try:
+            if address in ipaddress.ip_network(entry, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Address of the client that sent the request.
+
+    The connecting address is used unless it is a proxy listed in
+    FORWARDED_ALLOW_IPS. Then X-Forwarded-For is walked from the right (the
+    entries appended by our own proxies) to the first untrusted hop; entries
+    left of it were written by the client and are ignored. "*" trusts only the
+    connecting proxy, so the right-most entry is used. The header is read even
+    if uvicorn already applied it: with "*" uvicorn picks the left-most entry,
+    which the client controls.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Optional[str]: The client IP, or None if the request has no client address
+    """
+    peer = request.client.host if request.client else None
+    forwarded = request.headers.get("x-forwarded-for")
+    if peer is None or not forwarded:
+        return peer
+    trusted = [entry.strip() for entry in settings.FORWARDED_ALLOW_IPS.split(",") if entry.strip()]
+    if "*" not in trusted and not _is_trusted_proxy(peer, trusted):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    if not hops:
+        return peer
+    if "*" in trusted:
+        return hops[-1]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop, trusted):
+            return hop
+    return hops[0]
+
+
+class LoginThrottle:
+    """Per-account and per-IP failed-login limits."""
+
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        window: float,
+        max_per_account: int,
+        max_per_ip: int,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.window = window
+        self.max_per_account = max_per_account
+        self.max_per_ip = max_per_ip
+        self.enabled = enabled
+        self.rejected = 0
+
+    @staticmethod
+    def _keys(email: str, ip: Optional[str]) -> tuple:
+        return f"account:{email.strip().lower()}", (f"ip:{ip}" if ip else None)
+
+    def check(self, email: str, ip: Optional[str]) -> None:
+        """
+        Reject the attempt if the account or the IP is over its failure limit.
+
+        An unknown IP (None) is only checked against the account limit.
+
+        Raises:
+            HTTPException: 429 with Retry-After until the oldest counted failure expires
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        account_key, ip_key = self._keys(email, ip)
+        blocked_until = self.backend.blocked_until(account_key, now, self.window, self.max_per_account)
+        if ip_key:
+            blocked_until = max(
+                blocked_until, self.backend.blocked_until(ip_key, now, self.window, self.max_per_ip)
+            )
+        if blocked_until > now:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts, please try again later",
+                headers={"Retry-After": str(int(blocked_until - now) + 1)},
+            )
+
+    def record_failure(self, email: str, ip: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        account_key, ip_key = self._keys(email, ip)
+        self.backend.add(account_key, now, self.window, self.max_per_account)
+        if ip_key:
+            self.backend.add(ip_key, now, self.window, self.max_per_ip)
+
+    def record_success(self, email: str) -> None:
+        """Clear the account's failures; the IP keeps its count so one good login can't launder a spray."""
+        if not self.enabled:
+            return
+        account_key, _ = self._keys(email, None)
+        self.backend.reset(account_key)
+
+
+# Global throttle used by the login endpoint
+login_throttle = LoginThrottle(
+    backend=InMemoryThrottleBackend(max_keys=settings.LOGIN_THROTTLE_MAX_KEYS),
+    window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+    max_per_account=settings.LOGIN_THROTTLE_MAX_FAILURES_PER_ACCOUNT,
+    max_per_ip=settings.LOGIN_THROTTLE_MAX_FAILURES_PER_IP,
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
@@ -5,17 +5,11 @@ import re
 import secrets
 import string
 from typing import List, Tuple
-from passlib.context import CryptContext
 from pydantic import BaseModel, validator
 
 from app.core.config import settings
-
-# Enhanced password hashing context
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12  # Increased rounds for better security
-)
+# Hashing lives in app.core.security; re-exported for existing imports
+from app.core.security import hash_password, verify_password  # noqa: F401
 
 # Password strength requirements
 PASSWORD_REQUIREMENTS = {
@@ -218,33 +212,6 @@ class PasswordValidator:
         return ''.join(password)
 
 
-def hash_password(plain_password: str) -> str:
-    """
-    Hash a password using enhanced bcrypt.
-    
-    Args:
-        plain_password: Plain text password
-        
-    Returns:
-        str: Hashed password
-    """
-    return pwd_context.hash(plain_password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify a password against its hash.
-    
-    Args:
-        plain_password: Plain text password
-        hashed_password: Hashed password
-        
-    Returns:
-        bool: True if password matches
-    """
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def check_password_strength(password: str) -> Tuple[bool, str]:
     """
     Quick password strength check for API responses.
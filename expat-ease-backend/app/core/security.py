@@ -1,25 +1,70 @@
 """
 Security utilities for password hashing, verification, and JWT tokens.
 """
+import hashlib
+import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
+from app.core.cache import token_cache
 from app.core.config import settings
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# Schemes the service can verify; the configured one is used for new hashes and
+# every other scheme (or a different cost) is reported as needing an update
+PASSWORD_SCHEMES = ("bcrypt", "scrypt")
+
+
+def build_password_context() -> "CryptContext":
+    """Build the password hashing context from the PASSWORD_HASH_* settings."""
+    # passlib is imported here so importing the app does not load it
+    from passlib.context import CryptContext
+
+    scheme = settings.PASSWORD_HASH_SCHEME
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    return CryptContext(
+        schemes=[scheme] + [s for s in PASSWORD_SCHEMES if s != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+        # scrypt uses hashlib.scrypt from the standard library
+        scrypt__rounds=settings.PASSWORD_SCRYPT_LOG_N,
+        scrypt__block_size=settings.PASSWORD_SCRYPT_BLOCK_SIZE,
+        scrypt__parallelism=settings.PASSWORD_SCRYPT_PARALLELISM,
+    )
+
+
+# The single password hashing context used across the app, built on first use
+pwd_context: Optional["CryptContext"] = None
+
+
+def _password_context() -> "CryptContext":
+    global pwd_context
+    if pwd_context is None:
+        pwd_context = build_password_context()
+    return pwd_context
 
 # JWT settings
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours (1 day)
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+def _truncate_password(plain_password: str) -> str:
+    # Truncate password to 72 bytes to prevent bcrypt errors. Applied to every
+    # scheme so a password keeps verifying after its hash migrates schemes.
+    return plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
 
 
 def hash_password(plain_password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password with the configured scheme and cost.
     
     Args:
         plain_password: The plain text password to hash
@@ -27,9 +72,7 @@ def hash_password(plain_password: str) -> str:
     Returns:
         str: The hashed password
     """
-    # Truncate password to 72 bytes to prevent bcrypt errors
-    truncated_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(truncated_password)
+    return _password_context().hash(_truncate_password(plain_password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -43,9 +86,45 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password matches, False otherwise
     """
-    # Truncate password to 72 bytes to match the hashing behavior
-    truncated_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.verify(truncated_password, hashed_password)
+    return _password_context().verify(_truncate_password(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash is outdated, rehash it with the current policy.
+    
+    A hash is outdated when it uses another scheme or cost than the configured
+    ones, so changing PASSWORD_HASH_SCHEME or the cost settings migrates users
+    on their next successful login.
+    
+    Args:
+        plain_password: The plain text password to verify
+        hashed_password: The hashed password to compare against
+        
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and the new
+        hash to store (None when the password is wrong or the hash is current)
+    """
+    return _password_context().verify_and_update(_truncate_password(plain_password), hashed_password)
+
+
+def verify_dummy_password(plain_password: str) -> bool:
+    """
+    Spend the same time as verify_password() without a user to check against.
+    
+    Used for unknown emails so a failed login takes as long whether or not
+    the account exists. Verifies against a hash made with the current policy.
+    
+    Returns:
+        bool: Always False
+    """
+    _password_context().dummy_verify()
+    return False
+
+
+def password_needs_update(hashed_password: str) -> bool:
+    """Return True if the hash does not match the configured scheme and cost."""
+    return _password_context().needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -63,16 +142,75 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token(user_id: int, token_version: int, session_id: int, counter: int) -> str:
+    """
+    Create a single-use JWT refresh token.
+    
+    Args:
+        user_id: ID of the user the token is issued to
+        token_version: The user's current token_version
+        session_id: ID of the refresh session the token belongs to
+        counter: The refresh session's current counter
+        
+    Returns:
+        str: The encoded refresh token, valid for REFRESH_TOKEN_EXPIRE_DAYS
+    """
+    return create_access_token(
+        {
+            "sub": str(user_id),
+            "ver": token_version,
+            "type": REFRESH_TOKEN_TYPE,
+            # Checked against the stored session so each token is exchanged once
+            "sid": session_id,
+            "rc": counter,
+        },
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+
+def create_token_pair(user_id: int, email: str, token_version: int, session_id: int, counter: int = 0) -> dict:
+    """
+    Create the access and refresh tokens returned on login and refresh.
+    
+    Args:
+        user_id: ID of the user
+        email: The user's email (included in the access token)
+        token_version: The user's current token_version
+        session_id: ID of the refresh session the refresh token belongs to
+        counter: The refresh session's current counter
+        
+    Returns:
+        dict: access_token, refresh_token, token_type and expires_in (seconds)
+    """
+    access_token = create_access_token(
+        {"sub": str(user_id), "email": email, "ver": token_version, "type": ACCESS_TOKEN_TYPE}
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(user_id, token_version, session_id, counter),
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+def _token_cache_key(token: str) -> str:
+    # The secret is part of the digest, so rotating SECRET_KEY orphans every cached payload
+    return hashlib.sha256(f"{settings.SECRET_KEY}\0{token}".encode("utf-8")).hexdigest()
+
+
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify and decode a JWT token.
+
+    Verified payloads are cached until the token's ``exp``, so a token that is
+    presented repeatedly is only decoded and signature-checked once.
     
     Args:
         token: The JWT token to verify
@@ -80,8 +218,20 @@ def verify_token(token: str) -> Optional[dict]:
     Returns:
         Optional[dict]: The decoded token payload if valid, None otherwise
     """
+    key = _token_cache_key(token)
+    cached = token_cache.get(key)
+    if cached is not None:
+        payload = json.loads(cached)
+        if payload["exp"] > time.time():
+            return payload
+        token_cache.delete(key)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, json.dumps(payload), ttl=exp - time.time())
+    return payload
@@ -3,8 +3,6 @@ import uuid
 from typing import Tuple
 from fastapi import UploadFile
 import aiofiles
-import cloudinary
-import cloudinary.uploader
 from app.core.config import settings
 
 # Global flag to track if Cloudinary has been configured
@@ -14,6 +12,8 @@ def _ensure_cloudinary_configured():
     """Configure Cloudinary only when needed (lazy initialization)."""
     global _cloudinary_configured
     if not _cloudinary_configured:
+        # Imported here so the SDK is only loaded by the first upload, not at startup
+        import cloudinary
         cloudinary.config(
             cloud_name=settings.CLOUDINARY_CLOUD_NAME,
             api_key=settings.CLOUDINARY_API_KEY,
@@ -45,6 +45,7 @@ async def save_upload_file(user_id: int, upload_file: UploadFile) -> Tuple[str,
     file_size = len(content)
     
     # Upload to Cloudinary
+    import cloudinary.uploader
     try:
         # Determine resource type based on file extension
         file_extension = file_extension.lower()
@@ -0,0 +1,130 @@
+"""
+Write-behind accumulator for forum question view counts.
+
+Question reads record a view in memory instead of committing an UPDATE; the
+buffered increments are written periodically (and on shutdown) as a single
+batched ``UPDATE question SET view_count = view_count + :n`` statement, which
+also adds the views' weight to the question's hot score. When too many
+increments pile up between periodic flushes, the flusher is woken early; the
+write never runs on the request that recorded the view.
+"""
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, update
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.crud.crud_forum import HOT_VIEW
+from app.db.session import engine
+from app.models.forum import Question
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """Thread-safe per-question view increments waiting to be written."""
+
+    def __init__(self, max_buffered: int):
+        self.max_buffered = max_buffered
+        self._deltas: Dict[int, int] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._flush_listeners: List[Callable[[Iterable[int]], None]] = []
+        # Set while run_periodic_flush() runs: its loop and the event that wakes it early
+        self._flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def add_flush_listener(self, callback: Callable[[Iterable[int]], None]) -> None:
+        """Register a callback invoked with the question ids written by each flush."""
+        self._flush_listeners.append(callback)
+
+    def record(self, question_id: int) -> None:
+        """
+        Record one view of a question.
+
+        Once max_buffered increments are waiting the periodic flusher is woken
+        to write them right away, so memory stays bounded if the interval is
+        long. Without a running flusher (e.g. a script using the buffer
+        directly) the caller flushes inline instead.
+        """
+        with self._lock:
+            self._deltas[question_id] = self._deltas.get(question_id, 0) + 1
+            self._pending += 1
+            should_flush = self._pending >= self.max_buffered
+        if not should_flush:
+            return
+        loop, wakeup = self._flusher_loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            # Thread-safe: views are also recorded from threadpool workers
+            loop.call_soon_threadsafe(wakeup.set)
+        else:
+            self.flush()
+
+    def pending(self, question_id: int) -> int:
+        """Return the unflushed increments for a question."""
+        with self._lock:
+            return self._deltas.get(question_id, 0)
+
+    def flush(self) -> int:
+        """
+        Write all buffered increments in one batched UPDATE.
+
+        Returns:
+            int: Number of questions updated
+        """
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+            self._pending = 0
+        if not deltas:
+            return 0
+
+        table = Question.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("question_id"))
+            .values(
+                view_count=table.c.view_count + bindparam("delta"),
+                hot_score=table.c.hot_score + bindparam("delta") * HOT_VIEW,
+            )
+        )
+        try:
+            with engine.begin() as conn:
+                conn.execute(statement, [
+                    {"question_id": question_id, "delta": delta} for question_id, delta in deltas.items()
+                ])
+        except Exception:
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                for question_id, delta in deltas.items():
+                    self._deltas[question_id] = self._deltas.get(question_id, 0) + delta
+                    self._pending += delta
+            raise
+        for callback in self._flush_listeners:
+            callback(deltas.keys())
+        return len(deltas)
+
+    async def run_periodic_flush(self, interval: float) -> None:
+        """Flush every `interval` seconds, or sooner when record() asks to, until cancelled."""
+        self._wakeup = asyncio.Event()
+        self._flusher_loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                try:
+                    await run_in_threadpool(self.flush)
+                except Exception:
+                    logger.exception("Failed to flush buffered question view counts")
+        finally:
+            self._flusher_loop = None
+            self._wakeup = None
+
+
+# Global buffer used by the forum endpoints and the application lifespan
+view_counts = ViewCountBuffer(max_buffered=settings.VIEW_COUNT_MAX_BUFFERED)
@@ -0,0 +1,706 @@
+"""
+Query helpers for the forum.
+
+Questions and answers carry denormalized vote/answer counters, so listing
+and detail reads are plain row fetches. Embedded authors are resolved through
+a UserSummaryLoader, which fetches every author a response needs with one
+IN query instead of joining (and repeating) the author on every row. The
+counters are adjusted in the same transaction as the vote or answer write
+and can be rebuilt from the source tables with reconcile_counters().
+
+Questions also carry a hot_score for the "hot" listing: every vote, answer
+and view adds its weight to the score, and decay_hot_scores() periodically
+scales all scores down so that older engagement counts for less.
+"""
+import base64
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
+
+from sqlalchemy import bindparam, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+
+from app.models.forum import Question, Answer, QuestionVote, AnswerVote, QuestionCategory
+from app.models.user import User
+
+# Weight of each kind of engagement in Question.hot_score
+HOT_NEW_QUESTION = 3.0
+HOT_VOTE = 1.0
+HOT_ANSWER = 2.0
+HOT_VIEW = 0.1
+# Decayed scores below this are snapped to zero so idle questions stop being rewritten
+HOT_FLOOR = 0.01
+
+# Listing orders; the id tie-breaker keeps pages stable when sort keys are equal
+_SORT_ORDERS = {
+    "new": (Question.created_at.desc(), Question.id.desc()),
+    "hot": (Question.hot_score.desc(), Question.id.desc()),
+}
+
+
+def _author_columns():
+    return (User.id, User.full_name, User.email, User.profile_photo, User.country)
+
+
+def _author_summary(user_id: int, full_name, email, profile_photo, country) -> dict:
+    """Build the public user summary embedded in forum responses."""
+    if email is None:
+        return {"id": user_id, "full_name": "Unknown", "profile_photo": None, "country": None}
+    return {
+        "id": user_id,
+        "full_name": full_name or email,
+        "profile_photo": profile_photo,
+        "country": country,
+    }
+
+
+class UserSummaryLoader:
+    """
+    Request-scoped batch loader for the author summaries embedded in forum responses.
+
+    Callers queue the user ids a response needs with prime(); the first get()
+    afterwards fetches every queued id in one ``SELECT ... WHERE id IN (...)``
+    over the summary columns only. Loaded summaries are kept for the lifetime
+    of the loader, so authors that recur across a response are fetched once.
+    """
+
+    # Keeps the IN list well below the bound-parameter limits of SQLite/PostgreSQL
+    BATCH_SIZE = 500
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._summaries: Dict[int, dict] = {}
+        self._pending: Set[int] = set()
+
+    def prime(self, user_ids: Iterable[int]) -> None:
+        """Queue user ids to be fetched by the next get()."""
+        self._pending.update(user_id for user_id in user_ids if user_id not in self._summaries)
+
+    def get(self, user_id: int) -> dict:
+        """Return the summary of a user, fetching all queued ids if needed."""
+        if user_id not in self._summaries:
+            self._pending.add(user_id)
+            self._load_pending()
+        return self._summaries[user_id]
+
+    def _load_pending(self) -> None:
+        pending = sorted(self._pending)
+        self._pending.clear()
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            rows = self.session.exec(select(*_author_columns()).where(User.id.in_(batch))).all()
+            for row in rows:
+                self._summaries[row[0]] = _author_summary(*row)
+            # Authors that no longer exist are shown as "Unknown"
+            for user_id in batch:
+                self._summaries.setdefault(user_id, _author_summary(user_id, None, None, None, None))
+
+
+def _question_to_dict(question: Question, users: UserSummaryLoader) -> dict:
+    return {
+        "id": question.id,
+        "title": question.title,
+        "content": question.content,
+        "category": question.category,
+        "created_at": question.created_at,
+        "updated_at": question.updated_at,
+        "is_resolved": question.is_resolved,
+        "view_count": question.view_count,
+        "answer_count": question.answer_count,
+        "upvotes": question.upvote_count,
+        "downvotes": question.downvote_count,
+        "user": users.get(question.user_id),
+    }
+
+
+def _questions_to_dicts(questions: List[Question], users: UserSummaryLoader) -> List[dict]:
+    users.prime(question.user_id for question in questions)
+    return [_question_to_dict(question, users) for question in questions]
+
+
+def get_question_page(
+    session: Session,
+    category: Optional[QuestionCategory] = None,
+    limit: int = 20,
+    offset: int = 0,
+    sort: str = "new",
+    users: Optional[UserSummaryLoader] = None,
+) -> List[dict]:
+    """
+    Get a page of questions with counts and author summaries.
+
+    Args:
+        session: Database session
+        category: Optional category filter
+        limit: Page size
+        offset: Number of questions to skip
+        sort: "new" (newest first) or "hot" (highest hot_score first)
+        users: The request's author loader (a new one is created if omitted)
+
+    Returns:
+        List[dict]: Serialized questions
+    """
+    statement = select(Question)
+    if category:
+        statement = statement.where(Question.category == category)
+    statement = statement.order_by(*_SORT_ORDERS[sort]).offset(offset).limit(limit)
+    return _questions_to_dicts(session.exec(statement).all(), users or UserSummaryLoader(session))
+
+
+def encode_cursor(created_at: datetime, question_id: int) -> str:
+    """Encode a question's (created_at, id) sort key as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{question_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, question_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(question_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_question_page_after(
+    session: Session,
+    category: Optional[QuestionCategory] = None,
+    limit: int = 20,
+    after: Optional[str] = None,
+    users: Optional[UserSummaryLoader] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Get a page of questions, newest first, using keyset pagination.
+
+    Seeks on the (created_at, id) index instead of skipping rows, so deep pages
+    cost the same as the first one.
+
+    Args:
+        session: Database session
+        category: Optional category filter
+        limit: Page size
+        after: Cursor returned with the previous page, None for the first page
+        users: The request's author loader (a new one is created if omitted)
+
+    Returns:
+        Tuple[List[dict], Optional[str]]: Serialized questions and the cursor of
+        the next page (None when this is the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    statement = select(Question)
+    if category:
+        statement = statement.where(Question.category == category)
+    if after:
+        statement = statement.where(tuple_(Question.created_at, Question.id) < decode_cursor(after))
+    statement = statement.order_by(Question.created_at.desc(), Question.id.desc()).limit(limit + 1)
+
+    questions = session.exec(statement).all()
+    next_cursor = None
+    if len(questions) > limit:
+        questions = questions[:limit]
+        last = questions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return _questions_to_dicts(questions, users or UserSummaryLoader(session)), next_cursor
+
+
+def get_question_summary(
+    session: Session,
+    question_id: int,
+    users: Optional[UserSummaryLoader] = None,
+) -> Optional[dict]:
+    """Get a single question with counts and author summary, or None if missing."""
+    question = session.get(Question, question_id)
+    return _question_to_dict(question, users or UserSummaryLoader(session)) if question else None
+
+
+def get_view_count(session: Session, question_id: int) -> Optional[int]:
+    """Get a question's stored view count, or None if the question is missing."""
+    return session.exec(select(Question.view_count).where(Question.id == question_id)).first()
+
+
+def _answer_to_dict(answer: Answer, users: UserSummaryLoader) -> dict:
+    return {
+        "id": answer.id,
+        "content": answer.content,
+        "created_at": answer.created_at,
+        "updated_at": answer.updated_at,
+        "is_accepted": answer.is_accepted,
+        "upvotes": answer.upvote_count,
+        "downvotes": answer.downvote_count,
+        "user": users.get(answer.user_id),
+    }
+
+
+def _answers_to_dicts(answers: List[Answer], users: UserSummaryLoader) -> List[dict]:
+    users.prime(answer.user_id for answer in answers)
+    return [_answer_to_dict(answer, users) for answer in answers]
+
+
+def _answers_of(question_id: int, after: Optional[str] = None):
+    """Answers of a question, oldest first, optionally starting after a cursor."""
+    statement = select(Answer).where(Answer.question_id == question_id)
+    if after:
+        statement = statement.where(tuple_(Answer.created_at, Answer.id) > decode_cursor(after))
+    return statement.order_by(Answer.created_at.asc(), Answer.id.asc())
+
+
+def get_answers_for_question(
+    session: Session,
+    question_id: int,
+    users: Optional[UserSummaryLoader] = None,
+) -> List[dict]:
+    """
+    Get all answers of a question, oldest first, with vote counts and authors.
+
+    Args:
+        session: Database session
+        question_id: ID of the question
+        users: The request's author loader (a new one is created if omitted)
+
+    Returns:
+        List[dict]: Serialized answers
+    """
+    answers = session.exec(_answers_of(question_id)).all()
+    return _answers_to_dicts(answers, users or UserSummaryLoader(session))
+
+
+def get_answer_page_after(
+    session: Session,
+    question_id: int,
+    limit: int = 20,
+    after: Optional[str] = None,
+    users: Optional[UserSummaryLoader] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Get a page of a question's answers, oldest first, using keyset pagination.
+
+    Args:
+        session: Database session
+        question_id: ID of the question
+        limit: Page size
+        after: Cursor returned with the previous page, None for the first page
+        users: The request's author loader (a new one is created if omitted)
+
+    Returns:
+        Tuple[List[dict], Optional[str]]: Serialized answers and the cursor of
+        the next page (None when this is the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    answers = session.exec(_answers_of(question_id, after).limit(limit + 1)).all()
+    next_cursor = None
+    if len(answers) > limit:
+        answers = answers[:limit]
+        last = answers[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return _answers_to_dicts(answers, users or UserSummaryLoader(session)), next_cursor
+
+
+def iter_answers(
+    session: Session,
+    question_id: int,
+    after: Optional[str] = None,
+    batch_size: int = 500,
+) -> Iterator[dict]:
+    """
+    Yield a question's answers, oldest first, as they are read from the database.
+
+    Rows are fetched `batch_size` at a time from a server-side cursor (where
+    the driver supports one), so memory does not grow with the thread size.
+    Authors are loaded once per batch for the ids not seen in earlier batches.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    users = UserSummaryLoader(session)
+    statement = _answers_of(question_id, after).execution_options(yield_per=batch_size)
+    for partition in session.exec(statement).partitions():
+        yield from _answers_to_dicts(partition, users)
+
+
+def get_question_detail(
+    session: Session,
+    question_id: int,
+    users: Optional[UserSummaryLoader] = None,
+) -> Optional[dict]:
+    """
+    Get a question with its answers embedded.
+
+    Args:
+        session: Database session
+        question_id: ID of the question
+        users: The request's author loader (a new one is created if omitted)
+
+    Returns:
+        Optional[dict]: Serialized question with answers, or None if missing
+    """
+    question = session.get(Question, question_id)
+    if question is None:
+        return None
+    answers = session.exec(_answers_of(question_id)).all()
+
+    # The question author and every answer author are fetched together
+    users = users or UserSummaryLoader(session)
+    users.prime([question.user_id, *(answer.user_id for answer in answers)])
+    detail = _question_to_dict(question, users)
+    detail["answers"] = _answers_to_dicts(answers, users)
+    return detail
+
+
+# Vote table, its foreign key to the voted row, and the column of the voted row
+# callers need for cache invalidation
+_VOTE_TARGETS = {
+    Question: (QuestionVote, "question_id", Question.category),
+    Answer: (AnswerVote, "answer_id", Answer.question_id),
+}
+
+_DIALECT_INSERTS = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+def _upsert_vote(
+    session: Session,
+    model: Type[Union[Question, Answer]],
+    target_id: int,
+    user_id: int,
+    is_upvote: bool,
+) -> Optional[bool]:
+    """
+    Write a user's vote on a question or answer (not committed).
+
+    A first vote is an ``INSERT ... ON CONFLICT DO NOTHING``; if the user
+    already voted, a conditional UPDATE flips the stored vote only when it
+    differs. Both are single statements guarded by the unique
+    (target, user) index, so concurrent double submits cannot create two rows.
+    Other dialects fall back to `_write_vote_portable`.
+
+    Returns:
+        Optional[bool]: The user's previous vote (None for a first vote);
+        equal to `is_upvote` when the vote was unchanged
+    """
+    vote_model, target_key, _ = _VOTE_TARGETS[model]
+    table = vote_model.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        return _write_vote_portable(session, table, target_key, target_id, user_id, is_upvote)
+
+    inserted = session.exec(
+        _DIALECT_INSERTS[dialect](table)
+        .values({target_key: target_id, "user_id": user_id, "is_upvote": is_upvote,
+                 "created_at": datetime.utcnow()})
+        .on_conflict_do_nothing(index_elements=[target_key, "user_id"])
+        .returning(table.c.id)
+    ).first()
+    if inserted is not None:
+        return None
+
+    flipped = session.exec(
+        update(table)
+        .where(table.c[target_key] == target_id, table.c.user_id == user_id, table.c.is_upvote != is_upvote)
+        .values(is_upvote=is_upvote)
+        .returning(table.c.id)
+    ).first()
+    return (not is_upvote) if flipped is not None else is_upvote
+
+
+def _write_vote_portable(
+    session: Session,
+    table,
+    target_key: str,
+    target_id: int,
+    user_id: int,
+    is_upvote: bool,
+) -> Optional[bool]:
+    """
+    `_upsert_vote` for dialects without ``ON CONFLICT``/``RETURNING``.
+
+    Reads the stored vote, then INSERTs or UPDATEs it. The INSERT runs in a
+    savepoint so a concurrent first vote that wins the unique index turns
+    into a re-read instead of an error.
+    """
+    def stored_vote() -> Optional[bool]:
+        return session.exec(
+            select(table.c.is_upvote)
+            .where(table.c[target_key] == target_id, table.c.user_id == user_id)
+        ).first()
+
+    previous = stored_vote()
+    if previous is None:
+        try:
+            with session.begin_nested():
+                session.exec(
+                    table.insert().values({target_key: target_id, "user_id": user_id,
+                                           "is_upvote": is_upvote, "created_at": datetime.utcnow()})
+                )
+            return None
+        except IntegrityError:
+            previous = stored_vote()
+
+    if previous == is_upvote:
+        return previous
+    flipped = session.exec(
+        update(table)
+        .where(table.c[target_key] == target_id, table.c.user_id == user_id, table.c.is_upvote != is_upvote)
+        .values(is_upvote=is_upvote)
+    )
+    # A concurrent request may have flipped it first
+    return previous if flipped.rowcount else is_upvote
+
+
+def apply_vote_to_counters(
+    session: Session,
+    model: Type[Union[Question, Answer]],
+    target_id: int,
+    is_upvote: bool,
+    previous_is_upvote: Optional[bool] = None,
+):
+    """
+    Adjust the vote counters of a question or answer for a single vote write.
+
+    The update is relative (``count = count + 1``) so concurrent writers do not
+    overwrite each other; it is not committed here.
+
+    Args:
+        session: Database session
+        model: Question or Answer
+        target_id: ID of the voted row
+        is_upvote: The vote being recorded
+        previous_is_upvote: The user's earlier vote on this row, None if first vote
+
+    Returns:
+        Row with the resulting upvote_count and downvote_count, plus the question
+        category (questions) or question_id (answers); None if the row does not exist
+    """
+    columns = (model.upvote_count, model.downvote_count, _VOTE_TARGETS[model][2])
+    if previous_is_upvote == is_upvote:
+        return session.exec(select(*columns).where(model.id == target_id)).first()
+
+    values = {}
+    if is_upvote:
+        values["upvote_count"] = model.upvote_count + 1
+    else:
+        values["downvote_count"] = model.downvote_count + 1
+    if previous_is_upvote is True:
+        values["upvote_count"] = model.upvote_count - 1
+    elif previous_is_upvote is False:
+        values["downvote_count"] = model.downvote_count - 1
+    if model is Question:
+        # An upvote adds HOT_VOTE, a downvote subtracts it; a flip moves the score twice as far
+        delta = HOT_VOTE if is_upvote else -HOT_VOTE
+        if previous_is_upvote is not None:
+            delta *= 2
+        values["hot_score"] = Question.hot_score + delta
+
+    return session.exec(
+        update(model).where(model.id == target_id).values(**values).returning(*columns)
+    ).first()
+
+
+def record_vote(
+    session: Session,
+    model: Type[Union[Question, Answer]],
+    target_id: int,
+    user_id: int,
+    is_upvote: bool,
+):
+    """
+    Record a user's vote and update the voted row's counters (not committed).
+
+    Voting the same way twice is a no-op. If the voted row does not exist the
+    caller must roll back, since the vote row has already been written.
+
+    Args:
+        session: Database session
+        model: Question or Answer
+        target_id: ID of the voted row
+        user_id: ID of the voting user
+        is_upvote: True for an upvote, False for a downvote
+
+    Returns:
+        The row returned by apply_vote_to_counters, None if the target does not exist
+    """
+    previous_is_upvote = _upsert_vote(session, model, target_id, user_id, is_upvote)
+    return apply_vote_to_counters(session, model, target_id, is_upvote, previous_is_upvote)
+
+
+def record_votes(
+    session: Session,
+    user_id: int,
+    votes: List[Tuple[Type[Union[Question, Answer]], int, bool]],
+) -> list:
+    """
+    Record a batch of votes by one user (not committed).
+
+    Targets are checked with one ``IN`` query per table before any vote is
+    written, so votes on missing questions/answers are skipped without
+    touching the vote tables.
+
+    Args:
+        session: Database session
+        user_id: ID of the voting user
+        votes: (model, target_id, is_upvote) tuples, applied in order
+
+    Returns:
+        list: For each vote, the row returned by record_vote, or None if its
+        target does not exist
+    """
+    existing = {}
+    for model in _VOTE_TARGETS:
+        ids = {target_id for vote_model, target_id, _ in votes if vote_model is model}
+        if ids:
+            existing[model] = set(session.exec(select(model.id).where(model.id.in_(ids))).all())
+
+    results = []
+    for model, target_id, is_upvote in votes:
+        if target_id not in existing.get(model, ()):
+            results.append(None)
+            continue
+        results.append(record_vote(session, model, target_id, user_id, is_upvote))
+    return results
+
+
+def increment_answer_count(session: Session, question_id: int) -> None:
+    """Bump a question's answer counter and hot score (not committed)."""
+    session.exec(
+        update(Question)
+        .where(Question.id == question_id)
+        .values(answer_count=Question.answer_count + 1, hot_score=Question.hot_score + HOT_ANSWER)
+    )
+
+
+def decay_hot_scores(session: Session, elapsed_seconds: float, half_life_hours: float) -> int:
+    """
+    Scale every non-zero hot score down by the decay accumulated over `elapsed_seconds`.
+
+    Scores that would fall below HOT_FLOOR are set to zero instead, so only
+    questions with recent engagement are rewritten by later decays. Both
+    UPDATEs select rows by a range of hot_score, which its index serves.
+    Commits.
+
+    Args:
+        session: Database session
+        elapsed_seconds: Time since the previous decay
+        half_life_hours: Time after which engagement counts for half as much
+
+    Returns:
+        int: Number of questions updated
+    """
+    factor = 0.5 ** (elapsed_seconds / (half_life_hours * 3600))
+    # Scores closer to zero than this decay below HOT_FLOOR
+    threshold = HOT_FLOOR / factor
+    zeroed = session.exec(
+        update(Question)
+        .where(Question.hot_score > -threshold, Question.hot_score < threshold, Question.hot_score != 0)
+        .values(hot_score=0.0),
+        execution_options={"synchronize_session": False},
+    )
+    decayed = session.exec(
+        update(Question)
+        .where(or_(Question.hot_score >= threshold, Question.hot_score <= -threshold))
+        .values(hot_score=Question.hot_score * factor),
+        execution_options={"synchronize_session": False},
+    )
+    session.commit()
+    return zeroed.rowcount + decayed.rowcount
+
+
+def rebuild_hot_scores(session: Session, half_life_hours: float, now: Optional[datetime] = None) -> None:
+    """
+    Recompute every hot score from the stored counters (commits).
+
+    Used to backfill databases created before hot_score existed. Engagement
+    timestamps are not stored, so each question's engagement is decayed as if
+    it all happened when the question was created.
+    """
+    now = now or datetime.utcnow()
+    table = Question.__table__
+    rows = session.exec(
+        select(Question.id, Question.created_at, Question.upvote_count, Question.downvote_count,
+               Question.answer_count, Question.view_count)
+    ).all()
+    scores = []
+    for question_id, created_at, upvotes, downvotes, answers, views in rows:
+        engagement = (HOT_NEW_QUESTION + HOT_VOTE * (upvotes - downvotes)
+                      + HOT_ANSWER * answers + HOT_VIEW * views)
+        age_hours = max((now - created_at).total_seconds(), 0) / 3600
+        score = engagement * 0.5 ** (age_hours / half_life_hours)
+        scores.append({"question_id": question_id, "score": score if abs(score) >= HOT_FLOOR else 0.0})
+    if scores:
+        session.exec(
+            update(table).where(table.c.id == bindparam("question_id")).values(hot_score=bindparam("score")),
+            params=scores,
+            execution_options={"synchronize_session": False},
+        )
+    session.commit()
+
+
+def accept_answer(session: Session, question_id: int, answer_id: int) -> None:
+    """
+    Make `answer_id` the only accepted answer of a question and mark it resolved.
+
+    Runs three bulk UPDATEs in the caller's transaction (not committed here).
+    The question row is written first so concurrent accepts on the same
+    question serialize on its row lock; the partial unique index on accepted
+    answers rejects anything that still slips through.
+
+    Args:
+        session: Database session
+        question_id: ID of the question
+        answer_id: ID of the answer to accept (must belong to the question)
+    """
+    session.exec(update(Question).where(Question.id == question_id).values(is_resolved=True))
+    # Clear before setting: the unique index is checked row by row, so a single
+    # UPDATE toggling both rows could transiently hold two accepted answers
+    session.exec(
+        update(Answer)
+        .where(Answer.question_id == question_id, Answer.id != answer_id, Answer.is_accepted)
+        .values(is_accepted=False)
+    )
+    session.exec(update(Answer).where(Answer.id == answer_id).values(is_accepted=True))
+
+
+def _tally(vote_model, target_column, target_id_column, upvote: bool):
+    return (
+        select(func.count(vote_model.id))
+        .where(target_column == target_id_column, vote_model.is_upvote == upvote)
+        .scalar_subquery()
+    )
+
+
+def reconcile_counters(session: Session) -> None:
+    """
+    Recompute every denormalized forum counter from the vote and answer tables.
+
+    Runs one bulk UPDATE per table and commits.
+    """
+    session.exec(
+        update(Question).values(
+            upvote_count=_tally(QuestionVote, QuestionVote.question_id, Question.id, True),
+            downvote_count=_tally(QuestionVote, QuestionVote.question_id, Question.id, False),
+            answer_count=(
+                select(func.count(Answer.id)).where(Answer.question_id == Question.id).scalar_subquery()
+            ),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    session.exec(
+        update(Answer).values(
+            upvote_count=_tally(AnswerVote, AnswerVote.answer_id, Answer.id, True),
+            downvote_count=_tally(AnswerVote, AnswerVote.answer_id, Answer.id, False),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    session.commit()
@@ -0,0 +1,242 @@
+"""
+Full-text search over forum questions and answers.
+
+Posts are mirrored into a ``forum_search`` table that carries the database's
+native full-text index:
+
+- SQLite: an FTS5 virtual table, ranked with weighted bm25() and highlighted
+  with snippet()
+- PostgreSQL: a stored tsvector column with a GIN index, ranked with
+  ts_rank_cd() and highlighted with ts_headline()
+
+Rows are written in the same transaction as the question/answer they mirror.
+"""
+from typing import List, Optional, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+
+from app.models.forum import Question, Answer, QuestionCategory
+
+SEARCH_TABLE = "forum_search"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# Title matches weigh more than body matches
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+# SQLite only ranks the newest matches of a query, which bounds the cost of
+# terms that appear in a large share of all posts
+RANK_CANDIDATES = 5000
+
+_SQLITE_DDL = f"""
+CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+    kind UNINDEXED,
+    target_id UNINDEXED,
+    question_id UNINDEXED,
+    category,
+    title,
+    content,
+    tokenize = 'porter unicode61'
+)
+"""
+
+_POSTGRES_DDL = [
+    f"""
+    CREATE TABLE {SEARCH_TABLE} (
+        kind VARCHAR(10) NOT NULL,
+        target_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        category VARCHAR(20) NOT NULL,
+        title TEXT NOT NULL DEFAULT '',
+        content TEXT NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A') ||
+            setweight(to_tsvector('english', content), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, target_id)
+    )
+    """,
+    f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX ix_{SEARCH_TABLE}_category ON {SEARCH_TABLE} (category)",
+]
+
+_BACKFILL = f"""
+INSERT INTO {SEARCH_TABLE} (kind, target_id, question_id, category, title, content)
+SELECT 'question', q.id, q.id, CAST(q.category AS VARCHAR), q.title, q.content FROM question q
+UNION ALL
+SELECT 'answer', a.id, a.question_id, CAST(q.category AS VARCHAR), '', a.content
+FROM answer a JOIN question q ON q.id = a.question_id
+"""
+
+
+def ensure_search_index(bind: Union[Engine, Connection]) -> None:
+    """
+    Create the search table for the database's dialect if it does not exist yet.
+
+    A newly created index is backfilled from the existing questions and answers.
+    Dialects without a supported full-text index are left untouched. Given a
+    Connection, the work joins its transaction.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            ensure_search_index(conn)
+        return
+
+    dialect = bind.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+    if inspect(bind).has_table(SEARCH_TABLE):
+        return
+
+    if dialect == "sqlite":
+        bind.execute(text(_SQLITE_DDL))
+    else:
+        for statement in _POSTGRES_DDL:
+            bind.execute(text(statement))
+    bind.execute(text(_BACKFILL))
+
+
+def _category_key(category) -> str:
+    """Category as stored in the question table (the enum member name)."""
+    return QuestionCategory(category).name
+
+
+def index_question(session: Session, question: Question) -> None:
+    """Add a newly created question to the search index (not committed)."""
+    session.exec(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (kind, target_id, question_id, category, title, content) "
+            "VALUES ('question', :id, :id, :category, :title, :content)"
+        ),
+        params={
+            "id": question.id,
+            "category": _category_key(question.category),
+            "title": question.title,
+            "content": question.content,
+        },
+    )
+
+
+def index_answer(session: Session, answer: Answer, question: Question) -> None:
+    """Add a newly created answer to the search index (not committed)."""
+    session.exec(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (kind, target_id, question_id, category, title, content) "
+            "VALUES ('answer', :id, :question_id, :category, '', :content)"
+        ),
+        params={
+            "id": answer.id,
+            "question_id": question.id,
+            "category": _category_key(question.category),
+            "content": answer.content,
+        },
+    )
+
+
+def _fts5_query(terms: str, category: Optional[QuestionCategory]) -> str:
+    """
+    Build an FTS5 query from user input.
+
+    Each term is quoted so it is matched literally rather than parsed as FTS5
+    syntax, terms are restricted to the title/content columns and the category
+    filter is applied through the indexed category column.
+    """
+    quoted = " ".join('"' + term.replace('"', '""') + '"' for term in terms.split())
+    query = f"{{title content}} : ({quoted})"
+    if category:
+        query += f' AND category : "{_category_key(category)}"'
+    return query
+
+
+def _search_sql(dialect: str, with_category: bool) -> str:
+    if dialect == "sqlite":
+        # Rank and page on rowids first so snippet() and the question join only
+        # run for the returned page (CROSS JOIN keeps SQLite from driving the
+        # outer query from the full match set). FTS5 auxiliary functions need
+        # the table name, not an alias.
+        return f"""
+            WITH page AS (
+                SELECT rowid, bm25({SEARCH_TABLE}, 0, 0, 0, 0, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS score
+                FROM {SEARCH_TABLE}
+                WHERE {SEARCH_TABLE} MATCH :query
+                  AND rowid >= coalesce((
+                      SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query
+                      ORDER BY rowid DESC LIMIT 1 OFFSET {RANK_CANDIDATES - 1}
+                  ), 0)
+                ORDER BY score
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT {SEARCH_TABLE}.kind, {SEARCH_TABLE}.target_id, {SEARCH_TABLE}.question_id,
+                   {SEARCH_TABLE}.category, q.title AS question_title,
+                   snippet({SEARCH_TABLE}, 4, :hl_start, :hl_end, '…', 16) AS title_snippet,
+                   snippet({SEARCH_TABLE}, 5, :hl_start, :hl_end, '…', 32) AS content_snippet,
+                   page.score AS score
+            FROM page
+            CROSS JOIN {SEARCH_TABLE} ON {SEARCH_TABLE}.rowid = page.rowid
+            JOIN question q ON q.id = {SEARCH_TABLE}.question_id
+            WHERE {SEARCH_TABLE} MATCH :query
+            ORDER BY page.score
+        """
+    category_filter = "AND s.category = :category" if with_category else ""
+    return f"""
+        SELECT s.kind, s.target_id, s.question_id, s.category, q.title AS question_title,
+               ts_headline('english', s.title, query, options) AS title_snippet,
+               ts_headline('english', s.content, query, options) AS content_snippet,
+               -ts_rank_cd(s.document, query) AS score
+        FROM {SEARCH_TABLE} s
+        JOIN question q ON q.id = s.question_id,
+             websearch_to_tsquery('english', :query) AS query,
+             CAST('StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxWords=35, MinWords=15' AS TEXT) AS options
+        WHERE s.document @@ query {category_filter}
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """
+
+
+def search_posts(
+    session: Session,
+    query: str,
+    category: Optional[QuestionCategory] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[dict]:
+    """
+    Search questions and answers, best matches first.
+
+    Args:
+        session: Database session
+        query: Free-text search terms
+        category: Optional category filter (answers inherit their question's category)
+        limit: Page size
+        offset: Number of results to skip
+
+    Returns:
+        List[dict]: Matches with highlighted title/content snippets and a relevance
+        score (higher is better)
+    """
+    dialect = session.get_bind().dialect.name
+    params = {
+        "query": _fts5_query(query, category) if dialect == "sqlite" else query,
+        "hl_start": HIGHLIGHT_START,
+        "hl_end": HIGHLIGHT_END,
+        "limit": limit,
+        "offset": offset,
+    }
+    if category and dialect != "sqlite":
+        params["category"] = _category_key(category)
+
+    rows = session.exec(text(_search_sql(dialect, category is not None)), params=params).all()
+    return [
+        {
+            "type": row.kind,
+            "id": int(row.target_id),
+            "question_id": int(row.question_id),
+            "category": QuestionCategory[row.category].value,
+            "question_title": row.question_title,
+            "title_snippet": row.title_snippet or None,
+            "snippet": row.content_snippet,
+            "score": -float(row.score),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,56 @@
+"""
+CRUD operations for JobRun model.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+
+from app.models.job_run import JobRun
+
+
+def claim_job_run(
+    session: Session,
+    name: str,
+    min_interval_seconds: float,
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """
+    Claim the next run of a periodic job for this worker (not committed).
+
+    The claim is a compare-and-set on the stored last_run_at, so when several
+    workers try at once exactly one succeeds; commit the claim together with
+    the job's writes so a failed run is not recorded. A job's first claim
+    only starts its clock.
+
+    Args:
+        session: Database session
+        name: Job name
+        min_interval_seconds: Skip the run if the job ran more recently than this
+        now: Time of this run (defaults to the current UTC time)
+
+    Returns:
+        Optional[float]: Seconds since the previous run, or None if this
+        worker should not run the job now
+    """
+    now = now or datetime.utcnow()
+    last_run_at = session.exec(select(JobRun.last_run_at).where(JobRun.name == name)).first()
+    if last_run_at is None:
+        try:
+            with session.begin_nested():
+                session.exec(JobRun.__table__.insert().values(name=name, last_run_at=now))
+        except IntegrityError:
+            pass  # another worker started the clock first
+        return None
+
+    elapsed = (now - last_run_at).total_seconds()
+    if elapsed < min_interval_seconds:
+        return None
+    claimed = session.exec(
+        update(JobRun)
+        .where(JobRun.name == name, JobRun.last_run_at == last_run_at)
+        .values(last_run_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return elapsed if claimed.rowcount else None
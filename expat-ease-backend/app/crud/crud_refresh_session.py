@@ -0,0 +1,79 @@
+"""
+CRUD operations for RefreshSession model.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlmodel import Session, delete, update
+
+from app.core.config import settings
+from app.models.refresh_session import RefreshSession
+
+
+def create_refresh_session(session: Session, user_id: int) -> RefreshSession:
+    """
+    Start a refresh session for a user, dropping their expired ones.
+
+    Args:
+        session: Database session
+        user_id: ID of the user signing in
+
+    Returns:
+        RefreshSession: The new session, at counter 0
+    """
+    now = datetime.utcnow()
+    session.exec(
+        delete(RefreshSession)
+        .where(RefreshSession.user_id == user_id, RefreshSession.expires_at < now)
+        .execution_options(synchronize_session=False)
+    )
+    refresh_session = RefreshSession(
+        user_id=user_id,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    session.add(refresh_session)
+    session.commit()
+    session.refresh(refresh_session)
+    return refresh_session
+
+
+def get_refresh_session(session: Session, session_id: int) -> Optional[RefreshSession]:
+    return session.get(RefreshSession, session_id)
+
+
+def advance_refresh_session(session: Session, session_id: int, user_id: int, counter: int) -> bool:
+    """
+    Move a refresh session from `counter` to the next counter.
+
+    The update only applies while the session is unexpired and still at
+    `counter`, so of several requests presenting the same refresh token
+    exactly one succeeds. Exchanging a token also extends the session to a
+    full REFRESH_TOKEN_EXPIRE_DAYS.
+
+    Args:
+        session: Database session
+        session_id: ID of the refresh session
+        user_id: ID of the user the token was issued to
+        counter: Counter carried by the presented refresh token
+
+    Returns:
+        bool: True if the session advanced to counter + 1
+    """
+    now = datetime.utcnow()
+    result = session.exec(
+        update(RefreshSession)
+        .where(
+            RefreshSession.id == session_id,
+            RefreshSession.user_id == user_id,
+            RefreshSession.counter == counter,
+            RefreshSession.expires_at > now,
+        )
+        .values(
+            counter=counter + 1,
+            rotated_at=now,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount == 1
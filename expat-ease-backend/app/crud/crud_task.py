@@ -3,9 +3,71 @@ from sqlmodel import Session, select
 from app.models.task import Task, TaskCreate, TaskUpdate, TaskStatus
 from app.models.document import Document, DocumentCreate
 from app.core.storage import save_upload_file
+from app.db.bulk import insert_all
 from fastapi import UploadFile, HTTPException
 
 
+# Default tasks template - can be customized per country
+DEFAULT_TASKS = [
+    {
+        "title": "Obtain Visa/Permit",
+        "description": "Apply for and obtain the necessary visa or residence permit",
+        "priority": "high",
+        "order_index": 1,
+        "estimated_days": 30
+    },
+    {
+        "title": "Register with Local Authorities",
+        "description": "Register your address with local government offices",
+        "priority": "high", 
+        "order_index": 2,
+        "estimated_days": 7
+    },
+    {
+        "title": "Open Bank Account",
+        "description": "Open a local bank account for financial transactions",
+        "priority": "medium",
+        "order_index": 3,
+        "estimated_days": 14
+    },
+    {
+        "title": "Get Health Insurance",
+        "description": "Obtain health insurance coverage",
+        "priority": "high",
+        "order_index": 4,
+        "estimated_days": 7
+    },
+    {
+        "title": "Find Housing",
+        "description": "Secure permanent accommodation",
+        "priority": "high",
+        "order_index": 5,
+        "estimated_days": 30
+    },
+    {
+        "title": "Get Tax ID",
+        "description": "Obtain tax identification number",
+        "priority": "medium",
+        "order_index": 6,
+        "estimated_days": 14
+    },
+    {
+        "title": "Register for Utilities",
+        "description": "Set up electricity, water, internet services",
+        "priority": "medium",
+        "order_index": 7,
+        "estimated_days": 7
+    },
+    {
+        "title": "Learn Local Language",
+        "description": "Enroll in language classes or self-study",
+        "priority": "low",
+        "order_index": 8,
+        "estimated_days": 90
+    }
+]
+
+
 def get_tasks_for_user(session: Session, user_id: int, country: Optional[str] = None) -> List[Task]:
     """Get all tasks for a user, optionally filtered by country."""
     query = select(Task).where(Task.user_id == user_id)
@@ -22,88 +84,21 @@ def get_tasks_for_user(session: Session, user_id: int, country: Optional[str] =
 
 def create_default_tasks_for_user(session: Session, user_id: int, country: str) -> List[Task]:
     """Create default tasks for a user based on their country."""
-    
-    # Default tasks template - can be customized per country
-    default_tasks = [
-        {
-            "title": "Obtain Visa/Permit",
-            "description": "Apply for and obtain the necessary visa or residence permit",
-            "priority": "high",
-            "order_index": 1,
-            "estimated_days": 30
-        },
-        {
-            "title": "Register with Local Authorities",
-            "description": "Register your address with local government offices",
-            "priority": "high", 
-            "order_index": 2,
-            "estimated_days": 7
-        },
-        {
-            "title": "Open Bank Account",
-            "description": "Open a local bank account for financial transactions",
-            "priority": "medium",
-            "order_index": 3,
-            "estimated_days": 14
-        },
+    # All default tasks go in one INSERT ... RETURNING, which also returns their IDs
+    created_tasks = insert_all(session, Task, [
         {
-            "title": "Get Health Insurance",
-            "description": "Obtain health insurance coverage",
-            "priority": "high",
-            "order_index": 4,
-            "estimated_days": 7
-        },
-        {
-            "title": "Find Housing",
-            "description": "Secure permanent accommodation",
-            "priority": "high",
-            "order_index": 5,
-            "estimated_days": 30
-        },
-        {
-            "title": "Get Tax ID",
-            "description": "Obtain tax identification number",
-            "priority": "medium",
-            "order_index": 6,
-            "estimated_days": 14
-        },
-        {
-            "title": "Register for Utilities",
-            "description": "Set up electricity, water, internet services",
-            "priority": "medium",
-            "order_index": 7,
-            "estimated_days": 7
-        },
-        {
-            "title": "Learn Local Language",
-            "description": "Enroll in language classes or self-study",
-            "priority": "low",
-            "order_index": 8,
-            "estimated_days": 90
+            "title": task_data["title"],
+            "description": task_data["description"],
+            "priority": task_data["priority"],
+            "country": country,
+            "user_id": user_id,
+            "order_index": task_data["order_index"],
+            "estimated_days": task_data["estimated_days"],
         }
-    ]
-    
-    created_tasks = []
-    
-    for task_data in default_tasks:
-        task = Task(
-            title=task_data["title"],
-            description=task_data["description"],
-            priority=task_data["priority"],
-            country=country,
-            user_id=user_id,
-            order_index=task_data["order_index"],
-            estimated_days=task_data["estimated_days"]
-        )
-        session.add(task)
-        created_tasks.append(task)
-    
+        for task_data in DEFAULT_TASKS
+    ])
     session.commit()
     
-    # Refresh to get IDs
-    for task in created_tasks:
-        session.refresh(task)
-    
     return created_tasks
 
 
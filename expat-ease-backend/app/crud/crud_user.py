@@ -1,10 +1,14 @@
 """
 CRUD operations for User model.
 """
+import json
 from typing import Optional
 
-from sqlmodel import Session, select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import Session, select, update
 
+from app.core.cache import user_cache
 from app.core.security import hash_password
 from app.models.user import User, UserCreate, UserUpdate
 
@@ -24,13 +28,15 @@ def get_user_by_email(session: Session, email: str) -> Optional[User]:
     return session.exec(statement).first()
 
 
-def create_user(session: Session, user_in: UserCreate) -> User:
+def create_user(session: Session, user_in: UserCreate, hashed_password: Optional[str] = None) -> User:
     """
     Create a new user.
     
     Args:
         session: Database session
         user_in: User creation data
+        hashed_password: Hash of user_in.password computed by the caller
+            (e.g. on the password hashing pool); hashed here if omitted
         
     Returns:
         User: The created user
@@ -44,7 +50,8 @@ def create_user(session: Session, user_in: UserCreate) -> User:
         raise ValueError("Email already registered")
     
     # Hash the password
-    hashed_password = hash_password(user_in.password)
+    if hashed_password is None:
+        hashed_password = hash_password(user_in.password)
     
     # Create user object
     user_data = user_in.model_dump(exclude={"password"})
@@ -76,7 +83,49 @@ def get_user(session: Session, user_id: int) -> Optional[User]:
     return session.exec(statement).first()
 
 
-def update_user(session: Session, user_id: int, user_in: UserUpdate) -> Optional[User]:
+def get_user_cached(session: Session, user_id: int) -> Optional[User]:
+    """
+    Get a user by ID, served from the user cache when possible.
+
+    A cached user is attached to `session` without a query, as if it had been
+    loaded there, so callers can modify and commit it like any other user.
+    Any code that changes a user must call invalidate_user() after committing.
+
+    Args:
+        session: Database session
+        user_id: User ID to search for
+
+    Returns:
+        Optional[User]: User if found, None otherwise
+    """
+    key = identity_key(User, user_id)
+    if key in session.identity_map:
+        return session.identity_map[key]
+
+    cached = user_cache.get(str(user_id))
+    if cached is not None:
+        user = User.model_validate(json.loads(cached))
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    user = get_user(session, user_id)
+    if user is not None:
+        user_cache.set(str(user_id), user.model_dump_json())
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user from the user cache; call after committing any change to the user."""
+    user_cache.delete(str(user_id))
+
+
+def update_user(
+    session: Session,
+    user_id: int,
+    user_in: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> Optional[User]:
     """
     Update a user.
     
@@ -84,6 +133,8 @@ def update_user(session: Session, user_id: int, user_in: UserUpdate) -> Optional
         session: Database session
         user_id: ID of user to update
         user_in: User update data (email cannot be updated)
+        hashed_password: Hash of user_in.password computed by the caller;
+            hashed here if omitted
         
     Returns:
         Optional[User]: Updated user if found, None otherwise
@@ -97,7 +148,10 @@ def update_user(session: Session, user_id: int, user_in: UserUpdate) -> Optional
     
     # Hash password if provided
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        password = update_data.pop("password")
+        update_data["hashed_password"] = hashed_password or hash_password(password)
+        # A new password revokes every token issued so far
+        update_data["token_version"] = User.token_version + 1
     
     # Update user fields (email is not included in UserUpdate schema)
     for field, value in update_data.items():
@@ -105,6 +159,67 @@ def update_user(session: Session, user_id: int, user_in: UserUpdate) -> Optional
     
     session.add(user)
     session.commit()
+    invalidate_user(user_id)
     session.refresh(user)
     
     return user
+
+
+def set_password(session: Session, user: User, hashed_password: str) -> None:
+    """
+    Store a user's new password hash and revoke all of their tokens.
+
+    Args:
+        session: Database session
+        user: User whose password changes
+        hashed_password: Hash of the new password
+    """
+    user_id = user.id
+    user.hashed_password = hashed_password
+    user.token_version = User.token_version + 1
+    session.add(user)
+    session.commit()
+    invalidate_user(user_id)
+
+
+def revoke_tokens(session: Session, user_id: int) -> None:
+    """
+    Revoke every access and refresh token issued to a user.
+
+    Tokens carry the user's token_version, so bumping it invalidates them all
+    without keeping a list of issued tokens.
+
+    Args:
+        session: Database session
+        user_id: ID of the user
+    """
+    session.exec(update(User).where(User.id == user_id).values(token_version=User.token_version + 1))
+    session.commit()
+    invalidate_user(user_id)
+
+
+def upgrade_password_hash(session: Session, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """
+    Replace a user's password hash with a rehash of the same password.
+
+    Used after a successful login when the stored hash no longer matches the
+    hashing policy. The update only applies while the stored hash is still
+    `old_hash`, so it never overwrites a password changed in the meantime.
+
+    Args:
+        session: Database session
+        user_id: ID of the user
+        old_hash: Hash the password was verified against
+        new_hash: Hash of the same password under the current policy
+
+    Returns:
+        bool: True if the hash was replaced
+    """
+    result = session.exec(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    session.commit()
+    invalidate_user(user_id)
+    return result.rowcount == 1
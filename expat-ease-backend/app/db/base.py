@@ -10,6 +10,9 @@ from app.models.task import Task  # noqa: F401
 from app.models.document import Document  # noqa: F401
 from app.models.settlement_step import SettlementStep  # noqa: F401
 from app.models.forum import Question, Answer, QuestionVote, AnswerVote  # noqa: F401
+from app.models.password_reset_token import PasswordResetToken  # noqa: F401
+from app.models.refresh_session import RefreshSession  # noqa: F401
+from app.models.job_run import JobRun  # noqa: F401
 
 # TODO: Import additional models here as you create them
 # from app.models.city import City  # noqa: F401
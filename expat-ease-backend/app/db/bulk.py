@@ -0,0 +1,49 @@
+"""
+Bulk INSERT helper.
+"""
+from typing import Any, Dict, List, Sequence, Type, TypeVar
+
+from sqlalchemy import insert, inspect
+from sqlmodel import Session, SQLModel
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def insert_all(session: Session, model: Type[ModelT], rows: Sequence[Dict[str, Any]]) -> List[ModelT]:
+    """
+    Insert `rows` into `model`'s table and return them as loaded instances.
+
+    Where the dialect supports it (PostgreSQL, SQLite 3.35+) all rows go in a
+    single INSERT ... RETURNING, so ids, column defaults and server-generated
+    values come back without SELECTing the rows again. Elsewhere (older
+    SQLite, MySQL) the instances are added and flushed, one INSERT per row.
+    The caller commits; with expire_on_commit=False the instances stay loaded.
+
+    Args:
+        session: Database session
+        model: Table model class
+        rows: Column values per row, without the primary key; every row must
+            have the same keys
+
+    Returns:
+        List[ModelT]: The inserted instances, in `rows` order
+    """
+    if not rows:
+        return []
+    dialect = session.get_bind(mapper=model).dialect
+    if not dialect.insert_executemany_returning:
+        instances = [model(**row) for row in rows]
+        session.add_all(instances)
+        session.flush()
+        return instances
+
+    if dialect.name == "sqlite":
+        # SQLAlchemy can only keep RETURNING in parameter order on SQLite by
+        # inserting one row per statement. SQLite assigns rowids in VALUES order
+        # though, so one unordered INSERT sorted by primary key gives the same order.
+        instances = session.scalars(insert(model).returning(model), list(rows)).all()
+        return sorted(instances, key=lambda instance: inspect(instance).identity)
+    return list(session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        list(rows),
+    ))
@@ -1,19 +1,41 @@
 """
 Database initialization utilities.
 """
-from sqlmodel import SQLModel
+import logging
 
+from app.core.config import settings
+from app.db.migrations import LATEST_VERSION, missing_indexes, pending_migrations, schema_version, upgrade
 from app.db.session import engine
 
+logger = logging.getLogger(__name__)
+
 
 def create_db_and_tables() -> None:
     """
-    Create database and all tables.
+    Bring the database schema up to date.
     This function should be called on application startup.
+
+    When the stored schema version is current this is a single query: tables
+    are not reflected and nothing is created. Otherwise pending migrations (see
+    app.db.migrations) are applied, which create the tables on a new database.
+    With DB_MIGRATE_ON_STARTUP off the schema is only checked, and pending
+    migrations or missing indexes are logged as warnings.
     """
-    # Import all models to register them with SQLModel
-    # This is important for SQLModel.metadata.create_all() to work
-    from app.db import base  # noqa: F401
-    
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
+    version = schema_version(engine)
+    if version is not None and version >= LATEST_VERSION:
+        return
+
+    if settings.DB_MIGRATE_ON_STARTUP:
+        applied = upgrade(engine)
+        if applied:
+            logger.info("Applied database migrations %s", applied)
+        return
+
+    pending = pending_migrations(engine)
+    if pending:
+        logger.warning(
+            "Database schema is behind: %d pending migration(s); run `python -m app.db.migrations upgrade`",
+            len(pending),
+        )
+    for index in missing_indexes(engine):
+        logger.warning("Missing database index %s", index)
@@ -0,0 +1,369 @@
+"""
+Versioned schema migrations.
+
+Each migration moves the database from one schema version to the next and is
+declared from the models: columns and indexes are looked up on the SQLModel
+tables, so their DDL is rendered for whichever dialect DATABASE_URL uses.
+Applied versions are recorded in the schema_migrations table.
+
+Databases created before that table existed already contain some of these
+changes, so every step checks the live schema before changing it and can be
+run again. SQLite commits DDL as it goes; a run interrupted there is finished
+by running it again.
+
+At startup create_db_and_tables() reads the stored version with one query and
+stops there when it is current; otherwise it applies pending migrations when
+DB_MIGRATE_ON_STARTUP is set. From the command line:
+
+    python -m app.db.migrations upgrade   # apply pending migrations
+    python -m app.db.migrations status    # list applied and pending versions
+    python -m app.db.migrations check     # report pending migrations and missing indexes
+
+Adding a column or index to a model needs a new migration at the end of
+MIGRATIONS; `check` reports indexes the models declare but the database lacks.
+"""
+import logging
+import sys
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, func, inspect, literal, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, SQLModel
+
+from app.crud.crud_forum import reconcile_counters
+from app.crud.crud_forum_search import ensure_search_index
+from app.models.document import Document
+from app.models.forum import Answer, AnswerVote, Question, QuestionVote
+from app.models.job_run import JobRun
+from app.models.password_reset_token import PasswordResetToken
+from app.models.refresh_session import RefreshSession
+from app.models.settlement_step import SettlementStep
+from app.models.task import Task
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Kept out of SQLModel.metadata so create_all() and the index check ignore it
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Serializes concurrent upgrades (e.g. several workers starting at once) on PostgreSQL
+_ADVISORY_LOCK_KEY = 4_202_201
+
+
+class Migration:
+    """One schema version: `upgrade(conn)` runs inside the upgrade's transaction."""
+
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None]):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+
+
+# Operations used by the migrations
+
+
+def add_columns(conn: Connection, model, *names: str) -> List[str]:
+    """
+    Add the model's columns `names` to its table where they are missing.
+
+    The column type is rendered for the connection's dialect; NOT NULL columns
+    get their model default as the DDL default so existing rows are filled.
+
+    Returns:
+        List[str]: Names of the columns added
+    """
+    table = model.__table__
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    added = []
+    for name in names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = f"{column.name} {column.type.compile(dialect=conn.dialect)}"
+        if column.default is not None and column.default.is_scalar:
+            value = literal(column.default.arg, column.type).compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            ddl += f" DEFAULT {value}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+        added.append(name)
+    return added
+
+
+def create_indexes(conn: Connection, model, *names: str) -> None:
+    """Create the model's indexes `names` (as declared on the model) where they do not exist."""
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def drop_indexes(conn: Connection, *names: str) -> None:
+    for name in names:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _has_index(conn: Connection, table: str, name: str) -> bool:
+    return name in {index["name"] for index in inspect(conn).get_indexes(table)}
+
+
+def _clear_duplicate_acceptances(conn: Connection) -> None:
+    """Keep only the newest accepted answer of each question."""
+    newer = aliased(Answer)
+    has_newer_accepted = (
+        select(func.count(newer.id))
+        .where(newer.question_id == Answer.question_id, newer.is_accepted, newer.id > Answer.id)
+        .scalar_subquery()
+    )
+    conn.execute(
+        update(Answer.__table__)
+        .where(Answer.__table__.c.is_accepted, has_newer_accepted > 0)
+        .values(is_accepted=False)
+    )
+
+
+def _delete_duplicate_votes(conn: Connection, vote_model, target_column: str) -> int:
+    """
+    Keep only the newest vote of each user on each question/answer.
+
+    Returns:
+        int: Number of votes deleted
+    """
+    table = vote_model.__table__
+    newer = table.alias("newer")
+    has_newer_vote = (
+        select(func.count())
+        .select_from(newer)
+        .where(
+            newer.c[target_column] == table.c[target_column],
+            newer.c.user_id == table.c.user_id,
+            newer.c.id > table.c.id,
+        )
+        .scalar_subquery()
+    )
+    return conn.execute(delete(table).where(has_newer_vote > 0)).rowcount
+
+
+def _reconcile(conn: Connection) -> None:
+    with Session(bind=conn) as session:
+        reconcile_counters(session)
+
+
+# Migrations
+
+
+def _create_tables(conn: Connection) -> None:
+    # Creates missing tables together with their declared indexes; existing tables are left alone
+    SQLModel.metadata.create_all(conn)
+
+
+def _forum_counters(conn: Connection) -> None:
+    added = add_columns(conn, Question, "upvote_count", "downvote_count", "answer_count", "hot_score")
+    added += add_columns(conn, Answer, "upvote_count", "downvote_count")
+    if added:
+        _reconcile(conn)
+
+
+def _user_token_version(conn: Connection) -> None:
+    add_columns(conn, User, "token_version")
+
+
+def _forum_unique_indexes(conn: Connection) -> None:
+    # Databases written before these indexes may hold rows that violate them
+    if not _has_index(conn, "answer", "uq_answer_question_id_accepted"):
+        _clear_duplicate_acceptances(conn)
+    deleted = 0
+    if not _has_index(conn, "questionvote", "uq_questionvote_question_id_user_id"):
+        deleted += _delete_duplicate_votes(conn, QuestionVote, "question_id")
+    if not _has_index(conn, "answervote", "uq_answervote_answer_id_user_id"):
+        deleted += _delete_duplicate_votes(conn, AnswerVote, "answer_id")
+    if deleted:
+        # The denormalized vote counters still include the removed duplicates
+        _reconcile(conn)
+    create_indexes(conn, Answer, "uq_answer_question_id_accepted")
+    create_indexes(conn, QuestionVote, "uq_questionvote_question_id_user_id")
+    create_indexes(conn, AnswerVote, "uq_answervote_answer_id_user_id")
+
+
+def _forum_query_indexes(conn: Connection) -> None:
+    create_indexes(
+        conn, Question,
+        "ix_question_created_at_id", "ix_question_category_created_at_id",
+        "ix_question_hot_score_id", "ix_question_category_hot_score_id",
+    )
+    create_indexes(conn, Answer, "ix_answer_question_id_created_at_id")
+    # Added by the old SQLite-only constraint script; the indexes above and the
+    # unique vote indexes of migration 4 cover them
+    drop_indexes(
+        conn,
+        "idx_question_votes_unique", "idx_answer_votes_unique", "idx_questions_category",
+        "idx_questions_created_at", "idx_answers_question_id",
+        "idx_question_votes_question_id", "idx_answer_votes_answer_id",
+    )
+
+
+def _lookup_indexes(conn: Connection) -> None:
+    create_indexes(conn, Document, "ix_document_user_id", "ix_document_settlement_step_id")
+    create_indexes(conn, Task, "ix_task_user_id")
+    create_indexes(conn, SettlementStep, "ix_settlementstep_user_id")
+    create_indexes(conn, PasswordResetToken, "ix_passwordresettoken_user_id", "ix_passwordresettoken_token")
+
+
+def _refresh_sessions(conn: Connection) -> None:
+    RefreshSession.__table__.create(conn, checkfirst=True)
+
+
+def _drop_redundant_forum_indexes(conn: Connection) -> None:
+    # Single-column indexes that ix_answer_question_id_created_at_id and the
+    # unique vote indexes already lead with
+    drop_indexes(conn, "ix_answer_question_id", "ix_questionvote_question_id", "ix_answervote_answer_id")
+
+
+def _job_runs(conn: Connection) -> None:
+    JobRun.__table__.create(conn, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", _create_tables),
+    Migration(2, "forum counter and hot score columns", _forum_counters),
+    Migration(3, "users.token_version", _user_token_version),
+    Migration(4, "one vote per user, one accepted answer", _forum_unique_indexes),
+    Migration(5, "forum query indexes", _forum_query_indexes),
+    Migration(6, "forum full-text search index", ensure_search_index),
+    Migration(7, "document, task, settlement step and reset token lookup indexes", _lookup_indexes),
+    Migration(8, "refresh sessions", _refresh_sessions),
+    Migration(9, "drop redundant forum foreign key indexes", _drop_redundant_forum_indexes),
+    Migration(10, "job runs", _job_runs),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def applied_versions(bind) -> List[int]:
+    """Versions recorded in schema_migrations (empty if the table does not exist)."""
+    if not inspect(bind).has_table(schema_migrations.name):
+        return []
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            return applied_versions(conn)
+    return sorted(bind.execute(select(schema_migrations.c.version)).scalars())
+
+
+def schema_version(engine: Engine) -> Optional[int]:
+    """
+    Highest applied version, read with a single query and no reflection.
+
+    Returns:
+        Optional[int]: The stored version, or None if the database has no
+        schema_migrations table (or cannot be queried)
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except DBAPIError:
+        return None
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    applied = set(applied_versions(engine))
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations in version order.
+
+    Args:
+        engine: Engine of the database to migrate
+
+    Returns:
+        List[int]: Versions applied by this call
+    """
+    # Register every model so create_all() sees all tables
+    from app.db import base  # noqa: F401
+
+    applied = []
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        schema_migrations.create(conn, checkfirst=True)
+        # Read under the lock: another process may have migrated meanwhile
+        done = set(applied_versions(conn))
+        for migration in MIGRATIONS:
+            if migration.version in done:
+                continue
+            logger.info("Applying migration %s: %s", migration.version, migration.name)
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+            ))
+            applied.append(migration.version)
+    return applied
+
+
+def missing_indexes(engine: Engine) -> List[str]:
+    """
+    Indexes declared on the models that the live database does not have.
+
+    Returns:
+        List[str]: "table.index (columns)" for every missing index
+    """
+    from app.db import base  # noqa: F401
+
+    inspector = inspect(engine)
+    missing = []
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            missing.extend(
+                f"{table.name}.{index.name} (table missing)" for index in table.indexes
+            )
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                columns = ", ".join(column.name for column in index.columns)
+                missing.append(f"{table.name}.{index.name} ({columns})")
+    return missing
+
+
+def main(argv: List[str]) -> int:
+    from app.db.session import engine
+
+    command = argv[0] if argv else "upgrade"
+    if command == "upgrade":
+        applied = upgrade(engine)
+        print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+        return 0
+    if command == "status":
+        applied = set(applied_versions(engine))
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:>4}  {state:<8} {migration.name}")
+        return 0
+    if command == "check":
+        pending = pending_migrations(engine)
+        missing = missing_indexes(engine)
+        for migration in pending:
+            print(f"pending migration {migration.version}: {migration.name}")
+        for index in missing:
+            print(f"missing index {index}")
+        if not pending and not missing:
+            print("OK: schema is up to date and every declared index exists")
+        return 1 if pending or missing else 0
+    print(f"Unknown command {command!r}; use upgrade, status or check")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
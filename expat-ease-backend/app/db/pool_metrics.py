@@ -0,0 +1,135 @@
+"""
+Connection pool metrics.
+
+The engines in app.db.session use the metered pool classes below, which time
+every connection checkout (including opening a new connection when the pool
+grows). Long or frequent waits mean requests are queueing for a connection:
+raise DB_POOL_SIZE / DB_MAX_OVERFLOW, or shorten the work done while a
+session is open. Timeouts are checkouts that gave up after
+DB_POOL_TIMEOUT_SECONDS.
+"""
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import exc, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# A checkout slower than this counts as a wait (for a free or a newly opened connection)
+WAIT_THRESHOLD_MS = 1.0
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            if wait_ms >= WAIT_THRESHOLD_MS:
+                self.waits += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+class _MeteredPoolMixin:
+    """Times QueuePool checkouts into its `metrics` (attached by track_engine())."""
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        # dispose() rebuilds the pool through recreate(); keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics per engine name, exported by pool_stats()
+_registry: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+
+def metrics_for(name: str) -> PoolMetrics:
+    """Return the PoolMetrics registered under `name`, creating it on first use."""
+    return _registry.setdefault(name, PoolMetrics())
+
+
+def track_engine(name: str, engine: Engine) -> None:
+    """Count new and invalidated connections of `engine` and include its pool in pool_stats()."""
+    metrics = metrics_for(name)
+    _engines[name] = engine
+    if isinstance(engine.pool, _MeteredPoolMixin):
+        engine.pool.metrics = metrics
+    event.listen(engine, "connect", lambda *args: metrics.record_connect())
+    event.listen(engine, "invalidate", lambda *args: metrics.record_invalidation())
+
+
+def pool_stats() -> Dict[str, dict]:
+    """Current pool occupancy and checkout counters per engine."""
+    stats = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        occupancy = {}
+        if isinstance(pool, QueuePool):
+            occupancy = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "idle": pool.checkedin(),
+            }
+        stats[name] = {"pool": type(pool).__name__, **occupancy, **metrics_for(name).stats()}
+    return stats
@@ -0,0 +1,270 @@
+"""
+Read-replica routing.
+
+When DATABASE_READ_URLS lists replicas, read-only endpoints take their session
+from get_read_session() / get_async_read_session() instead of the primary's
+dependencies. Each request goes to the next healthy replica in round-robin
+order. The session checks out (and pre-pings) its connection before the
+endpoint runs, so a replica that cannot be reached is ejected for
+DATABASE_READ_EJECT_SECONDS and the request moves on to the next one, or to
+the primary once none are left.
+
+Writes, auth lookups and every endpoint not switched to the read dependencies
+stay on the primary. Replicas lag behind it, so a client that has just sent a
+write (any non-GET request, keyed by its Authorization header or address)
+reads from the primary for DATABASE_READ_STICKY_SECONDS and sees its own
+changes. That window is kept in process, per worker.
+
+Caches in front of routed reads must not be filled from a replica session
+(is_replica_session()): a lagging replica would store a stale payload under
+the current cache generation. Sticky clients (is_sticky_request()) skip such
+caches as well.
+"""
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Generator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.db.pool_metrics import track_engine
+from app.db.session import (
+    apply_sqlite_pragmas,
+    async_database_url,
+    engine,
+    engine_options,
+    get_async_session,
+    get_session,
+)
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Session.info key holding the Replica a read session is on
+REPLICA_INFO_KEY = "read_replica"
+# Clients remembered as recent writers; the oldest are forgotten first
+STICKY_MAX_KEYS = 10000
+
+
+class Replica:
+    """A read replica's sync and async engines and its health."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.engine = create_engine(url, **engine_options(url))
+        self.async_engine = create_async_engine(async_database_url(url), **engine_options(url, is_async=True))
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", apply_sqlite_pragmas)
+            event.listen(self.async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        track_engine(name, self.engine)
+        track_engine(f"{name}-async", self.async_engine.sync_engine)
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.served = 0
+
+
+class ReadRouter:
+    """Round-robin over healthy replicas, with ejection and read-your-writes stickiness."""
+
+    def __init__(self, urls: List[str], eject_seconds: float, sticky_seconds: float):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self.eject_seconds = eject_seconds
+        self.sticky_seconds = sticky_seconds
+        self.primary_reads = 0
+        self._next = itertools.count()
+        self._recent_writers: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            # A connection lost mid-request ejects the replica for the following requests
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+            event.listen(replica.async_engine.sync_engine, "handle_error", self._on_error(replica))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def _on_error(self, replica: Replica):
+        def handle_error(context) -> None:
+            if context.is_disconnect:
+                self.eject(replica, context.original_exception)
+        return handle_error
+
+    @staticmethod
+    def client_key(headers: Headers, client_host: Optional[str]) -> str:
+        """Identify the caller by its bearer token (digested) or, if anonymous, its address."""
+        authorization = headers.get("authorization")
+        if authorization:
+            return hashlib.sha256(authorization.encode()).hexdigest()
+        return f"ip:{client_host}"
+
+    def note_write(self, key: str) -> None:
+        """Route `key`'s reads to the primary for the next sticky_seconds."""
+        with self._lock:
+            self._recent_writers[key] = time.monotonic() + self.sticky_seconds
+            self._recent_writers.move_to_end(key)
+            while len(self._recent_writers) > STICKY_MAX_KEYS:
+                self._recent_writers.popitem(last=False)
+
+    def is_sticky(self, key: str) -> bool:
+        """Whether `key` wrote recently and must read from the primary."""
+        with self._lock:
+            until = self._recent_writers.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._recent_writers[key]
+                return False
+            return True
+
+    def candidates(self, key: str) -> List[Replica]:
+        """Healthy replicas to try for `key`'s read, in round-robin order (empty means primary)."""
+        if not self.replicas or self.is_sticky(key):
+            return []
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.ejected_until <= now]
+        if not healthy:
+            return []
+        start = next(self._next) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def eject(self, replica: Replica, error: BaseException) -> None:
+        now = time.monotonic()
+        if replica.ejected_until <= now:
+            # One failure can surface twice (handle_error and the checkout); count it once
+            replica.ejections += 1
+            logger.warning("Read replica %s ejected for %ss: %s", replica.name, self.eject_seconds, error)
+        replica.ejected_until = now + self.eject_seconds
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "primary_reads": self.primary_reads,
+            "replicas": {
+                replica.name: {
+                    "healthy": replica.ejected_until <= now,
+                    "served": replica.served,
+                    "ejections": replica.ejections,
+                }
+                for replica in self.replicas
+            },
+        }
+
+
+def _read_urls() -> List[str]:
+    return [url.strip() for url in (settings.DATABASE_READ_URLS or "").split(",") if url.strip()]
+
+
+# Global router used by the read session dependencies
+read_router = ReadRouter(
+    _read_urls(),
+    eject_seconds=settings.DATABASE_READ_EJECT_SECONDS,
+    sticky_seconds=settings.DATABASE_READ_STICKY_SECONDS,
+)
+
+
+def _request_key(request: Request) -> str:
+    return read_router.client_key(request.headers, request.client.host if request.client else None)
+
+
+def is_sticky_request(request: Request) -> bool:
+    """Whether the client sent a write within the sticky window (its reads go to the primary)."""
+    return read_router.enabled and read_router.is_sticky(_request_key(request))
+
+
+def is_replica_session(session) -> bool:
+    """Whether a session from the read dependencies is on a replica rather than the primary."""
+    return session.info.get(REPLICA_INFO_KEY) is not None
+
+
+def read_engine(session) -> Engine:
+    """Sync engine of the database a read session is on, for work that outlives the session."""
+    replica = session.info.get(REPLICA_INFO_KEY)
+    return replica.engine if replica is not None else engine
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency that provides a session on a read replica, or on the primary.
+
+    Only for endpoints that do not write and can tolerate replica lag.
+    """
+    for replica in read_router.candidates(_request_key(request)):
+        session = Session(replica.engine, info={REPLICA_INFO_KEY: replica})
+        try:
+            session.connection()
+        except DBAPIError as exc:
+            session.close()
+            read_router.eject(replica, exc)
+            continue
+        replica.served += 1
+        try:
+            yield session
+        finally:
+            session.close()
+        return
+    read_router.primary_reads += 1
+    yield from get_session()
+
+
+async def get_async_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Asyncio variant of get_read_session().
+
+    Only for endpoints that do not write and can tolerate replica lag.
+    """
+    for replica in read_router.candidates(_request_key(request)):
+        session = AsyncSession(replica.async_engine, expire_on_commit=False, info={REPLICA_INFO_KEY: replica})
+        try:
+            await session.connection()
+        except DBAPIError as exc:
+            await session.close()
+            read_router.eject(replica, exc)
+            continue
+        replica.served += 1
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
+    read_router.primary_reads += 1
+    async for session in get_async_session():
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that marks clients sending writes so their next reads use the primary."""
+
+    def __init__(self, app, router: ReadRouter = read_router):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        key = self.router.client_key(Headers(scope=scope), client[0] if client else None)
+        # Marked before and after: the window has to cover replica lag after the commit
+        self.router.note_write(key)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.router.note_write(key)
+
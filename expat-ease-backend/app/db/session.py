@@ -1,20 +1,118 @@
 """
 Database session management.
+
+Two engines share DATABASE_URL: the synchronous one behind get_session() and
+an asyncio one (aiosqlite / asyncpg) behind get_async_session(). Routers
+ported to ``async def`` use the async session, so a request waiting on the
+database does not hold one of the server's worker threads.
+
+Both engines take their pool sizing, pre-ping and recycling from the DB_POOL_*
+settings and report checkout waits through app.db.pool_metrics. SQLite
+connections get the SQLITE_* pragma profile (WAL, synchronous, busy_timeout).
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.db.pool_metrics import MeteredAsyncQueuePool, MeteredQueuePool, track_engine
+
+# Async drivers for the sync URL schemes DATABASE_URL may use
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Return `url` with its driver swapped for the matching asyncio driver."""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Keyword arguments for creating an engine on `url` from the pool settings.
+
+    Args:
+        url: Database URL (sync form)
+        is_async: Whether the options are for the asyncio engine
+
+    Returns:
+        dict: Options for create_engine() / create_async_engine()
+    """
+    options = {
+        "echo": False,  # Set to True for SQL query logging during development
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args = {}
+    if url.startswith("sqlite"):
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        if _is_sqlite_memory(url):
+            # In-memory databases live in a single shared connection, not a sized pool
+            options["connect_args"] = connect_args
+            return options
+    elif url.startswith("postgres") and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    options.update(
+        connect_args=connect_args,
+        poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect event: apply the SQLITE_* journal, sync and busy-timeout profile."""
+    synchronous = settings.SQLITE_SYNCHRONOUS.upper()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unknown SQLITE_SYNCHRONOUS mode: {settings.SQLITE_SYNCHRONOUS}")
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    if settings.SQLITE_WAL_ENABLED:
+        cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute(f"PRAGMA synchronous = {synchronous}")
+    cursor.close()
+
 
 # Create database engine
 # Support both SQLite (default) and PostgreSQL via DATABASE_URL
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=False,  # Set to True for SQL query logging during development
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(settings.DATABASE_URL, is_async=True),
 )
 
+if settings.DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+track_engine("sync", engine)
+track_engine("async", async_engine.sync_engine)
+
 
 def get_session() -> Generator[Session, None, None]:
     """
@@ -23,3 +121,17 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides an asyncio database session.
+
+    The crud modules are synchronous; call them through
+    ``await session.run_sync(fn, ...)``, which hands `fn` a regular Session
+    whose queries are awaited on the async driver.
+    Objects are not expired on commit so they can be read after it without
+    another (awaited) load.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
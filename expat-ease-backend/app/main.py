@@ -1,6 +1,7 @@
 """
 Main FastAPI application.
 """
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -22,11 +23,30 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     Handles startup and shutdown events.
     """
+    # Imported here rather than at module level so importing the app stays cheap
+    from app.core.hashing_pool import password_pool
+    from app.core.hot_decay import run_periodic_decay
+    from app.core.view_counter import view_counts
+    from app.db.replicas import read_router
+    from app.db.session import async_engine
+
     # Startup
     create_db_and_tables()
+    view_count_flusher = asyncio.create_task(
+        view_counts.run_periodic_flush(settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS)
+    )
+    hot_score_decayer = None
+    if settings.FORUM_HOT_DECAY_ENABLED:
+        hot_score_decayer = asyncio.create_task(run_periodic_decay(settings.FORUM_HOT_DECAY_INTERVAL_SECONDS))
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown: stop the periodic jobs and write any buffered view counts
+    if hot_score_decayer is not None:
+        hot_score_decayer.cancel()
+    view_count_flusher.cancel()
+    view_counts.flush()
+    password_pool.shutdown()
+    await async_engine.dispose()
+    await read_router.dispose()
 
 
 # Create FastAPI application instance
@@ -123,6 +143,12 @@ if "http://localhost:5173" not in allowed_origins:
 # Add request logging middleware first so we capture preflight requests in logs
 app.add_middleware(RequestLoggingMiddleware)
 
+# Clients that just wrote read from the primary, not a lagging replica
+if any(url.strip() for url in (settings.DATABASE_READ_URLS or "").split(",")):
+    from app.db.replicas import ReadYourWritesMiddleware
+
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # Then add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -144,6 +170,12 @@ logger.info(f"CORS allowed_origins: {allowed_origins}")
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
+# Load and topology stats are only exposed where explicitly enabled
+if settings.INTERNAL_STATS_ENABLED:
+    from app.api.internal import router as internal_router
+
+    app.include_router(internal_router, prefix="/internal", tags=["internal"])
+
 # Static files are now served from Cloudinary - no local mounting needed
 
 
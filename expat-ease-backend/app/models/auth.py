@@ -21,10 +21,19 @@ class Token(BaseModel):
     """
     Schema for JWT token response.
     
-    Returned after successful login.
+    Returned after successful login or refresh.
     """
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+
+
+class RefreshRequest(BaseModel):
+    """
+    Schema for exchanging a refresh token for a new token pair.
+    """
+    refresh_token: str
 
 
 class TokenData(BaseModel):
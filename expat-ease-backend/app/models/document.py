@@ -13,8 +13,9 @@ class Document(SQLModel, table=True):
     file_path: str = Field(max_length=500)
     file_size: int
     content_type: str = Field(max_length=100)
-    settlement_step_id: Optional[int] = Field(default=None, foreign_key="settlementstep.id")
-    user_id: int = Field(foreign_key="users.id")
+    # Indexed: documents are listed per user and looked up per settlement step
+    settlement_step_id: Optional[int] = Field(default=None, foreign_key="settlementstep.id", index=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Relationships
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
@@ -17,6 +18,15 @@ class QuestionCategory(str, Enum):
 
 
 class Question(SQLModel, table=True):
+    # Keyset pagination walks (created_at, id) newest first, optionally within a category;
+    # the "hot" listing walks (hot_score, id) the same way
+    __table_args__ = (
+        Index("ix_question_created_at_id", "created_at", "id"),
+        Index("ix_question_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_question_hot_score_id", "hot_score", "id"),
+        Index("ix_question_category_hot_score_id", "category", "hot_score", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200)
     content: str = Field(max_length=2000)
@@ -26,6 +36,12 @@ class Question(SQLModel, table=True):
     updated_at: Optional[datetime] = Field(default=None)
     is_resolved: bool = Field(default=False)
     view_count: int = Field(default=0)
+    # Denormalized counters, kept in step with the vote/answer tables by the forum endpoints
+    upvote_count: int = Field(default=0)
+    downvote_count: int = Field(default=0)
+    answer_count: int = Field(default=0)
+    # Time-decayed engagement score, raised on votes/answers/views and decayed periodically
+    hot_score: float = Field(default=0.0)
     
     # Relationships
     user: Optional["User"] = Relationship(back_populates="questions")
@@ -34,6 +50,19 @@ class Question(SQLModel, table=True):
 
 
 class Answer(SQLModel, table=True):
+    # Answers of a question are paged oldest first on (created_at, id), which
+    # also serves lookups by question_id; at most one accepted answer per question
+    __table_args__ = (
+        Index("ix_answer_question_id_created_at_id", "question_id", "created_at", "id"),
+        Index(
+            "uq_answer_question_id_accepted",
+            "question_id",
+            unique=True,
+            sqlite_where=text("is_accepted"),
+            postgresql_where=text("is_accepted"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     content: str = Field(max_length=2000)
     question_id: int = Field(foreign_key="question.id")
@@ -41,6 +70,9 @@ class Answer(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default=None)
     is_accepted: bool = Field(default=False)
+    # Denormalized counters, kept in step with the vote table by the forum endpoints
+    upvote_count: int = Field(default=0)
+    downvote_count: int = Field(default=0)
     
     # Relationships
     question: Optional["Question"] = Relationship(back_populates="answers")
@@ -49,6 +81,13 @@ class Answer(SQLModel, table=True):
 
 
 class QuestionVote(SQLModel, table=True):
+    # One vote per user and question; also the conflict target of the vote upsert
+    # and the index for a question's votes.
+    # A unique index rather than a constraint so it can be added to existing tables.
+    __table_args__ = (
+        Index("uq_questionvote_question_id_user_id", "question_id", "user_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     question_id: int = Field(foreign_key="question.id")
     user_id: int = Field(foreign_key="users.id")
@@ -61,6 +100,12 @@ class QuestionVote(SQLModel, table=True):
 
 
 class AnswerVote(SQLModel, table=True):
+    # One vote per user and answer; also the conflict target of the vote upsert
+    # and the index for an answer's votes
+    __table_args__ = (
+        Index("uq_answervote_answer_id_user_id", "answer_id", "user_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     answer_id: int = Field(foreign_key="answer.id")
     user_id: int = Field(foreign_key="users.id")
@@ -0,0 +1,18 @@
+"""
+Job run model: when a periodic job shared by every worker last ran.
+"""
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class JobRun(SQLModel, table=True):
+    """
+    The last run of a periodic background job, by job name.
+
+    Every worker schedules the job, but a run is claimed by moving
+    last_run_at with a conditional UPDATE, so only one worker performs each
+    run and the time since the previous run survives restarts.
+    """
+    name: str = Field(primary_key=True, max_length=100)
+    last_run_at: datetime
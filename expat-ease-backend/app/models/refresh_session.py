@@ -0,0 +1,24 @@
+"""
+Refresh session model: the server-side state of one chain of refresh tokens.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class RefreshSession(SQLModel, table=True):
+    """
+    One sign-in (a login or password change) and the refresh tokens rotated from it.
+
+    Every refresh token carries its session id and the counter it was issued
+    at; a refresh only succeeds while that counter is the session's current
+    one and then advances it, so each refresh token can be exchanged once.
+    Keeping this in the database makes it hold across restarts and workers.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+    counter: int = Field(default=0)
+    rotated_at: Optional[datetime] = Field(default=None)
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
 
 class SettlementStep(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id")
+    user_id: int = Field(foreign_key="users.id", index=True)
     step_number: int
     title: str = Field(max_length=255)
     description: str
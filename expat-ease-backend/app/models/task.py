@@ -24,7 +24,7 @@ class Task(SQLModel, table=True):
     status: TaskStatus = Field(default=TaskStatus.PENDING)
     priority: TaskPriority = Field(default=TaskPriority.MEDIUM)
     country: str = Field(max_length=100)
-    user_id: int = Field(foreign_key="users.id")
+    user_id: int = Field(foreign_key="users.id", index=True)
     order_index: int = Field(default=0)
     is_required: bool = Field(default=True)
     estimated_days: Optional[int] = Field(default=None)
@@ -24,6 +24,8 @@ class User(SQLModel, table=True):
     full_name: Optional[str] = Field(default=None, max_length=255)
     hashed_password: str = Field(max_length=255)
     is_active: bool = Field(default=True)
+    # Carried by every issued token; bumping it revokes all of the user's tokens
+    token_version: int = Field(default=0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     country: Optional[str] = Field(default=None, max_length=100)  # Country of Origin (from registration)
     settlement_country: Optional[str] = Field(default=None, max_length=100)  # Settlement Country (France/Germany)
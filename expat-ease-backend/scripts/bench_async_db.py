@@ -0,0 +1,201 @@
+"""
+Load-test the sync and async database session dependencies.
+
+Serves the same forum page query from a uvicorn subprocess in two ways:
+a ``def`` route on get_session() (run on the server's threadpool) and an
+``async def`` route on get_async_session() (awaited on the event loop).
+Each request also waits on a simulated database round trip, a SQLite
+function that sleeps inside the driver, so the test shows how each mode
+behaves while requests are parked on I/O.
+
+For each mode the offered rate is stepped up (open loop) until p95
+latency exceeds the target or requests fail, and the highest rate that
+held is reported as the max sustained RPS. The load generator shares the
+machine with the server, so absolute numbers are conservative.
+
+Usage: python scripts/bench_async_db.py [p95_target_ms] [db_latency_ms] [step_seconds]
+"""
+from pathlib import Path
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine;
+# the server subprocess inherits the parent's DATABASE_URL
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench_async.db'}")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, insert, text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud import crud_forum
+from app.db import base  # noqa: F401  (registers every model with the mappers)
+from app.db.init_db import create_db_and_tables
+from app.db.session import async_engine, engine, get_async_session, get_session
+from app.models.forum import Question
+from app.models.user import User
+
+ARGS = [arg for arg in sys.argv[1:] if arg != "--serve"]
+P95_TARGET_MS = float(ARGS[0]) if len(ARGS) > 0 else 100.0
+DB_LATENCY_MS = float(ARGS[1]) if len(ARGS) > 1 else 10.0
+STEP_SECONDS = float(ARGS[2]) if len(ARGS) > 2 else 3.0
+RATES = (25, 50, 75, 100, 125, 150, 200, 250, 300, 400, 500, 650, 800, 1000)
+PORT = 8765
+NUM_USERS = 200
+NUM_QUESTIONS = 2_000
+
+
+def _register_round_trip(dbapi_connection, connection_record):
+    """Give every connection a bench_sleep(ms) SQL function that blocks inside the driver."""
+    dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+def load_page(session: Session) -> list:
+    session.exec(text("SELECT bench_sleep(:ms)").bindparams(ms=DB_LATENCY_MS))
+    return crud_forum.get_question_page(session, limit=20)
+
+
+def build_app() -> FastAPI:
+    event.listen(engine, "connect", _register_round_trip)
+    event.listen(async_engine.sync_engine, "connect", _register_round_trip)
+    bench_app = FastAPI()
+
+    @bench_app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @bench_app.get("/sync/questions")
+    def sync_questions(session: Session = Depends(get_session)):
+        return load_page(session)
+
+    @bench_app.get("/async/questions")
+    async def async_questions(session: AsyncSession = Depends(get_async_session)):
+        return await session.run_sync(load_page)
+
+    return bench_app
+
+
+def serve():
+    import uvicorn
+
+    uvicorn.run(build_app(), host="127.0.0.1", port=PORT, log_level="warning")
+
+
+def seed():
+    create_db_and_tables()
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"email": f"bench{i}@example.com", "full_name": f"Bench {i}", "hashed_password": "x",
+             "is_active": True, "created_at": now, "country_selected": False}
+            for i in range(1, NUM_USERS + 1)
+        ])
+        session.execute(insert(Question), [
+            {"title": f"Question {i}", "content": "Benchmark content", "category": "general",
+             "user_id": i % NUM_USERS + 1, "created_at": now - timedelta(seconds=i),
+             "is_resolved": False, "view_count": 0}
+            for i in range(1, NUM_QUESTIONS + 1)
+        ])
+        session.commit()
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def step(client: httpx.AsyncClient, path: str, rate: int) -> dict:
+    """Offer `rate` requests/sec for STEP_SECONDS and return latency and error stats."""
+    latencies, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors += 1
+                return
+        except httpx.HTTPError:
+            errors += 1
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    total = int(rate * STEP_SECONDS)
+    tasks = []
+    started = time.perf_counter()
+    for i in range(total):
+        # Open loop: requests go out on schedule whether or not earlier ones finished
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one()))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    return {
+        "p50": percentile(latencies, 0.50) if latencies else float("inf"),
+        "p95": percentile(latencies, 0.95) if latencies else float("inf"),
+        "errors": errors,
+        "achieved": len(latencies) / elapsed,
+    }
+
+
+async def max_sustained(client: httpx.AsyncClient, mode: str) -> int:
+    path = f"/{mode}/questions"
+    for _ in range(20):
+        await client.get(path)  # warm up connections and caches
+    best = 0
+    for rate in RATES:
+        stats = await step(client, path, rate)
+        held = stats["errors"] == 0 and stats["p95"] <= P95_TARGET_MS
+        print(f"{mode:<6}{rate:>7}/s  achieved {stats['achieved']:7.1f}/s  p50 {stats['p50']:7.1f} ms  "
+              f"p95 {stats['p95']:7.1f} ms  errors {stats['errors']:<5}{'ok' if held else 'over target'}")
+        if not held:
+            break
+        best = rate
+        await asyncio.sleep(0.5)  # let the server drain between steps
+    return best
+
+
+async def main() -> dict:
+    limits = httpx.Limits(max_connections=2000, max_keepalive_connections=2000)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=10) as client:
+        for _ in range(100):
+            try:
+                await client.get("/health")
+                break
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+        return {mode: await max_sustained(client, mode) for mode in ("sync", "async")}
+
+
+def run():
+    seed()
+    server = subprocess.Popen([sys.executable, __file__, "--serve", *ARGS], env=os.environ.copy())
+    try:
+        results = asyncio.run(main())
+    finally:
+        server.terminate()
+        server.wait()
+    print(f"max sustained RPS at p95 <= {P95_TARGET_MS:.0f} ms "
+          f"(simulated DB round trip {DB_LATENCY_MS:.0f} ms, {os.cpu_count()} core(s)):")
+    for mode, rate in results.items():
+        print(f"  {mode:<6}{rate:>6}/s")
+
+
+if __name__ == '__main__':
+    if "--serve" in sys.argv:
+        serve()
+    else:
+        run()
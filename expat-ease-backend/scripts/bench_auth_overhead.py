@@ -0,0 +1,101 @@
+"""
+Benchmark the per-request cost of authentication.
+
+Times verify_token() and the whole get_current_user() dependency with the
+token/user caches disabled and enabled, then checks that cached tokens are
+still rejected after they expire and after the signing secret is rotated.
+
+Usage: python scripts/bench_auth_overhead.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_auth.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import Session
+
+from app.core.cache import token_cache, user_cache
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.security import create_access_token, verify_token
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.models.user import User
+
+ITERATIONS = 20_000
+
+
+def per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    fn()  # warm up (fills the caches when they are enabled)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def set_caches(enabled: bool) -> None:
+    token_cache.enabled = enabled
+    user_cache.enabled = enabled
+
+
+def run():
+    create_db_and_tables()
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x", full_name="Bench")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+
+    token = create_access_token({"sub": str(user_id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def authenticate():
+        # One request: a fresh session, as get_session would provide
+        with Session(engine) as session:
+            assert get_current_user(credentials=credentials, session=session).id == user_id
+
+    results = {}
+    for enabled in (False, True):
+        set_caches(enabled)
+        results[enabled] = (per_call_us(lambda: verify_token(token)), per_call_us(authenticate, ITERATIONS // 4))
+
+    print(f"{'':<22}{'verify_token':>14}{'get_current_user':>18}")
+    for enabled, label in ((False, "uncached"), (True, "cached")):
+        verify_us, auth_us = results[enabled]
+        print(f"{label:<22}{verify_us:>11.1f} us{auth_us:>15.1f} us")
+
+    # Expired tokens are rejected even though their payload was cached
+    set_caches(True)
+    short_lived = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(seconds=2))
+    assert verify_token(short_lived) is not None
+    assert verify_token(short_lived) is not None
+    time.sleep(3)
+    assert verify_token(short_lived) is None, "expired token accepted from the cache"
+
+    # Rotating the secret invalidates tokens signed with the old one
+    assert verify_token(token) is not None
+    original_secret = settings.SECRET_KEY
+    settings.SECRET_KEY = original_secret + "-rotated"
+    try:
+        assert verify_token(token) is None, "token signed with the old secret accepted after rotation"
+        assert verify_token(create_access_token({"sub": str(user_id)})) is not None
+    finally:
+        settings.SECRET_KEY = original_secret
+    print("OK: expired and rotated-secret tokens are rejected")
+
+
+if __name__ == '__main__':
+    run()
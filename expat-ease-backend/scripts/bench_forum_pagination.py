@@ -0,0 +1,99 @@
+"""
+Benchmark offset vs cursor pagination of the forum question list.
+
+Seeds a throwaway SQLite database with enough questions for 5000 pages of 20,
+then times page 1 and page 5000 in both modes and checks that both modes
+return the same rows.
+
+Usage: python scripts/bench_forum_pagination.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_pagination.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from app.crud import crud_forum
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.models.forum import Question
+from app.models.user import User
+
+PAGE_SIZE = 20
+DEEP_PAGE = 5000
+NUM_QUESTIONS = PAGE_SIZE * DEEP_PAGE + PAGE_SIZE
+REPEATS = 20
+
+
+def seed():
+    create_db_and_tables()
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x", "is_active": True,
+                                        "created_at": now, "country_selected": False}])
+        session.execute(insert(Question), [
+            {"title": f"Question {i}", "content": "Benchmark content", "category": "general", "user_id": 1,
+             # every 10 questions share a timestamp so the id tie-breaker is exercised
+             "created_at": now - timedelta(seconds=i // 10), "is_resolved": False, "view_count": 0}
+            for i in range(NUM_QUESTIONS)
+        ])
+        session.commit()
+
+
+def timed(fn):
+    """Return (result, best-of-REPEATS latency in ms)."""
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run():
+    print(f"Seeding {NUM_QUESTIONS} questions into {DB_PATH} ...")
+    seed()
+
+    with Session(engine) as session:
+        deep_offset = (DEEP_PAGE - 1) * PAGE_SIZE
+        # Cursor of the last row on page DEEP_PAGE - 1, as a client walking the pages would hold
+        boundary = session.exec(
+            select(Question)
+            .order_by(Question.created_at.desc(), Question.id.desc())
+            .offset(deep_offset - 1)
+            .limit(1)
+        ).one()
+        deep_cursor = crud_forum.encode_cursor(boundary.created_at, boundary.id)
+
+        offset_first, offset_first_ms = timed(lambda: crud_forum.get_question_page(session, limit=PAGE_SIZE, offset=0))
+        offset_deep, offset_deep_ms = timed(
+            lambda: crud_forum.get_question_page(session, limit=PAGE_SIZE, offset=deep_offset))
+        (cursor_first, _), cursor_first_ms = timed(
+            lambda: crud_forum.get_question_page_after(session, limit=PAGE_SIZE, after=None))
+        (cursor_deep, _), cursor_deep_ms = timed(
+            lambda: crud_forum.get_question_page_after(session, limit=PAGE_SIZE, after=deep_cursor))
+
+    assert [q["id"] for q in offset_first] == [q["id"] for q in cursor_first]
+    assert [q["id"] for q in offset_deep] == [q["id"] for q in cursor_deep]
+
+    print(f"{'mode':<8}{'page 1':>12}{f'page {DEEP_PAGE}':>14}")
+    print(f"{'offset':<8}{offset_first_ms:>9.2f} ms{offset_deep_ms:>11.2f} ms")
+    print(f"{'cursor':<8}{cursor_first_ms:>9.2f} ms{cursor_deep_ms:>11.2f} ms")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,140 @@
+"""
+Benchmark the forum listing/detail read path.
+
+Seeds a throwaway SQLite database with 10k questions and 200k votes, then
+checks that the number of SQL statements per page does not depend on the
+page size and reports the latency of each page.
+
+Usage: python scripts/bench_forum_queries.py
+"""
+from pathlib import Path
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_forum.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+# Measure the database path, not the response cache
+os.environ["FORUM_CACHE_ENABLED"] = "false"
+
+from sqlalchemy import event, insert
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from app.api.api_v1.endpoints import forum
+from app.crud.crud_forum import UserSummaryLoader, reconcile_counters
+from app.db.init_db import create_db_and_tables
+from app.db.session import async_engine, engine
+from app.models.forum import Question, Answer, QuestionVote
+from app.models.user import User
+
+NUM_USERS = 200
+NUM_QUESTIONS = 10_000
+VOTES_PER_QUESTION = 20  # 200k votes in total
+ANSWERS_PER_QUESTION = 3
+
+
+def bench_request() -> Request:
+    """A bare GET request for calling the endpoints directly (not sticky to the primary)."""
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+class QueryCounter:
+    """Counts statements sent to the engine while active."""
+
+    def __init__(self):
+        self.count = 0
+        # The forum endpoints run on the async engine
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def seed():
+    create_db_and_tables()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"email": f"bench{i}@example.com", "full_name": f"Bench {i}", "hashed_password": "x",
+             "is_active": True, "created_at": now, "country_selected": False}
+            for i in range(1, NUM_USERS + 1)
+        ])
+        session.execute(insert(Question), [
+            {"title": f"Question {i}", "content": "Benchmark content", "category": "general",
+             "user_id": rng.randint(1, NUM_USERS), "created_at": now - timedelta(seconds=i),
+             "is_resolved": False, "view_count": 0}
+            for i in range(1, NUM_QUESTIONS + 1)
+        ])
+        session.execute(insert(Answer), [
+            {"content": "Benchmark answer", "question_id": q, "user_id": rng.randint(1, NUM_USERS),
+             "created_at": now, "is_accepted": False}
+            for q in range(1, NUM_QUESTIONS + 1) for _ in range(ANSWERS_PER_QUESTION)
+        ])
+        votes = []
+        for q in range(1, NUM_QUESTIONS + 1):
+            for user_id in rng.sample(range(1, NUM_USERS + 1), VOTES_PER_QUESTION):
+                votes.append({"question_id": q, "user_id": user_id,
+                              "is_upvote": rng.random() < 0.8, "created_at": now})
+        session.execute(insert(QuestionVote), votes)
+        session.commit()
+        # Bulk inserts bypass the endpoints, so derive the counters from the seeded rows
+        reconcile_counters(session)
+
+
+async def measure():
+    counter = QueryCounter()
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        user = await session.get(User, 1)
+
+        query_counts = set()
+        for limit in (1, 20, 50, 100):
+            counter.reset()
+            started = time.perf_counter()
+            response = await forum.get_questions(bench_request(), category=None, limit=limit, offset=0, after=None, sort="new",
+                                                 session=session, users=UserSummaryLoader(session.sync_session),
+                                                 current_user=user)
+            page = json.loads(response.body)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            assert len(page) == limit
+            print(f"list limit={limit:<4} queries={counter.count:<3} {elapsed_ms:8.2f} ms")
+            query_counts.add(counter.count)
+        assert len(query_counts) == 1, f"query count varies with page size: {sorted(query_counts)}"
+
+        counter.reset()
+        started = time.perf_counter()
+        detail = await forum.get_question(question_id=1, request=bench_request(), include_answers=True, session=session,
+                                          users=UserSummaryLoader(session.sync_session), current_user=user)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        assert detail["answer_count"] == ANSWERS_PER_QUESTION
+        assert detail["upvotes"] + detail["downvotes"] == VOTES_PER_QUESTION
+        print(f"detail              queries={counter.count:<3} {elapsed_ms:8.2f} ms")
+
+    print("OK: query count per page is constant")
+
+
+def run():
+    print(f"Seeding {NUM_QUESTIONS} questions / {NUM_QUESTIONS * VOTES_PER_QUESTION} votes into {DB_PATH} ...")
+    seed()
+    asyncio.run(measure())
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,132 @@
+"""
+Benchmark batch vote ingestion against the single-vote endpoints.
+
+Seeds a throwaway SQLite database with questions and answers, then replays
+the same queue of votes (as an offline mobile client would) once through
+/questions/{id}/vote + /answers/{id}/vote and once through /votes:batch,
+authenticating with a real bearer token, and checks both leave the same tallies.
+
+Usage: python scripts/bench_forum_votes.py [num_votes]
+"""
+from pathlib import Path
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_votes.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import engine
+from app.main import app
+from app.models.forum import Question, Answer
+from app.models.user import User
+
+NUM_VOTES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+NUM_QUESTIONS = 500
+ANSWERS_PER_QUESTION = 3
+API = "/api/v1/forum"
+
+
+def seed():
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"email": f"voter{i}@example.com", "hashed_password": "x", "is_active": True,
+             "created_at": now, "country_selected": False}
+            for i in range(2)
+        ])
+        session.execute(insert(Question), [
+            {"title": f"Question {i}", "content": "Benchmark content", "category": "GENERAL", "user_id": 1,
+             "created_at": now, "is_resolved": False, "view_count": 0}
+            for i in range(NUM_QUESTIONS)
+        ])
+        session.execute(insert(Answer), [
+            {"content": "Benchmark answer", "question_id": q, "user_id": 1, "created_at": now, "is_accepted": False}
+            for q in range(1, NUM_QUESTIONS + 1) for _ in range(ANSWERS_PER_QUESTION)
+        ])
+        session.commit()
+
+
+def vote_queue(rng: random.Random) -> list:
+    num_answers = NUM_QUESTIONS * ANSWERS_PER_QUESTION
+    return [
+        {"target": "question", "id": rng.randint(1, NUM_QUESTIONS), "is_upvote": rng.random() < 0.7}
+        if rng.random() < 0.5 else
+        {"target": "answer", "id": rng.randint(1, num_answers), "is_upvote": rng.random() < 0.7}
+        for _ in range(NUM_VOTES)
+    ]
+
+
+def tallies() -> tuple:
+    with Session(engine) as session:
+        return (
+            session.exec(select(Question.id, Question.upvote_count, Question.downvote_count)
+                         .order_by(Question.id)).all(),
+            session.exec(select(Answer.id, Answer.upvote_count, Answer.downvote_count)
+                         .order_by(Answer.id)).all(),
+        )
+
+
+def replay_single(client: TestClient, headers: dict, votes: list) -> None:
+    for vote in votes:
+        path = f"{API}/{vote['target']}s/{vote['id']}/vote"
+        response = client.post(path, params={"is_upvote": vote["is_upvote"]}, headers=headers)
+        assert response.status_code == 200, response.text
+
+
+def replay_batched(client: TestClient, headers: dict, votes: list) -> None:
+    size = settings.FORUM_VOTE_BATCH_MAX_ITEMS
+    for start in range(0, len(votes), size):
+        response = client.post(f"{API}/votes:batch", json={"votes": votes[start:start + size]}, headers=headers)
+        assert response.status_code == 200, response.text
+        assert all(item["status"] == "ok" for item in response.json()["results"])
+
+
+def run():
+    with TestClient(app) as client:
+        seed()
+        votes = vote_queue(random.Random(42))
+        # Each mode votes as its own user so both start from an empty vote table for that user
+        single_headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+        batch_headers = {"Authorization": f"Bearer {create_access_token({'sub': '2'})}"}
+
+        before = tallies()
+        started = time.perf_counter()
+        replay_single(client, single_headers, votes)
+        single_s = time.perf_counter() - started
+        after_single = tallies()
+
+        started = time.perf_counter()
+        replay_batched(client, batch_headers, votes)
+        batch_s = time.perf_counter() - started
+        after_batch = tallies()
+
+    # The second user's votes must move every counter by exactly what the first user's did
+    for table_before, table_single, table_batch in zip(before, after_single, after_batch):
+        for (_, up0, down0), (_, up1, down1), (_, up2, down2) in zip(table_before, table_single, table_batch):
+            assert (up2 - up1, down2 - down1) == (up1 - up0, down1 - down0)
+
+    print(f"{NUM_VOTES} votes")
+    print(f"single-vote endpoints {single_s:7.2f} s  {NUM_VOTES / single_s:8.0f} votes/s")
+    print(f"batch endpoint        {batch_s:7.2f} s  {NUM_VOTES / batch_s:8.0f} votes/s")
+    print(f"speedup               {single_s / batch_s:7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,161 @@
+"""
+Benchmark failed-login throttling under credential-stuffing load.
+
+Sends failed logins from one client IP, half against a real account with
+wrong passwords and half against unknown emails, until the IP is over its
+limit, then replays more at a fixed offered rate (1000/s by default) and
+reports the process CPU time per rejected (429) request and how many of
+them reached bcrypt. For comparison it also measures the CPU of
+a failed login that is verified, and checks that unknown emails and wrong
+passwords take about as long as each other.
+
+Usage: python scripts/bench_login_throttle.py [attempts] [rate_per_sec]
+"""
+from pathlib import Path
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_throttle.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+# A lower per-IP limit keeps the bcrypt-bound part of the run short
+os.environ.setdefault("LOGIN_THROTTLE_MAX_FAILURES_PER_IP", "20")
+
+import httpx
+from sqlmodel import Session
+
+from app.core.hashing_pool import password_pool
+from app.core.login_throttle import InMemoryThrottleBackend, login_throttle
+from app.core.security import hash_password
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.main import app
+from app.models.user import User
+
+ATTEMPTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+RATE = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+TIMING_SAMPLES = 5
+EMAIL = "victim@example.com"
+LOGIN = "/api/v1/auth/login"
+
+
+def client_for(ip: str) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+def reset_throttle() -> None:
+    login_throttle.backend = InMemoryThrottleBackend(max_keys=login_throttle.backend.max_keys)
+    login_throttle.rejected = 0
+
+
+async def timed_login(client: httpx.AsyncClient, email: str) -> tuple:
+    """Return (status, wall ms, process CPU ms) of one login with a wrong password."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    response = await client.post(LOGIN, json={"email": email, "password": "wrong-password"})
+    return response.status_code, (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000
+
+
+async def uniform_timing() -> tuple:
+    """Median wall ms of failed logins for an existing vs. an unknown email."""
+    async with client_for("10.0.0.1") as client:
+        await timed_login(client, "warmup@example.com")  # builds the dummy hash once
+        known, unknown = [], []
+        for i in range(TIMING_SAMPLES):
+            reset_throttle()
+            known.append((await timed_login(client, EMAIL))[1])
+            unknown.append((await timed_login(client, f"nobody{i}@example.com"))[1])
+    return statistics.median(known), statistics.median(unknown)
+
+
+async def verified_failure_cpu() -> float:
+    """Median process CPU ms of a failed login that reaches bcrypt."""
+    async with client_for("10.0.0.2") as client:
+        samples = []
+        for _ in range(TIMING_SAMPLES):
+            reset_throttle()
+            status, _, cpu = await timed_login(client, EMAIL)
+            assert status == 401
+            samples.append(cpu)
+    return statistics.median(samples)
+
+
+async def stuffing() -> dict:
+    reset_throttle()
+    hashed_before = password_pool.stats()["completed"]
+    statuses = []
+
+    async with client_for("203.0.113.7") as client:
+        async def attempt(i: int):
+            email = EMAIL if i % 2 == 0 else f"guess{i}@example.com"
+            response = await client.post(LOGIN, json={"email": email, "password": f"guess-{i}"})
+            statuses.append(response.status_code)
+
+        # The attacker's first failures are verified (bcrypt) until the IP hits its limit
+        for i in range(login_throttle.max_per_ip):
+            await attempt(i)
+        tripped = len(statuses)
+        hashed_to_trip = password_pool.stats()["completed"] - hashed_before
+
+        tasks = []
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for i in range(ATTEMPTS):
+            # Pace the offered load at RATE attempts per second
+            delay = wall_started + i / RATE - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(attempt(tripped + i)))
+        await asyncio.gather(*tasks)
+        cpu_s, wall_s = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+    assert statuses[:tripped].count(401) == tripped
+    flood = statuses[tripped:]
+    return {
+        "tripped": tripped,
+        "hashed_to_trip": hashed_to_trip,
+        "wall_s": wall_s,
+        "cpu_s": cpu_s,
+        "rejected": flood.count(429),
+        "hashed": password_pool.stats()["completed"] - hashed_before - hashed_to_trip,
+    }
+
+
+async def main():
+    known_ms, unknown_ms = await uniform_timing()
+    verified_cpu_ms = await verified_failure_cpu()
+    result = await stuffing()
+
+    print(f"failed login timing (p50): existing email {known_ms:.0f} ms, unknown email {unknown_ms:.0f} ms")
+    print(f"CPU per verified failure  {verified_cpu_ms:8.2f} ms")
+    print(f"limit tripped after {result['tripped']} verified failures ({result['hashed_to_trip']} hashes)")
+    print(f"then {ATTEMPTS} attempts offered at {RATE}/s, served in {result['wall_s']:.2f} s "
+          f"({ATTEMPTS / result['wall_s']:.0f}/s): {result['rejected']} rejected with 429, "
+          f"{result['hashed']} hashes")
+    print(f"CPU per rejected request  {result['cpu_s'] * 1000 / ATTEMPTS:8.3f} ms (including the in-process client)")
+
+    assert result["rejected"] == ATTEMPTS, "attempts over the limit were not rejected"
+    assert result["hashed"] == 0, "throttled attempts reached bcrypt"
+    assert abs(known_ms - unknown_ms) < 0.5 * max(known_ms, unknown_ms), "unknown emails answer at a different speed"
+    password_pool.shutdown()
+
+
+def run():
+    create_db_and_tables()
+    with Session(engine) as session:
+        session.add(User(email=EMAIL, hashed_password=hash_password("correct-password"), full_name="Victim"))
+        session.commit()
+    asyncio.run(main())
+
+
+if __name__ == '__main__':
+    run()
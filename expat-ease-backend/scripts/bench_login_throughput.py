@@ -0,0 +1,129 @@
+"""
+Benchmark login throughput with password verification on the hashing pool.
+
+Fires concurrent logins at the app in-process and reports logins/sec (and
+per CPU core) plus the latency of /health while the logins are running.
+"Before" verifies bcrypt on the shared request threadpool, as the sync login
+endpoint used to; "after" awaits the bounded password hashing pool. Finally
+it overloads a tiny pool and checks the excess logins get 503 + Retry-After.
+
+Usage: python scripts/bench_login_throughput.py [num_logins] [concurrency]
+"""
+from pathlib import Path
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_login.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import anyio
+import httpx
+from sqlmodel import Session
+
+from app.api.api_v1.endpoints import auth
+from app.core.hashing_pool import PasswordHashingPool, password_pool
+from app.core.security import hash_password
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.main import app
+from app.models.user import User
+
+NUM_LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+CORES = os.cpu_count() or 1
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+class RequestThreadpool:
+    """The old behaviour: bcrypt runs on the request threadpool, unbounded."""
+
+    async def run(self, fn, *args):
+        return await anyio.to_thread.run_sync(fn, *args)
+
+
+async def measure(client: httpx.AsyncClient) -> tuple:
+    """Return (logins/sec, median /health latency in ms) for NUM_LOGINS concurrent logins."""
+    queue = asyncio.Queue()
+    for _ in range(NUM_LOGINS):
+        queue.put_nowait(None)
+    health_ms = []
+    done = asyncio.Event()
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            assert response.status_code == 200, response.text
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            assert (await client.get("/health")).status_code == 200
+            health_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.05)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return NUM_LOGINS / elapsed, statistics.median(health_ms)
+
+
+async def overload(client: httpx.AsyncClient) -> dict:
+    auth.password_pool = PasswordHashingPool(kind="thread", workers=1, max_queue=2)
+    try:
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            for _ in range(20)
+        ))
+    finally:
+        auth.password_pool.shutdown()
+    rejected = [r for r in responses if r.status_code == 503]
+    assert rejected and all(r.headers.get("retry-after") == "1" for r in rejected)
+    assert all(r.status_code in (200, 503) for r in responses)
+    return {"ok": len(responses) - len(rejected), "rejected": len(rejected)}
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for label, pool in (("before (request threads)", RequestThreadpool()), ("after (hashing pool)", password_pool)):
+            auth.password_pool = pool
+            results[label] = await measure(client)
+        overloaded = await overload(client)
+        auth.password_pool = password_pool
+
+    print(f"{NUM_LOGINS} logins, concurrency {CONCURRENCY}, {CORES} core(s), "
+          f"pool={password_pool.kind} x{password_pool.workers} queue={password_pool.max_queue}")
+    print(f"{'':<26}{'logins/s':>10}{'per core':>10}{'/health p50':>14}")
+    for label, (rate, health) in results.items():
+        print(f"{label:<26}{rate:>10.1f}{rate / CORES:>10.1f}{health:>11.1f} ms")
+    print(f"overload (1 worker, queue 2, 20 logins): {overloaded['ok']} ok, {overloaded['rejected']} rejected with 503")
+    password_pool.shutdown()
+
+
+def run():
+    create_db_and_tables()
+    with Session(engine) as session:
+        session.add(User(email=EMAIL, hashed_password=hash_password(PASSWORD), full_name="Bench"))
+        session.commit()
+    asyncio.run(main())
+
+
+if __name__ == '__main__':
+    run()
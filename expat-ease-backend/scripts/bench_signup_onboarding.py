@@ -0,0 +1,141 @@
+"""
+Benchmark onboarding a burst of new users: default settlement steps and tasks.
+
+Each simulated signup inserts a user, then initializes their settlement steps
+and their default tasks the way the /settlement-steps/initialize and
+/tasks/initialize endpoints do (AsyncSession + run_sync on the async engine).
+The burst is launched at once with a bounded number in flight, twice, on
+separate scratch SQLite databases:
+
+- legacy: each default row added on its own, then refreshed after the commit
+  (the code before the bulk insert helper);
+- bulk: the current code, one INSERT ... RETURNING per set of default rows.
+
+Reports statements per signup, throughput and latency percentiles, and checks
+that the bulk path runs a constant number of statements per signup.
+Password hashing is left out (the users get a fixed hash) since it dominates
+real signups and is not affected.
+
+Usage: python scripts/bench_signup_onboarding.py [signups] [concurrency]
+"""
+from pathlib import Path
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+SCRATCH = Path(tempfile.mkdtemp())
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH / 'app.db'}"
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.api_v1.endpoints.settlement_steps import DEFAULT_STEPS, _get_steps_with_documents, _initialize_steps
+from app.crud import crud_task
+from app.db.migrations import upgrade
+from app.db.session import apply_sqlite_pragmas, async_database_url, engine_options
+from app.models.settlement_step import SettlementStep
+from app.models.task import Task
+from app.models.user import User
+
+SIGNUPS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+MAX_BULK_STATEMENTS = 6
+
+
+def legacy_initialize_steps(session: Session, user_id: int):
+    steps = []
+    for step_data in DEFAULT_STEPS:
+        step = SettlementStep(user_id=user_id, is_completed=False, **step_data)
+        session.add(step)
+        steps.append(step)
+    session.commit()
+    for step in steps:
+        session.refresh(step)
+    return _get_steps_with_documents(steps, session)
+
+
+def legacy_create_default_tasks(session: Session, user_id: int, country: str):
+    tasks = []
+    for task_data in crud_task.DEFAULT_TASKS:
+        task = Task(country=country, user_id=user_id, **task_data)
+        session.add(task)
+        tasks.append(task)
+    session.commit()
+    for task in tasks:
+        session.refresh(task)
+    return tasks
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000 if ordered else 0.0
+
+
+async def measure(profile: str) -> dict:
+    url = f"sqlite:///{SCRATCH / profile}.db"
+    upgrade(create_engine(url))
+    async_engine = create_async_engine(async_database_url(url), **engine_options(url, is_async=True))
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    initialize_steps = legacy_initialize_steps if profile == "legacy" else _initialize_steps
+    create_tasks = legacy_create_default_tasks if profile == "legacy" else crud_task.create_default_tasks_for_user
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def signup(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                user = User(email=f"{profile}{i}@example.com", hashed_password="x", full_name=f"User {i}")
+                session.add(user)
+                await session.commit()
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                steps = await session.run_sync(initialize_steps, user.id)
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                tasks = await session.run_sync(create_tasks, user.id, "germany")
+            # Returned complete and in template order
+            assert [step.step_number for step in steps] == [step["step_number"] for step in DEFAULT_STEPS]
+            assert all(step.id for step in steps)
+            assert [task.order_index for task in tasks] == [task["order_index"] for task in crud_task.DEFAULT_TASKS]
+            assert all(task.id and task.created_at for task in tasks)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(signup(i) for i in range(SIGNUPS)))
+    elapsed = time.perf_counter() - started
+    await async_engine.dispose()
+    return {
+        "statements": len(statements) / SIGNUPS,
+        "rate": SIGNUPS / elapsed,
+        "elapsed": elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+def run():
+    print(f"{SIGNUPS} signups, {CONCURRENCY} in flight")
+    print(f"{'profile':<10}{'stmts/signup':>14}{'signups/s':>11}{'total':>10}{'p50':>11}{'p99':>11}")
+    results = {}
+    for profile in ("legacy", "bulk"):
+        stats = results[profile] = asyncio.run(measure(profile))
+        print(f"{profile:<10}{stats['statements']:>14.1f}{stats['rate']:>11.0f}{stats['elapsed']:>8.1f} s"
+              f"{stats['p50']:>8.1f} ms{stats['p99']:>8.1f} ms")
+    assert results["bulk"]["statements"] <= MAX_BULK_STATEMENTS, results["bulk"]["statements"]
+    print(f"OK: onboarding a user takes {results['bulk']['statements']:.0f} statements")
+
+
+if __name__ == '__main__':
+    run()
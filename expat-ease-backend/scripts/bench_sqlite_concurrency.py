@@ -0,0 +1,130 @@
+"""
+Benchmark concurrent SQLite readers and writers under both connection profiles.
+
+Runs writer threads (read, insert, then update in one transaction, like a
+request that records something) next to reader threads that keep querying
+the same table, for a few seconds per profile:
+
+- legacy: the engine as it was created before the pool settings existed
+  (rollback journal, the driver's default 5 s lock wait);
+- configured: engine_options() plus the SQLITE_* pragmas (WAL,
+  synchronous=NORMAL, busy_timeout).
+
+Reports completed writes/reads, "database is locked" errors and latency
+percentiles, and checks that the configured profile has no lock errors.
+Writers still queue for SQLite's single write lock (its busy handler polls,
+so the worst-case wait is long); WAL only stops readers and writers from
+blocking each other.
+
+Usage: python scripts/bench_sqlite_concurrency.py [seconds] [writers] [readers]
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+SCRATCH = Path(tempfile.mkdtemp())
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH / 'app.db'}"
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlmodel import create_engine
+
+from app.db.session import apply_sqlite_pragmas, engine_options
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+WRITERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+READERS = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+
+def make_engine(profile: str) -> Engine:
+    url = f"sqlite:///{SCRATCH / profile}.db"
+    if profile == "legacy":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url, **engine_options(url))
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, body TEXT)"))
+        connection.execute(text("INSERT INTO item (body) VALUES ('seed')"))
+    return engine
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000 if ordered else 0.0
+
+
+def measure(profile: str) -> dict:
+    engine = make_engine(profile)
+    writes, reads, errors = [], [], []
+    deadline = time.time() + SECONDS
+
+    def writer():
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text("SELECT count(*) FROM item")).scalar()
+                    connection.execute(text("INSERT INTO item (body) VALUES (:body)"), {"body": "x" * 200})
+                    time.sleep(0.005)  # application work while the transaction is open
+                    connection.execute(text("UPDATE item SET body = 'updated' WHERE id = 1"))
+            except Exception as exc:
+                errors.append(str(exc).splitlines()[0])
+                continue
+            writes.append(time.perf_counter() - started)
+
+    def reader():
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT count(*), max(length(body)) FROM item")).all()
+            except Exception as exc:
+                errors.append(str(exc).splitlines()[0])
+                continue
+            reads.append(time.perf_counter() - started)
+            time.sleep(0.001)  # think time, so readers do not saturate the CPU
+
+    threads = [threading.Thread(target=writer) for _ in range(WRITERS)]
+    threads += [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {
+        "writes": len(writes),
+        "reads": len(reads),
+        "locked": sum("locked" in error for error in errors),
+        "errors": len(errors),
+        "write_p50": percentile(writes, 0.50),
+        "write_p99": percentile(writes, 0.99),
+        "write_max": max(writes, default=0.0) * 1000,
+        "read_p99": percentile(reads, 0.99),
+    }
+
+
+def run():
+    print(f"{WRITERS} writers + {READERS} readers for {SECONDS:.0f} s per profile")
+    print(f"{'profile':<12}{'writes':>8}{'reads':>8}{'locked':>8}{'write p50':>12}{'write p99':>12}{'write max':>12}{'read p99':>11}")
+    results = {}
+    for profile in ("legacy", "configured"):
+        stats = results[profile] = measure(profile)
+        print(f"{profile:<12}{stats['writes']:>8}{stats['reads']:>8}{stats['locked']:>8}"
+              f"{stats['write_p50']:>9.1f} ms{stats['write_p99']:>9.1f} ms{stats['write_max']:>9.1f} ms"
+              f"{stats['read_p99']:>8.1f} ms")
+    assert results["configured"]["errors"] == 0, "writers hit lock errors with the configured profile"
+    print("OK: no lock errors with WAL + busy_timeout")
+
+
+if __name__ == '__main__':
+    run()
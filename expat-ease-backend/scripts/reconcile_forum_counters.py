@@ -0,0 +1,41 @@
+"""
+One-shot reconciliation of the denormalized forum counters.
+
+Applies pending schema migrations (which add the counter and hot score
+columns to databases created before they existed), then recomputes
+upvote/downvote/answer counts for every question and answer from the vote
+and answer tables in bulk, and rebuilds the hot scores from those counters.
+
+Usage: python scripts/reconcile_forum_counters.py
+"""
+from pathlib import Path
+import sys
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import Session
+
+import app.db.base  # registers all models
+from app.core.config import settings
+from app.crud.crud_forum import reconcile_counters, rebuild_hot_scores
+from app.db.migrations import upgrade
+from app.db.session import engine
+
+
+def run():
+    applied = upgrade(engine)
+    if applied:
+        print(f'Applied migrations {applied}')
+    print('Recomputing forum counters...')
+    with Session(engine) as session:
+        reconcile_counters(session)
+        print('Rebuilding hot scores...')
+        rebuild_hot_scores(session, settings.FORUM_HOT_HALF_LIFE_HOURS)
+    print('Done.')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+"""
+Check that the async auth and user endpoints keep database work off the event loop.
+
+The password endpoints are `async def` (they await the hashing pool), so any
+query on the synchronous engine would run on the event loop thread and stall
+every other request. This drives signup, login, profile update, password
+verification, change, reset and change-by-email against a throwaway SQLite
+database and checks that none of them runs a statement on the sync engine:
+their queries go through the async session.
+
+Usage: python scripts/test_async_auth_sessions.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "async_auth.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "async-auth-secret")
+os.environ["DEV_RETURN_RESET_TOKEN"] = "true"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.main import app
+
+EMAIL = "async-auth@example.com"
+
+
+def login(client: TestClient, password: str) -> dict:
+    response = client.post("/api/v1/auth/login", json={"email": EMAIL, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def run():
+    with TestClient(app) as client:
+        sync_statements = []
+        listener = lambda conn, cursor, statement, *args: sync_statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+
+        response = client.post("/api/v1/users/", json={"email": EMAIL, "password": "First-pass-1"})
+        assert response.status_code == 201, response.text
+        assert client.post("/api/v1/users/", json={"email": EMAIL, "password": "First-pass-1"}).status_code == 400
+
+        headers = login(client, "First-pass-1")
+        response = client.patch("/api/v1/users/me", json={"full_name": "Async", "password": "Second-pass-2"},
+                                headers=headers)
+        assert response.status_code == 200 and response.json()["full_name"] == "Async", response.text
+
+        headers = login(client, "Second-pass-2")
+        response = client.post("/api/v1/auth/verify-password", json={"current_password": "Second-pass-2"},
+                               headers=headers)
+        assert response.status_code == 200, response.text
+        response = client.post("/api/v1/auth/change-password", json={"new_password": "Third-pass-3"},
+                               headers=headers)
+        assert response.status_code == 200 and response.json()["access_token"], response.text
+
+        # forgot-password is a sync endpoint (run in the threadpool); leave it out
+        event.remove(engine, "before_cursor_execute", listener)
+        token = client.post("/api/v1/auth/forgot-password", json={"email": EMAIL}).json()["token"]
+        event.listen(engine, "before_cursor_execute", listener)
+
+        response = client.post("/api/v1/auth/reset-password", json={"token": token, "new_password": "Fourth-pass-4"})
+        assert response.status_code == 200, response.text
+        response = client.post("/api/v1/auth/reset-password", json={"token": token, "new_password": "Fourth-pass-4"})
+        assert response.status_code == 400, "a reset token must only work once"
+        response = client.post("/api/v1/auth/change-password-by-email", json={
+            "email": EMAIL, "current_password": "Fourth-pass-4", "new_password": "Fifth-pass-5",
+        })
+        assert response.status_code == 200, response.text
+        login(client, "Fifth-pass-5")
+
+        event.remove(engine, "before_cursor_execute", listener)
+        assert not sync_statements, sync_statements
+    print("OK: the async auth and user endpoints run no queries on the sync engine")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,56 @@
+"""
+Check that the in-process cache bounds its generation counters safely.
+
+Bumps the generations of many more namespaces than the LRU cache keeps
+counters for, and checks that:
+- the number of stored counters stays at the bound;
+- a namespace whose counter was evicted never reads a generation it had
+  before, so entries cached under an old generation cannot come back;
+- a namespace's generation never goes down.
+
+Usage: python scripts/test_cache_generations.py
+"""
+from pathlib import Path
+import random
+import sys
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.cache import LRUCache, ResponseCache
+
+MAX_GENERATIONS = 50
+NAMESPACES = 2000
+OPERATIONS = 50000
+
+
+def run():
+    cache = ResponseCache("generations-check", LRUCache(max_entries=MAX_GENERATIONS), ttl=60)
+    rng = random.Random(6)
+    seen = {}  # namespace -> generations read so far
+    for _ in range(OPERATIONS):
+        namespace = f"question:{rng.randrange(NAMESPACES)}"
+        previous = seen.setdefault(namespace, [])
+        if rng.random() < 0.5:
+            cache.bump_generation(namespace)
+        generation = cache.generation(namespace)
+        if previous:
+            assert generation >= previous[-1], (namespace, previous[-1], generation)
+            if generation != previous[-1]:
+                assert generation not in previous, (namespace, generation)
+        previous.append(generation)
+
+        # An entry cached under the current generation is served until the next bump
+        cache.set(f"{namespace}:{generation}", "value")
+        assert cache.get(f"{namespace}:{generation}") == "value"
+
+    stats = cache.stats()
+    assert stats["generations"] <= MAX_GENERATIONS, stats
+    print(f"OK: {len(seen)} namespaces bumped, {stats['generations']} counters kept, "
+          "no generation ever reused")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,108 @@
+"""
+Concurrency check for accepting forum answers.
+
+Seeds a throwaway SQLite database with one question and many answers, then
+fires parallel accept requests for different answers of the same question
+and checks that exactly one answer ends up accepted. Also checks that the
+database itself rejects a second accepted answer written behind the API's back.
+
+Usage: python scripts/test_concurrent_accept.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "concurrent_accept.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, func, select
+
+from app.core.deps import get_current_user_async
+from app.db.session import engine
+from app.main import app
+from app.models.forum import Question, Answer
+from app.models.user import User
+
+NUM_ANSWERS = 50
+ROUNDS = 5
+WORKERS = 16
+
+
+def seed(author: User) -> int:
+    with Session(engine) as session:
+        question = Question(title="Concurrent accept", content="Which answer wins?", user_id=author.id)
+        session.add(question)
+        session.flush()
+        session.add_all([
+            Answer(content=f"Answer {i}", question_id=question.id, user_id=author.id) for i in range(NUM_ANSWERS)
+        ])
+        session.commit()
+        return question.id
+
+
+def accepted_answers(question_id: int) -> list:
+    with Session(engine) as session:
+        return session.exec(
+            select(Answer.id).where(Answer.question_id == question_id, Answer.is_accepted)
+        ).all()
+
+
+def run():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            author = User(email="author@example.com", hashed_password="x")
+            session.add(author)
+            session.commit()
+            session.refresh(author)
+        app.dependency_overrides[get_current_user_async] = lambda: author
+
+        question_id = seed(author)
+        with Session(engine) as session:
+            answer_ids = session.exec(select(Answer.id).where(Answer.question_id == question_id)).all()
+
+        for round_number in range(ROUNDS):
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                statuses = list(pool.map(
+                    lambda answer_id: client.post(f"/api/v1/forum/answers/{answer_id}/accept").status_code,
+                    answer_ids,
+                ))
+            assert set(statuses) <= {200, 409}, f"unexpected statuses: {sorted(set(statuses))}"
+            accepted = accepted_answers(question_id)
+            assert len(accepted) == 1, f"round {round_number}: {len(accepted)} accepted answers"
+            print(f"round {round_number}: {statuses.count(200)} accepted / {statuses.count(409)} conflicts, "
+                  f"winner answer {accepted[0]}")
+
+        with Session(engine) as session:
+            assert session.get(Question, question_id).is_resolved
+            second = session.exec(
+                select(Answer).where(Answer.question_id == question_id, Answer.is_accepted == False)  # noqa: E712
+            ).first()
+            second.is_accepted = True
+            session.add(second)
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+            else:
+                raise AssertionError("database accepted a second accepted answer")
+            count = session.exec(
+                select(func.count(Answer.id)).where(Answer.question_id == question_id, Answer.is_accepted)
+            ).one()
+            assert count == 1
+
+        app.dependency_overrides.clear()
+    print("OK: exactly one accepted answer per question")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,113 @@
+"""
+Check that embedding authors in forum responses costs a bounded number of queries.
+
+Seeds a throwaway SQLite database with a 100-answer thread written by many
+(recurring) authors, then counts the SQL statements that read the users
+table while serving the question detail, the answer page, the answer stream
+and the question list. Each must load all its authors with at most one query.
+
+Usage: python scripts/test_forum_user_queries.py
+"""
+from pathlib import Path
+import json
+import os
+import re
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "user_queries.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+# Every request must reach the database
+os.environ["FORUM_CACHE_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.deps import get_current_user_async
+from app.db.session import async_engine, engine
+from app.main import app
+from app.models.forum import Question, Answer
+from app.models.user import User
+
+NUM_ANSWERS = 100
+NUM_AUTHORS = 25
+MAX_USER_QUERIES = 1
+API = "/api/v1/forum"
+
+USERS_TABLE = re.compile(r"\bFROM users\b|\bJOIN users\b", re.IGNORECASE)
+
+
+class UserQueryCounter:
+    """Counts SQL statements that read the users table."""
+
+    def __init__(self):
+        self.count = 0
+        # The forum endpoints run on the async engine; answer streams on the sync one
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if USERS_TABLE.search(statement):
+            self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def seed() -> tuple:
+    with Session(engine) as session:
+        authors = [User(email=f"author{i}@example.com", hashed_password="x", full_name=f"Author {i}")
+                   for i in range(NUM_AUTHORS)]
+        session.add_all(authors)
+        session.flush()
+        question = Question(title="Long thread", content="Many answers", user_id=authors[0].id)
+        session.add(question)
+        session.flush()
+        session.add_all([
+            Answer(content=f"Answer {i}", question_id=question.id, user_id=authors[i % NUM_AUTHORS].id)
+            for i in range(NUM_ANSWERS)
+        ])
+        session.commit()
+        return question.id, authors[0]
+
+
+def run():
+    with TestClient(app) as client:
+        question_id, viewer = seed()
+        app.dependency_overrides[get_current_user_async] = lambda: viewer
+        counter = UserQueryCounter()
+
+        checks = {
+            "question detail": lambda: client.get(f"{API}/questions/{question_id}"),
+            "answer page": lambda: client.get(f"{API}/questions/{question_id}/answers", params={"limit": 100}),
+            "answer stream": lambda: client.get(f"{API}/questions/{question_id}/answers", params={"stream": True}),
+            "question list": lambda: client.get(f"{API}/questions"),
+        }
+        for name, request in checks.items():
+            counter.reset()
+            response = request()
+            assert response.status_code == 200, response.text
+            print(f"{name:<16} user queries={counter.count}")
+            assert counter.count <= MAX_USER_QUERIES, f"{name}: {counter.count} user queries"
+
+        detail = client.get(f"{API}/questions/{question_id}").json()
+        assert len(detail["answers"]) == NUM_ANSWERS
+        for i, answer in enumerate(detail["answers"]):
+            assert answer["user"]["full_name"] == f"Author {i % NUM_AUTHORS}"
+        streamed = [json.loads(line) for line in client.get(
+            f"{API}/questions/{question_id}/answers", params={"stream": True}).text.splitlines()]
+        assert [a["user"] for a in streamed] == [a["user"] for a in detail["answers"]]
+
+        app.dependency_overrides.clear()
+    print("OK: authors are loaded with a bounded number of queries")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,97 @@
+"""
+Check that hot-score decay runs once per interval across workers and restarts.
+
+Seeds a throwaway SQLite database with questions at a few hot scores and
+checks that:
+- the first run only starts the decay clock;
+- a run one half-life later halves the scores, zeroes those that would fall
+  below HOT_FLOOR and leaves zero scores alone;
+- further runs by other workers within the interval change nothing;
+- a run in a new process applies the decay for the time since the stored
+  last run.
+
+Usage: python scripts/test_hot_decay.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+from datetime import timedelta
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "hot_decay.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.hot_decay import DECAY_JOB, decay_once
+from app.crud.crud_forum import HOT_FLOOR
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.models.forum import Question
+from app.models.job_run import JobRun
+from app.models.user import User
+
+INTERVAL = 300.0
+SCORES = {"busy": 8.0, "downvoted": -4.0, "fading": HOT_FLOOR * 1.5, "idle": 0.0}
+
+
+def rewind_clock(seconds: float) -> None:
+    """Move the stored last run back, as if `seconds` had passed since it."""
+    with Session(engine) as session:
+        job_run = session.get(JobRun, DECAY_JOB)
+        job_run.last_run_at -= timedelta(seconds=seconds)
+        session.add(job_run)
+        session.commit()
+
+
+def scores() -> dict:
+    with Session(engine) as session:
+        return dict(session.exec(select(Question.title, Question.hot_score)).all())
+
+
+def run():
+    create_db_and_tables()
+    with Session(engine) as session:
+        user = User(email="hot@example.com", hashed_password="x", full_name="Hot")
+        session.add(user)
+        session.commit()
+        session.add_all([
+            Question(title=title, content="C", category="general", user_id=user.id, hot_score=score)
+            for title, score in SCORES.items()
+        ])
+        session.commit()
+
+    assert decay_once(INTERVAL / 2) == 0
+    assert scores() == SCORES
+    print("OK: the first run starts the clock")
+
+    half_life = settings.FORUM_HOT_HALF_LIFE_HOURS * 3600
+    rewind_clock(half_life)
+    assert decay_once(INTERVAL / 2) == 3
+    decayed = scores()
+    assert abs(decayed["busy"] - 4.0) < 1e-3 and abs(decayed["downvoted"] + 2.0) < 1e-3, decayed
+    assert decayed["fading"] == 0.0 and decayed["idle"] == 0.0, decayed
+    print(f"OK: one half-life halves the scores and zeroes the faded ones: {decayed}")
+
+    # Other workers waking within the interval skip the run
+    assert [decay_once(INTERVAL / 2) for _ in range(3)] == [0, 0, 0]
+    assert scores() == decayed
+    print("OK: runs within the interval change nothing")
+
+    # A restarted worker decays by the stored time since the last run
+    rewind_clock(half_life)
+    assert decay_once(INTERVAL / 2) == 2
+    restarted = scores()
+    assert abs(restarted["busy"] - 2.0) < 1e-3 and abs(restarted["downvoted"] + 1.0) < 1e-3, restarted
+    print("OK: the decay covers the time since the stored last run")
+
+
+if __name__ == '__main__':
+    run()
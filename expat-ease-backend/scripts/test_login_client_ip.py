@@ -0,0 +1,104 @@
+"""
+Check which client IP the failed-login throttle counts behind reverse proxies.
+
+Sends failed logins for unknown emails (so only the per-IP limit can trip)
+through the app with a low per-IP limit and checks that:
+- direct clients are counted by their own address;
+- clients behind a trusted proxy are counted by their X-Forwarded-For address,
+  so one client going over the limit does not block the others;
+- X-Forwarded-For entries the client wrote itself are ignored: rotating a
+  spoofed header, directly or through a trusted proxy, still ends in 429;
+- with FORWARDED_ALLOW_IPS="*" (also when uvicorn already replaced the
+  client address by the spoofable left-most entry) the right-most entry counts.
+
+Usage: python scripts/test_login_client_ip.py
+"""
+from pathlib import Path
+import asyncio
+import os
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "login_client_ip.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "client-ip-secret")
+os.environ["LOGIN_THROTTLE_MAX_FAILURES_PER_IP"] = "3"
+os.environ["FORWARDED_ALLOW_IPS"] = "10.0.0.0/8"
+
+import httpx
+
+from app.core.config import settings
+from app.core.login_throttle import InMemoryThrottleBackend, login_throttle
+from app.db.init_db import create_db_and_tables
+from app.main import app
+
+LOGIN = "/api/v1/auth/login"
+LIMIT = 3
+TRUSTED_PROXY = "10.0.0.5"
+UNTRUSTED_PROXY = "192.0.2.10"
+
+
+def reset_throttle() -> None:
+    login_throttle.backend = InMemoryThrottleBackend(max_keys=login_throttle.backend.max_keys)
+
+
+async def attempts(peer: str, forwarded_for: str = None, count: int = LIMIT + 1) -> list:
+    """
+    Status codes of `count` failed logins, each for a different unknown email.
+
+    "{i}" in `peer` or `forwarded_for` is replaced by the attempt number.
+    """
+    codes = []
+    for i in range(count):
+        transport = httpx.ASGITransport(app=app, client=(peer.format(i=i), 40000))
+        headers = {"X-Forwarded-For": forwarded_for.format(i=i)} if forwarded_for else {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                LOGIN, json={"email": f"nobody{i}@example.com", "password": "wrong-password"}, headers=headers
+            )
+        codes.append(response.status_code)
+    return codes
+
+
+async def main():
+    reset_throttle()
+    assert await attempts("198.51.100.1") == [401] * LIMIT + [429]
+    assert await attempts("198.51.100.2", count=1) == [401]
+    print("OK: direct clients are throttled by their own address")
+
+    reset_throttle()
+    assert await attempts(TRUSTED_PROXY, "203.0.113.1") == [401] * LIMIT + [429]
+    assert await attempts(TRUSTED_PROXY, "203.0.113.2, 10.0.0.7", count=1) == [401]
+    assert await attempts(TRUSTED_PROXY, "198.51.100.9, 203.0.113.1", count=1) == [429]
+    print("OK: behind a trusted proxy clients are throttled by their forwarded address")
+
+    reset_throttle()
+    assert await attempts("198.51.100.3", "192.0.2.{i}", count=10) == [401] * LIMIT + [429] * (10 - LIMIT)
+    assert await attempts(UNTRUSTED_PROXY, "203.0.113.3", count=LIMIT + 1) == [401] * LIMIT + [429]
+    assert await attempts(TRUSTED_PROXY, "192.0.2.{i}, 203.0.113.4", count=10) == [401] * LIMIT + [429] * (10 - LIMIT)
+    print("OK: spoofed X-Forwarded-For entries do not escape the per-IP limit")
+
+    reset_throttle()
+    allowed = settings.FORWARDED_ALLOW_IPS
+    settings.FORWARDED_ALLOW_IPS = "*"
+    try:
+        # As uvicorn with --forwarded-allow-ips "*" would hand it over: client = left-most entry
+        assert await attempts("192.0.2.{i}", "192.0.2.{i}, 203.0.113.5", count=10) == [401] * LIMIT + [429] * (10 - LIMIT)
+    finally:
+        settings.FORWARDED_ALLOW_IPS = allowed
+    print('OK: with "*" the right-most forwarded entry is counted')
+
+
+def run():
+    create_db_and_tables()
+    asyncio.run(main())
+
+
+if __name__ == '__main__':
+    run()
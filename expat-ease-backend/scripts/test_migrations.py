@@ -0,0 +1,116 @@
+"""
+Check the schema migrations against a database laid out like an old deployment.
+
+Builds a scratch SQLite database from the current models, then strips it back
+to an older schema: no migrations table, the lookup and forum indexes dropped,
+the counter and token_version columns removed, the legacy idx_* indexes of the
+old constraint script and the single-column forum foreign key indexes of older
+models added, and a duplicate vote inserted. The script checks
+that:
+- the index check reports the missing indexes and pending migrations;
+- upgrading adds the columns and indexes, drops the legacy indexes and
+  removes the duplicate vote with the counters reconciled;
+- a second upgrade applies nothing and the check then passes;
+- a new database is created fully by the migrations.
+
+Usage: python scripts/test_migrations.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+SCRATCH = Path(tempfile.mkdtemp())
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH / 'app.db'}"
+
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+import app.db.base  # noqa: F401  registers all models
+from app.db.migrations import LATEST_VERSION, applied_versions, missing_indexes, pending_migrations, upgrade
+
+DROPPED_INDEXES = [
+    "ix_document_user_id", "ix_document_settlement_step_id", "ix_task_user_id",
+    "ix_settlementstep_user_id", "ix_passwordresettoken_token",
+    "ix_question_hot_score_id", "ix_question_category_hot_score_id",
+    "uq_questionvote_question_id_user_id",
+]
+DROPPED_COLUMNS = [("question", "hot_score"), ("question", "upvote_count"), ("users", "token_version")]
+LEGACY_INDEXES = {
+    "idx_questions_category": "question(category)",
+    "idx_answers_question_id": "answer(question_id)",
+    "idx_question_votes_question_id": "questionvote(question_id)",
+    "ix_answer_question_id": "answer(question_id)",
+    "ix_questionvote_question_id": "questionvote(question_id)",
+    "ix_answervote_answer_id": "answervote(answer_id)",
+}
+
+
+def build_legacy_database(url: str):
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        for table, column in DROPPED_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+        for name, target in LEGACY_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX {name} ON {target}"))
+        conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active, created_at, country_selected) "
+            "VALUES (1, 'old@example.com', 'x', 1, '2024-01-01', 0)"
+        ))
+        conn.execute(text(
+            "INSERT INTO question (id, title, content, category, user_id, created_at, is_resolved, "
+            "view_count, downvote_count, answer_count) "
+            "VALUES (1, 'Old question', 'Body', 'general', 1, '2024-01-01', 0, 0, 0, 0)"
+        ))
+        for vote_id in (1, 2):
+            conn.execute(text(
+                "INSERT INTO questionvote (id, question_id, user_id, is_upvote, created_at) "
+                "VALUES (:id, 1, 1, 1, '2024-01-01')"
+            ), {"id": vote_id})
+    return engine
+
+
+def run():
+    engine = build_legacy_database(f"sqlite:///{SCRATCH / 'legacy.db'}")
+
+    missing = missing_indexes(engine)
+    assert {entry.split(" ")[0].split(".")[1] for entry in missing} == set(DROPPED_INDEXES), missing
+    assert len(pending_migrations(engine)) == LATEST_VERSION
+    print(f"OK: check reports {len(missing)} missing indexes and {LATEST_VERSION} pending migrations")
+
+    assert upgrade(engine) == list(range(1, LATEST_VERSION + 1))
+    inspector = inspect(engine)
+    assert {"hot_score", "upvote_count"} <= {c["name"] for c in inspector.get_columns("question")}
+    assert "token_version" in {c["name"] for c in inspector.get_columns("users")}
+    assert missing_indexes(engine) == []
+    index_names = {i["name"] for table in inspector.get_table_names() for i in inspector.get_indexes(table)}
+    assert not index_names & set(LEGACY_INDEXES), index_names & set(LEGACY_INDEXES)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM questionvote")).scalar() == 1
+        assert conn.execute(text("SELECT upvote_count FROM question WHERE id = 1")).scalar() == 1
+        assert conn.execute(text("SELECT token_version FROM users WHERE id = 1")).scalar() == 0
+    print("OK: upgrade adds columns and indexes, drops legacy indexes, removes the duplicate vote")
+
+    assert upgrade(engine) == []
+    assert pending_migrations(engine) == [] and missing_indexes(engine) == []
+    print("OK: a second upgrade applies nothing and the check passes")
+
+    fresh = create_engine(f"sqlite:///{SCRATCH / 'fresh.db'}")
+    upgrade(fresh)
+    assert applied_versions(fresh) == list(range(1, LATEST_VERSION + 1))
+    assert missing_indexes(fresh) == []
+    assert set(SQLModel.metadata.tables) <= set(inspect(fresh).get_table_names())
+    print("OK: a new database is created by the migrations")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,94 @@
+"""
+Check that logins migrate password hashes to the configured hashing policy.
+
+Seeds users whose hashes were made with a lower bcrypt cost and with scrypt,
+logs them in under the default bcrypt policy, then switches the policy to
+scrypt and logs in again. Each successful login must leave a hash that
+matches the current policy, wrong passwords must change nothing, and the
+password must keep working after every migration.
+
+Usage: python scripts/test_password_rehash.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "rehash.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "rehash-secret")
+
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt, scrypt
+from sqlmodel import Session, select
+
+from app.core import security
+from app.core.config import settings
+from app.db.session import engine
+from app.main import app
+from app.models.user import User
+
+PASSWORD = "Rehash-password-1"
+LOGIN = "/api/v1/auth/login"
+
+
+def stored_hash(email: str) -> str:
+    with Session(engine) as session:
+        return session.exec(select(User.hashed_password).where(User.email == email)).one()
+
+
+def set_policy(scheme: str) -> None:
+    settings.PASSWORD_HASH_SCHEME = scheme
+    security.pwd_context = security.build_password_context()
+
+
+def login(client: TestClient, email: str, password: str = PASSWORD) -> int:
+    return client.post(LOGIN, json={"email": email, "password": password}).status_code
+
+
+def run():
+    with TestClient(app) as client:
+        legacy = {
+            "cheap-bcrypt@example.com": bcrypt.using(rounds=4).hash(PASSWORD),
+            "scrypt@example.com": scrypt.using(rounds=10).hash(PASSWORD),
+            "current@example.com": security.hash_password(PASSWORD),
+        }
+        with Session(engine) as session:
+            session.add_all([User(email=email, hashed_password=hashed) for email, hashed in legacy.items()])
+            session.commit()
+
+        # A wrong password never rewrites the hash
+        assert login(client, "cheap-bcrypt@example.com", "wrong-password") == 401
+        assert stored_hash("cheap-bcrypt@example.com") == legacy["cheap-bcrypt@example.com"]
+
+        for email, old_hash in legacy.items():
+            assert login(client, email) == 200
+            new_hash = stored_hash(email)
+            assert not security.password_needs_update(new_hash), f"{email}: {new_hash}"
+            assert new_hash.startswith("$2b$12$"), new_hash
+            if email == "current@example.com":
+                assert new_hash == old_hash, "a current hash was rewritten"
+            assert login(client, email) == 200
+        print("bcrypt policy: outdated hashes upgraded, current hash untouched")
+
+        set_policy("scrypt")
+        try:
+            for email in legacy:
+                assert login(client, email) == 200
+                new_hash = stored_hash(email)
+                assert new_hash.startswith(f"$scrypt$ln={settings.PASSWORD_SCRYPT_LOG_N},"), new_hash
+                assert login(client, email) == 200
+            print("scrypt policy: bcrypt hashes migrated to scrypt")
+        finally:
+            set_policy("bcrypt")
+    print("OK: logins keep password hashes on the current policy")
+
+
+if __name__ == '__main__':
+    run()
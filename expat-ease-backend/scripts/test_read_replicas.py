@@ -0,0 +1,157 @@
+"""
+Check read-replica routing with SQLite files standing in for the databases.
+
+The primary and two replicas are separate SQLite files; the replicas start as
+copies of the primary with their question and task titles changed, so every
+response shows which database served it. A third replica points into a
+directory that does not exist yet. The script checks that:
+- read-only endpoints alternate between the healthy replicas;
+- the unreachable replica is ejected, then readmitted once it exists;
+- writes go to the primary, and the writing client reads its own writes
+  from the primary until the sticky window ends;
+- the forum cache is only filled from the primary and skipped by sticky
+  clients, so another client's replica read cannot hide a write from its
+  author;
+- answer streams read from the replica the request was routed to;
+- reads fall back to the primary when every replica is ejected.
+
+Usage: python scripts/test_read_replicas.py
+"""
+from pathlib import Path
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at scratch databases before anything imports the engines
+SCRATCH = Path(tempfile.mkdtemp())
+PRIMARY = SCRATCH / "primary.db"
+REPLICAS = [SCRATCH / "replica_a.db", SCRATCH / "replica_b.db", SCRATCH / "later" / "replica_c.db"]
+STICKY_SECONDS = 0.5
+EJECT_SECONDS = 1.0
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY}"
+os.environ["DATABASE_READ_URLS"] = ",".join(f"sqlite:///{path}" for path in REPLICAS)
+os.environ["DATABASE_READ_STICKY_SECONDS"] = str(STICKY_SECONDS)
+os.environ["DATABASE_READ_EJECT_SECONDS"] = str(EJECT_SECONDS)
+os.environ["FORUM_CACHE_ENABLED"] = "false"
+os.environ.setdefault("SECRET_KEY", "replica-secret")
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import forum_cache
+from app.db.replicas import read_router
+from app.main import app
+
+EMAIL = "replica@example.com"
+OTHER_EMAIL = "other@example.com"
+PASSWORD = "Replica-password-1"
+
+
+def make_replica(path: Path, label: str) -> None:
+    """Copy the primary into `path` and tag its rows with `label`."""
+    source, target = sqlite3.connect(PRIMARY), sqlite3.connect(path)
+    source.backup(target)
+    target.execute("UPDATE question SET title = ?", (label,))
+    target.execute("UPDATE task SET title = ?", (label,))
+    target.execute("UPDATE answer SET content = ?", (label,))
+    target.commit()
+    source.close()
+    target.close()
+
+
+def question_titles(client: TestClient, headers: dict) -> list:
+    response = client.get("/api/v1/forum/questions", headers=headers)
+    assert response.status_code == 200, response.text
+    return [question["title"] for question in response.json()]
+
+
+def login(client: TestClient, email: str) -> dict:
+    client.post("/api/v1/users/", json={"email": email, "password": PASSWORD, "full_name": "Replica"})
+    token = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def run():
+    with TestClient(app) as client:
+        headers = login(client, EMAIL)
+        other_headers = login(client, OTHER_EMAIL)
+        question = {"title": "primary", "content": "Written to the primary", "category": "general"}
+        response = client.post("/api/v1/forum/questions", json=question, headers=headers)
+        assert response.status_code == 200
+        question_id = response.json()["id"]
+        answer = {"content": "primary answer"}
+        assert client.post(f"/api/v1/forum/questions/{question_id}/answers", json=answer, headers=headers).status_code == 200
+        assert client.post("/api/v1/tasks/initialize", data={"country": "germany"}, headers=headers).status_code == 200
+        assert client.post("/api/v1/settlement-steps/initialize", headers=headers).status_code == 200
+
+        make_replica(REPLICAS[0], "replica A")
+        make_replica(REPLICAS[1], "replica B")
+        time.sleep(STICKY_SECONDS)
+
+        # Round robin over the healthy replicas; the missing one is ejected on first use
+        served = [question_titles(client, headers)[0] for _ in range(6)]
+        assert set(served) == {"replica A", "replica B"}, served
+        assert all(a != b for a, b in zip(served, served[1:])), f"not alternating: {served}"
+        stats = read_router.stats()["replicas"]
+        assert not stats["replica2"]["healthy"] and stats["replica2"]["ejections"] == 1, stats
+        print(f"OK: reads alternate between replicas ({served[:4]}...), unreachable replica ejected")
+
+        # The other read-only endpoints are routed too
+        tasks = client.get("/api/v1/tasks/?country=germany", headers=headers).json()
+        assert tasks and {task["title"] for task in tasks} <= {"replica A", "replica B"}, tasks
+        assert client.get("/api/v1/settlement-steps/", headers=headers).status_code == 200
+        assert client.get("/api/v1/documents/", headers=headers).status_code == 200
+        print("OK: tasks, settlement steps and documents listings read from replicas")
+
+        # Writes go to the primary, and the writer reads them back from the primary
+        question = {"title": "fresh", "content": "Not replicated yet", "category": "general"}
+        assert client.post("/api/v1/forum/questions", json=question, headers=headers).status_code == 200
+        assert question_titles(client, headers)[:2] == ["fresh", "primary"]
+        time.sleep(STICKY_SECONDS)
+        assert "fresh" not in question_titles(client, headers)
+        print("OK: the writer reads its own write from the primary until the sticky window ends")
+
+        # The missing replica comes back and is readmitted after the ejection period
+        REPLICAS[2].parent.mkdir()
+        make_replica(REPLICAS[2], "replica C")
+        time.sleep(EJECT_SECONDS)
+        served = {question_titles(client, headers)[0] for _ in range(6)}
+        assert served == {"replica A", "replica B", "replica C"}, served
+        print("OK: a recovered replica is readmitted")
+
+        # Answer streams stay on the replica the request was routed to
+        streamed = client.get(f"/api/v1/forum/questions/{question_id}/answers?stream=true", headers=headers).text
+        assert "replica" in streamed and "primary answer" not in streamed, streamed
+        print("OK: answer streams read from the routed replica")
+
+        # With the cache on: another client's replica read must not hide a write from its author
+        forum_cache.enabled = True
+        try:
+            for title in ("cached one", "cached two"):
+                question = {"title": title, "content": "Not replicated", "category": "general"}
+                assert client.post("/api/v1/forum/questions", json=question, headers=headers).status_code == 200
+            assert "cached one" not in question_titles(client, other_headers)
+            assert question_titles(client, headers)[:2] == ["cached two", "cached one"]
+            assert question_titles(client, headers)[:2] == ["cached two", "cached one"]
+            detail = client.get(f"/api/v1/forum/questions/{question_id}", headers=other_headers).json()
+            assert detail["title"].startswith("replica")
+            assert client.get(f"/api/v1/forum/questions/{question_id}", headers=headers).json()["title"] == "primary"
+        finally:
+            forum_cache.enabled = False
+        print("OK: replica reads are not cached and sticky clients skip the cache")
+
+        # With every replica ejected, reads fall back to the primary
+        for replica in read_router.replicas:
+            read_router.eject(replica, RuntimeError("test"))
+        assert question_titles(client, other_headers)[:2] == ["cached two", "cached one"]
+        print("OK: reads fall back to the primary when no replica is healthy")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,144 @@
+"""
+Check that settlement step responses load their documents with one query.
+
+Seeds a throwaway SQLite database with a user whose six settlement steps each
+have documents attached, then counts the SQL statements that read or delete
+from the document table while listing, updating and resetting the steps.
+Listing and updating must read the documents with one query whatever the
+number of steps; resetting must delete them in bulk, along with the files of
+documents stored on local disk. The responses must still report the first
+document of each step.
+
+Usage: python scripts/test_settlement_step_queries.py
+"""
+from pathlib import Path
+import os
+import re
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "settlement_queries.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, func, select
+
+from app.core.deps import get_current_active_user_async
+from app.db.session import async_engine, engine
+from app.main import app
+from app.models.document import Document
+from app.models.settlement_step import SettlementStep
+from app.models.user import User
+
+DOCUMENTS_PER_STEP = 3
+API = "/api/v1/settlement-steps"
+
+DOCUMENT_TABLE = re.compile(r"\bFROM document\b|\bJOIN document\b", re.IGNORECASE)
+
+
+class DocumentQueryCounter:
+    """Counts SQL statements that read or delete from the document table."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = 0
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        if DOCUMENT_TABLE.search(statement):
+            self.count += 1
+
+    def reset(self):
+        self.count = 0
+        self.statements = 0
+
+
+def seed_documents(user_id: int) -> dict:
+    """Attach DOCUMENTS_PER_STEP documents to each step; returns the first URL per step id."""
+    first_urls = {}
+    with Session(engine) as session:
+        steps = session.exec(select(SettlementStep).where(SettlementStep.user_id == user_id)).all()
+        for step in steps:
+            for i in range(DOCUMENTS_PER_STEP):
+                url = f"https://res.example.com/step{step.id}/doc{i}.pdf"
+                first_urls.setdefault(step.id, url)
+                session.add(Document(
+                    filename=f"doc{i}.pdf", original_filename=f"doc{i}.pdf", file_path=url,
+                    file_size=100, content_type="application/pdf",
+                    settlement_step_id=step.id, user_id=user_id,
+                ))
+        session.commit()
+    return first_urls
+
+
+def seed_local_document(user_id: int) -> Path:
+    """Attach a document stored on local disk (pre-Cloudinary upload) to the user's last step."""
+    local_file = DB_PATH.parent / "local_upload.pdf"
+    local_file.write_bytes(b"%PDF-")
+    with Session(engine) as session:
+        step = session.exec(
+            select(SettlementStep).where(SettlementStep.user_id == user_id).order_by(SettlementStep.id.desc())
+        ).first()
+        session.add(Document(
+            filename="local.pdf", original_filename="local.pdf", file_path=str(local_file),
+            file_size=5, content_type="application/pdf",
+            settlement_step_id=step.id, user_id=user_id,
+        ))
+        session.commit()
+    return local_file
+
+
+def run():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email="steps@example.com", hashed_password="x", full_name="Steps")
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+        app.dependency_overrides[get_current_active_user_async] = lambda: user
+        assert client.post(f"{API}/initialize").status_code == 200
+        first_urls = seed_documents(user.id)
+        local_file = seed_local_document(user.id)
+        counter = DocumentQueryCounter()
+
+        counter.reset()
+        steps = client.get(f"{API}/").json()
+        print(f"list    document queries={counter.count} statements={counter.statements}")
+        assert counter.count == 1, counter.count
+        assert {step["id"]: step["document_url"] for step in steps} == first_urls
+        assert all(step["has_document"] for step in steps)
+
+        counter.reset()
+        response = client.patch(f"{API}/{steps[0]['id']}", json={"is_completed": True})
+        assert response.status_code == 200, response.text
+        print(f"update  document queries={counter.count} statements={counter.statements}")
+        assert counter.count == 1, counter.count
+        assert response.json()["document_url"] == first_urls[steps[0]["id"]]
+
+        counter.reset()
+        response = client.post(f"{API}/reset")
+        assert response.status_code == 200, response.text
+        print(f"reset   document queries={counter.count} statements={counter.statements}")
+        # Collect file paths, bulk delete, read the (absent) documents of the new steps
+        assert counter.count == 3, counter.count
+        assert not any(step["has_document"] for step in response.json())
+        assert not local_file.exists(), "local document file was not removed"
+        with Session(engine) as session:
+            assert session.exec(select(func.count(Document.id))).one() == 0
+            assert session.exec(select(func.count(SettlementStep.id))).one() == len(response.json())
+
+        app.dependency_overrides.clear()
+    print("OK: settlement step documents are loaded and deleted with a fixed number of queries")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,99 @@
+"""
+Check cold-start cost: import time of the app and the SQL run at startup.
+
+- Imports app.main in fresh interpreters under `python -X importtime` and
+  checks that the best of a few runs stays under the budget (milliseconds,
+  first argument), listing the slowest top-level packages. Checks that the
+  optional heavy modules (Cloudinary SDK, passlib, slowapi) and the hot-score
+  decay job are not imported at all; they load on first use or at startup.
+- Starts the app on a new scratch database (the migrations create it), then
+  starts it again and checks that the second startup runs a single query:
+  the schema version lookup.
+
+Usage: python scripts/test_startup_time.py [budget_ms]
+"""
+from pathlib import Path
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+SCRATCH = Path(tempfile.mkdtemp())
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH / 'app.db'}"
+
+IMPORT_BUDGET_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 1500.0
+RUNS = 3
+LAZY_MODULES = ("cloudinary", "passlib", "slowapi", "app.core.hot_decay")
+
+
+def import_profile() -> dict:
+    """
+    Import time in ms of `import app.main` ("app.main") and of every package it
+    pulls in, each counted at its outermost import (so including what it imports).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=os.environ, capture_output=True, text=True, check=True,
+    )
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        package = name if name == "app.main" or name in LAZY_MODULES else name.split(".")[0]
+        totals[package] = max(totals.get(package, 0.0), int(cumulative) / 1000)
+    return totals
+
+
+def run():
+    profiles = [import_profile() for _ in range(RUNS)]
+    best = min(profiles, key=lambda totals: totals["app.main"])
+    slowest = sorted(
+        ((ms, name) for name, ms in best.items() if name not in ("app", "app.main")), reverse=True
+    )[:8]
+    print(f"import app.main: {best['app.main']:.0f} ms (best of {RUNS}, budget {IMPORT_BUDGET_MS:.0f} ms)")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+    loaded = [module for module in LAZY_MODULES if module in best]
+    assert not loaded, f"imported at startup: {loaded}"
+    assert best["app.main"] <= IMPORT_BUDGET_MS, "import time over budget"
+    print(f"OK: import time within budget and {', '.join(LAZY_MODULES)} not imported")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.db.migrations import LATEST_VERSION, schema_version
+    from app.db.session import engine
+    from app.main import app
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    started = time.perf_counter()
+    with TestClient(app):
+        pass
+    first = time.perf_counter() - started
+    assert schema_version(engine) == LATEST_VERSION
+    created = len(statements)
+    statements.clear()
+
+    started = time.perf_counter()
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+    second = time.perf_counter() - started
+    print(f"startup on a new database: {created} statements, {first * 1000:.0f} ms")
+    print(f"startup on a current database: {len(statements)} statement(s), {second * 1000:.0f} ms")
+    assert len(statements) == 1, statements
+    print("OK: startup on a current schema only reads the schema version")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,149 @@
+"""
+Check the refresh-token flow and token revocation.
+
+Logs in against a throwaway SQLite database and checks that:
+- refresh tokens are single use, and replaying one revokes the user's tokens,
+  also after the in-process caches are gone (as after a restart or in another
+  worker);
+- the same refresh token presented again within the reuse grace window (two
+  tabs refreshing at once) gets working tokens instead of a revocation;
+- separate logins rotate their refresh tokens independently;
+- refresh tokens are not accepted as access tokens;
+- a password change revokes every earlier access and refresh token;
+- with a warm user cache, authenticating a request runs no SQL at all.
+
+Usage: python scripts/test_token_refresh.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "token_refresh.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "refresh-secret")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.cache import token_cache, user_cache
+from app.core.config import settings
+from app.core.security import create_access_token, hash_password
+from app.db.session import engine
+from app.main import app
+from app.models.user import User
+
+API = "/api/v1/auth"
+EMAIL = "refresh@example.com"
+PASSWORD = "Refresh-password-1"
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def me(client: TestClient, token: str) -> int:
+    return client.get(f"{API}/me", headers=bearer(token)).status_code
+
+
+def refresh(client: TestClient, refresh_token: str):
+    return client.post(f"{API}/refresh", json={"refresh_token": refresh_token})
+
+
+def login(client: TestClient) -> dict:
+    return client.post(f"{API}/login", json={"email": EMAIL, "password": PASSWORD}).json()
+
+
+def clear_process_caches():
+    token_cache.backend.clear()
+    user_cache.backend.clear()
+
+
+def run():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email=EMAIL, hashed_password=hash_password(PASSWORD), full_name="Refresh")
+            session.add(user)
+            session.commit()
+            user_id = user.id
+        legacy_token = create_access_token({"sub": str(user_id)})
+
+        first = login(client)
+        assert first["refresh_token"] and first["expires_in"] > 0
+        assert me(client, first["access_token"]) == 200
+        assert me(client, first["refresh_token"]) == 401, "refresh token accepted as access token"
+        assert me(client, legacy_token) == 200, "tokens issued before versioning must keep working"
+
+        # Rotation: each refresh token works exactly once
+        response = refresh(client, first["refresh_token"])
+        assert response.status_code == 200, response.text
+        second = response.json()
+        assert second["refresh_token"] != first["refresh_token"]
+        assert me(client, second["access_token"]) == 200
+
+        # Presented again right away (another tab): tokens for the current counter, nothing revoked
+        response = refresh(client, first["refresh_token"])
+        assert response.status_code == 200, response.text
+        duplicate = response.json()
+        assert me(client, duplicate["access_token"]) == 200
+        assert me(client, second["access_token"]) == 200
+        third = refresh(client, duplicate["refresh_token"]).json()
+        assert me(client, third["access_token"]) == 200
+        print("OK: a concurrent refresh within the grace window is not treated as a replay")
+
+        # Another login has its own refresh chain
+        other = login(client)
+        response = refresh(client, other["refresh_token"])
+        assert response.status_code == 200, response.text
+        other = response.json()
+
+        # Replaying a used refresh token after the grace window revokes everything,
+        # even with no trace of it left in this process
+        clear_process_caches()
+        grace = settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS
+        settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS = 0
+        try:
+            assert refresh(client, first["refresh_token"]).status_code == 401
+        finally:
+            settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS = grace
+        assert me(client, third["access_token"]) == 401
+        assert refresh(client, third["refresh_token"]).status_code == 401
+        assert me(client, other["access_token"]) == 401
+        assert refresh(client, other["refresh_token"]).status_code == 401
+        assert me(client, legacy_token) == 401
+        print("OK: refresh tokens rotate, and a replay revokes the user's tokens")
+
+        # A password change revokes earlier tokens but keeps the current client signed in
+        fourth = login(client)
+        response = client.post(f"{API}/change-password", json={"new_password": "Changed-password-2"},
+                               headers=bearer(fourth["access_token"]))
+        assert response.status_code == 200, response.text
+        changed = response.json()
+        assert me(client, fourth["access_token"]) == 401
+        assert refresh(client, fourth["refresh_token"]).status_code == 401
+        assert me(client, changed["access_token"]) == 200
+        assert refresh(client, changed["refresh_token"]).status_code == 200
+        print("OK: a password change revokes earlier tokens")
+
+        # Revocation checks come from memory: no SQL per authenticated request
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            for _ in range(5):
+                assert me(client, changed["access_token"]) == 200
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert not statements, statements
+        print("OK: authenticated requests run no SQL with a warm user cache")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,101 @@
+"""
+Check that a full view-count buffer is not written on the event loop.
+
+Serves a question detail more often than VIEW_COUNT_MAX_BUFFERED allows
+between periodic flushes (the interval is set to an hour) against a throwaway
+SQLite database, and checks that:
+- the buffered views are written early, by the background flusher;
+- the UPDATE never runs on the event loop thread;
+- flushes leave the cached question detail in place while the served view
+  count still includes every view;
+- the stored view count matches the number of requests.
+
+Usage: python scripts/test_view_count_flush.py
+"""
+from pathlib import Path
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "view_count_flush.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["VIEW_COUNT_FLUSH_INTERVAL_SECONDS"] = "3600"
+os.environ["VIEW_COUNT_MAX_BUFFERED"] = "5"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.cache import forum_cache
+from app.core.deps import get_current_user_async
+from app.core.view_counter import view_counts
+from app.db.session import engine
+from app.main import app
+from app.models.forum import Question
+from app.models.user import User
+
+VIEWS = 12
+API = "/api/v1/forum"
+
+
+def on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def run():
+    updates = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE QUESTION"):
+            updates.append(on_event_loop())
+
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email="views@example.com", hashed_password="x", full_name="Views")
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+            question = Question(title="Viewed", content="Often", category="general", user_id=user.id)
+            session.add(question)
+            session.commit()
+            question_id = question.id
+        app.dependency_overrides[get_current_user_async] = lambda: user
+        event.listen(engine, "before_cursor_execute", on_execute)
+        generation = forum_cache.generation(f"question:{question_id}")
+
+        for _ in range(VIEWS):
+            assert client.get(f"{API}/questions/{question_id}").status_code == 200
+        deadline = time.monotonic() + 5
+        while not updates and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert updates, "the full buffer was not flushed before the periodic interval"
+        assert not any(updates), "view counts were written on the event loop"
+        print(f"OK: {len(updates)} early flush(es), none on the event loop")
+
+        view_counts.flush()
+        response = client.get(f"{API}/questions/{question_id}")
+        assert response.json()["view_count"] == VIEWS + 1, response.json()["view_count"]
+        assert forum_cache.generation(f"question:{question_id}") == generation, "a flush invalidated the detail"
+        print("OK: flushes keep the cached detail and the served view count is current")
+
+        app.dependency_overrides.clear()
+    event.remove(engine, "before_cursor_execute", on_execute)
+    with Session(engine) as session:
+        assert session.get(Question, question_id).view_count == VIEWS + 1
+    print("OK: every view was stored")
+
+
+if __name__ == '__main__':
+    run()
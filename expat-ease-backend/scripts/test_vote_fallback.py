@@ -0,0 +1,90 @@
+"""
+Check the portable vote write used on dialects without ON CONFLICT.
+
+Seeds a throwaway SQLite database, hides SQLite from the dialect-specific
+upsert table so `_upsert_vote` takes the SELECT-then-INSERT/UPDATE path, and
+checks first votes, repeats and flips return the previous vote and leave one
+row per user, including when a competing first vote is already stored.
+
+Usage: python scripts/test_vote_fallback.py
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Point the app at a scratch database before anything imports the engine
+DB_PATH = Path(tempfile.mkdtemp()) / "vote_fallback.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import false
+from sqlmodel import Session, SQLModel, func, select
+
+from app.crud import crud_forum
+from app.db.session import engine
+from app.main import app  # noqa: F401  (registers every model)
+from app.models.forum import Answer, AnswerVote, Question, QuestionVote
+from app.models.user import User
+
+
+def run():
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="fallback@example.com", hashed_password="x", full_name="Fallback")
+        other = User(email="other@example.com", hashed_password="x", full_name="Other")
+        session.add_all([user, other])
+        session.commit()
+        question = Question(title="Q", content="C", category="GENERAL", user_id=user.id)
+        session.add(question)
+        session.commit()
+        answer = Answer(content="A", question_id=question.id, user_id=user.id)
+        session.add(answer)
+        session.commit()
+        user_id, other_id, question_id, answer_id = user.id, other.id, question.id, answer.id
+
+    crud_forum._DIALECT_INSERTS.pop("sqlite")
+    with Session(engine) as session:
+        for model, target_id in ((Question, question_id), (Answer, answer_id)):
+            assert crud_forum._upsert_vote(session, model, target_id, user_id, True) is None
+            assert crud_forum._upsert_vote(session, model, target_id, user_id, True) is True
+            assert crud_forum._upsert_vote(session, model, target_id, user_id, False) is True
+            assert crud_forum._upsert_vote(session, model, target_id, user_id, False) is False
+        session.commit()
+
+    # A concurrent first vote landed between our SELECT and INSERT
+    with Session(engine) as session:
+        session.add(QuestionVote(question_id=question_id, user_id=other_id, is_upvote=False,
+                                 created_at=datetime.utcnow()))
+        session.commit()
+    with Session(engine) as session:
+        real_exec = session.exec
+        reads = []
+
+        def exec_missing_first_read(statement, *args, **kwargs):
+            # The first SELECT sees no vote yet, as if it ran before the competing INSERT
+            reads.append(statement)
+            if len(reads) == 1:
+                statement = select(QuestionVote.is_upvote).where(false())
+            return real_exec(statement, *args, **kwargs)
+
+        session.exec = exec_missing_first_read
+        previous = crud_forum._upsert_vote(session, Question, question_id, other_id, True)
+        session.commit()
+        assert previous is False, previous
+
+    with Session(engine) as session:
+        assert session.exec(select(func.count(QuestionVote.id))).one() == 2
+        assert session.exec(select(func.count(AnswerVote.id))).one() == 1
+        votes = dict(session.exec(select(QuestionVote.user_id, QuestionVote.is_upvote)).all())
+        assert votes == {user_id: False, other_id: True}, votes
+    print("OK: portable vote writes keep one row per user and report the previous vote")
+
+
+if __name__ == '__main__':
+    run()
@@ -4,5 +4,8 @@
 # Set default port if not provided
 export PORT=${PORT:-10000}
 
+# Trust X-Forwarded-For only from these proxies (Render's private network, set in render.yaml)
+export FORWARDED_ALLOW_IPS=${FORWARDED_ALLOW_IPS:-127.0.0.1}
+
 # Start the application
-uvicorn app.main:app --host 0.0.0.0 --port $PORT
+uvicorn app.main:app --host 0.0.0.0 --port $PORT --proxy-headers --forwarded-allow-ips "$FORWARDED_ALLOW_IPS"
@@ -230,6 +230,9 @@ const ForgotPasswordModal: React.FC<Props> = ({ onClose }) => {
                                             body: JSON.stringify({ new_password: newPassword }),
                                         });
                                         if (r.ok) {
+                                            // Earlier tokens are revoked; keep this session signed in with the new pair
+                                            const d = await r.json();
+                                            auth.setTokens(d);
                                             addToast({ type: 'success', message: 'Password changed successfully' });
                                             onClose();
                                         } else {
@@ -27,9 +27,57 @@ interface AuthContextType {
     logout: () => void;
     selectCountry: (country: string) => void;
     refreshUser: () => Promise<void>;
+    setTokens: (data: TokenResponse) => void;
     isLoading: boolean;
 }
 
+export interface TokenResponse {
+    access_token: string;
+    refresh_token?: string | null;
+    expires_in?: number | null;
+}
+
+// Renew the access token this long before it expires
+const REFRESH_MARGIN_SECONDS = 60;
+
+// Web Lock held while exchanging the refresh token, shared by every tab of the app
+const REFRESH_LOCK_NAME = 'expat-ease-token-refresh';
+
+// Refresh started by this tab, shared by concurrent callers (e.g. StrictMode's double mount)
+let refreshInFlight: Promise<TokenResponse | null> | null = null;
+
+// Runs `task` while holding the cross-tab refresh lock (or directly where Web Locks are unavailable)
+const withRefreshLock = async (task: () => Promise<TokenResponse | null>): Promise<TokenResponse | null> => {
+    if (typeof navigator !== 'undefined' && navigator.locks) {
+        return await navigator.locks.request(REFRESH_LOCK_NAME, task);
+    }
+    return task();
+};
+
+const saveTokens = (data: TokenResponse) => {
+    localStorage.setItem('token', data.access_token);
+    if (data.refresh_token) {
+        localStorage.setItem('refreshToken', data.refresh_token);
+    }
+    if (data.expires_in) {
+        localStorage.setItem('tokenExpiresAt', String(Date.now() + data.expires_in * 1000));
+    } else {
+        localStorage.removeItem('tokenExpiresAt');
+    }
+};
+
+const removeTokens = () => {
+    localStorage.removeItem('token');
+    localStorage.removeItem('refreshToken');
+    localStorage.removeItem('tokenExpiresAt');
+};
+
+// Seconds left on the stored access token, or null if unknown
+const storedExpiresIn = (): number | null => {
+    const expiresAt = Number(localStorage.getItem('tokenExpiresAt'));
+    return expiresAt ? Math.floor((expiresAt - Date.now()) / 1000) : null;
+};
+
 const AuthContext = createContext<AuthContextType | undefined>(undefined);
 
 export const useAuth = () => {
@@ -49,6 +97,81 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
     const [token, setToken] = useState<string | null>(null);
     const [selectedCountry, setSelectedCountry] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState(true);
+    const [expiresIn, setExpiresIn] = useState<number | null>(null);
+
+    const storeTokens = (data: TokenResponse) => {
+        setToken(data.access_token);
+        saveTokens(data);
+        setExpiresIn(data.expires_in ?? null);
+    };
+
+    const clearTokens = () => {
+        setToken(null);
+        setExpiresIn(null);
+        removeTokens();
+    };
+
+    // Exchange the refresh token for a new pair; one exchange at a time across all tabs
+    const exchangeRefreshToken = (seenRefreshToken: string): Promise<TokenResponse | null> =>
+        withRefreshLock(async () => {
+            const refreshToken = localStorage.getItem('refreshToken');
+            if (!refreshToken) {
+                return null;
+            }
+            const accessToken = localStorage.getItem('token');
+            const expiresIn = storedExpiresIn();
+            if (refreshToken !== seenRefreshToken && accessToken && expiresIn && expiresIn > REFRESH_MARGIN_SECONDS) {
+                // Another tab refreshed while we waited for the lock; use its tokens
+                return { access_token: accessToken, expires_in: expiresIn };
+            }
+            const response = await fetch(getApiUrl('/api/v1/auth/refresh'), {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ refresh_token: refreshToken }),
+            });
+            if (!response.ok) {
+                // Only sign out if no other tab stored a newer refresh token meanwhile
+                if (localStorage.getItem('refreshToken') === refreshToken) {
+                    removeTokens();
+                }
+                return null;
+            }
+            const data: TokenResponse = await response.json();
+            // Stored before the lock is released so the next tab in line sees the new pair
+            saveTokens(data);
+            return data;
+        });
+
+    // Renew the token pair from the stored refresh token; returns the new access token
+    const refreshTokens = async (): Promise<string | null> => {
+        const refreshToken = localStorage.getItem('refreshToken');
+        if (!refreshToken) {
+            return null;
+        }
+        if (!refreshInFlight) {
+            refreshInFlight = exchangeRefreshToken(refreshToken).finally(() => {
+                refreshInFlight = null;
+            });
+        }
+        try {
+            const data = await refreshInFlight;
+            if (!data) {
+                // Stored tokens were already cleared under the lock, if they were the rejected ones
+                setToken(null);
+                setExpiresIn(null);
+                return null;
+            }
+            // Already saved under the lock; saving again could overwrite a newer pair from another tab
+            setToken(data.access_token);
+            setExpiresIn(data.expires_in ?? null);
+            return data.access_token;
+        } catch (error) {
+            console.error('Failed to refresh token:', error);
+            return null;
+        }
+    };
 
     // Check for existing token and country on mount
     useEffect(() => {
@@ -59,7 +182,16 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
             setSelectedCountry(savedCountry);
         }
 
-        if (savedToken) {
+        if (localStorage.getItem('refreshToken')) {
+            // The saved access token may have expired; start from a fresh pair
+            refreshTokens().then((freshToken) => {
+                if (freshToken) {
+                    fetchUserProfile(freshToken);
+                } else {
+                    setIsLoading(false);
+                }
+            });
+        } else if (savedToken) {
             setToken(savedToken);
             // Optionally verify token with backend
             fetchUserProfile(savedToken);
@@ -68,6 +200,18 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         }
     }, []);
 
+    // Renew the short-lived access token shortly before it expires
+    useEffect(() => {
+        if (!token || !expiresIn) {
+            return;
+        }
+        const delay = Math.max(expiresIn - REFRESH_MARGIN_SECONDS, REFRESH_MARGIN_SECONDS) * 1000;
+        const timer = setTimeout(() => {
+            refreshTokens();
+        }, delay);
+        return () => clearTimeout(timer);
+    }, [token, expiresIn]);
+
     const fetchUserProfile = async (authToken: string) => {
         try {
             const response = await fetch(getApiUrl('/api/v1/users/me'), {
@@ -90,13 +234,11 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
                 // User profile loaded successfully
             } else {
                 // Token is invalid, remove it
-                localStorage.removeItem('token');
-                setToken(null);
+                clearTokens();
             }
         } catch (error) {
             console.error('Failed to fetch user profile:', error);
-            localStorage.removeItem('token');
-            setToken(null);
+            clearTokens();
         } finally {
             setIsLoading(false);
         }
@@ -113,14 +255,11 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
             });
 
             if (response.ok) {
-                const data = await response.json();
-                const { access_token } = data;
-
-                setToken(access_token);
-                localStorage.setItem('token', access_token);
+                const data: TokenResponse = await response.json();
+                storeTokens(data);
 
                 // Fetch user profile
-                await fetchUserProfile(access_token);
+                await fetchUserProfile(data.access_token);
 
                 // User logged in successfully
             } else {
@@ -135,9 +274,8 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
 
     const logout = () => {
         setUser(null);
-        setToken(null);
+        clearTokens();
         setSelectedCountry(null);
-        localStorage.removeItem('token');
         localStorage.removeItem('selectedCountry');
 
         // Redirect to homepage when logging out
@@ -196,6 +334,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         logout,
         selectCountry,
         refreshUser,
+        setTokens: storeTokens,
         isLoading,
     };
 